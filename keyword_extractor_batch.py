@@ -0,0 +1,158 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Batch mode of the KeywordExtractor (keyword_extractor_salto.py): extracts the keywords of all the files of directories or glob patterns.
+Each processed file is recorded in a manifest, a JSON lines file appended after each file: its path, size, modification time, hash (SHA-1),
+status ("done" or the error) and the duration of its processing. When the run is started again with the same manifest,
+the files already done that have not changed since are skipped, so that an interrupted run resumes where it stopped.
+"""
+
+import glob, hashlib, io, json, os, time
+
+
+def expand_inputs(inputs: list) -> list:
+    """
+    Returns the sorted list of the files given by the inputs: files, directories (their files, in all their subdirectories) and glob patterns.
+    """
+    paths = set()
+    for input_name in inputs:
+        if os.path.isdir(input_name):
+            for folder, _, file_names in os.walk(input_name):
+                paths.update(os.path.join(folder, file_name) for file_name in file_names)
+        elif os.path.isfile(input_name):
+            paths.add(input_name)
+        else:
+            paths.update(path for path in glob.glob(input_name, recursive=True) if os.path.isfile(path))
+    return sorted(os.path.abspath(path) for path in paths)
+
+
+def input_root(inputs: list) -> str:
+    """
+    Returns the absolute path of the deepest folder that contains all the inputs: directories, folders of the files and folders of the glob patterns (before their first wildcard).
+    The ids of the articles are their paths relative to it (see article_id()), which are different for files of the same name in different folders.
+    """
+    roots = []
+    for input_name in inputs:
+        if os.path.isdir(input_name):
+            roots.append(os.path.abspath(input_name))
+            continue
+        root = os.path.dirname(input_name)
+        while glob.has_magic(root):
+            root = os.path.dirname(root)
+        roots.append(os.path.abspath(root))
+    return os.path.commonpath(roots)
+
+
+def article_id(path: str, root: str) -> str:
+    """
+    Returns the id of the article of the file: its path relative to the root of the inputs (see input_root()).
+    """
+    return os.path.relpath(path, root)
+
+
+def is_batch_input(inputs: list) -> bool:
+    """
+    Finds out if the inputs are more than a single file: several inputs, a directory or a glob pattern.
+    """
+    return len(inputs) > 1 or os.path.isdir(inputs[0]) or glob.has_magic(inputs[0])
+
+
+def hash_file(path: str) -> str:
+    """
+    Returns the SHA-1 of the content of the file.
+    """
+    file_hash = hashlib.sha1()
+    with io.open(path, mode="rb") as input_file:
+        for block in iter(lambda: input_file.read(1 << 20), b""):
+            file_hash.update(block)
+    return file_hash.hexdigest()
+
+
+def read_manifest(manifest_file_name: str) -> dict:
+    """
+    Reads the manifest. Returns a hash: key: path, value: its last record. A line cut by an interruption is ignored.
+    """
+    records = {}
+    if not os.path.exists(manifest_file_name):
+        return records
+    with io.open(manifest_file_name, mode="r", encoding="utf-8") as manifest_file:
+        for line in manifest_file:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            records[record["path"]] = record
+    return records
+
+
+def is_done(record: dict, size: int, mtime: float, path: str) -> bool:
+    """
+    Finds out if the file was done in a previous run and has not changed since:
+    same size, and same modification time or else same content.
+    """
+    if record is None or record["status"] != "done" or record["size"] != size:
+        return False
+    return record["mtime"] == mtime or record["hash"] == hash_file(path)
+
+
+class BatchStatistics():
+    """
+    The numbers of files done, failed and skipped, and the bytes and time of the files processed.
+    """
+
+    def __init__(self) -> None:
+        self.number_of_done_files = 0
+        self.number_of_failed_files = 0
+        self.number_of_skipped_files = 0
+        self.number_of_bytes = 0
+        self.processing_time = 0.0
+        self.start = time.perf_counter()
+
+
+    def __str__(self) -> str:
+        elapsed = time.perf_counter()-self.start
+        number_of_processed_files = self.number_of_done_files+self.number_of_failed_files
+        return "{} files done, {} failed, {} skipped (unchanged) in {:.1f}s: {:.2f} files/s, {:.2f} MB/s, {:.3f}s per file".format(
+            self.number_of_done_files, self.number_of_failed_files, self.number_of_skipped_files, elapsed,
+            number_of_processed_files/elapsed if elapsed > 0 else 0.0, self.number_of_bytes/elapsed/1e6 if elapsed > 0 else 0.0,
+            self.processing_time/number_of_processed_files if number_of_processed_files > 0 else 0.0)
+
+
+def run_batch(paths: list, manifest_file_name: str, extract, sink=None) -> BatchStatistics:
+    """
+    Processes the files with the given function (that takes the path of a file), skipping the files done and unchanged according to the manifest,
+    and appends a record per processed file to the manifest. An exception raised by the function for a file is recorded as the status of the file.
+    If the function writes to an output that keeps articles in memory (keyword_extractor_sinks.py), given as sink,
+    the records of the files are written to the manifest only once their keywords are written to the output.
+    Returns the statistics of the run.
+    """
+    previous_records = read_manifest(manifest_file_name)
+    statistics = BatchStatistics()
+    pending_records = [] #The records of the files whose keywords are not written yet
+    with io.open(manifest_file_name, mode="a", encoding="utf-8") as manifest_file:
+        for path in paths:
+            file_status = os.stat(path)
+            if is_done(previous_records.get(path), file_status.st_size, file_status.st_mtime, path):
+                statistics.number_of_skipped_files += 1
+                continue
+            start = time.perf_counter()
+            try:
+                extract(path)
+                status = "done"
+                statistics.number_of_done_files += 1
+            except Exception as error:
+                status = "{}: {}".format(type(error).__name__, error)
+                statistics.number_of_failed_files += 1
+            duration = time.perf_counter()-start
+            statistics.number_of_bytes += file_status.st_size
+            statistics.processing_time += duration
+            record = {"path": path, "size": file_status.st_size, "mtime": file_status.st_mtime, "hash": hash_file(path), "status": status, "duration": round(duration, 6)}
+            pending_records.append(json.dumps(record, ensure_ascii=False)+"\n")
+            if sink is None or sink.number_of_pending_articles == 0:
+                manifest_file.write("".join(pending_records))
+                manifest_file.flush()
+                pending_records = []
+        if sink is not None:
+            sink.flush()
+        manifest_file.write("".join(pending_records))
+    return statistics
@@ -0,0 +1,74 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Unit tests for testing keyword_extractor_batch.py
+"""
+
+import io
+import os
+import tempfile
+import unittest
+from keyword_extractor_batch import article_id, expand_inputs, input_root, is_batch_input, read_manifest, run_batch
+
+
+class KeywordExtractorBatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        os.makedirs(os.path.join(self.folder.name, 'articles', '2019'))
+        self.paths = []
+        for file_name in ('1.txt', '2.txt', os.path.join('2019', '3.txt'), os.path.join('2019', '4.md')):
+            path = os.path.join(self.folder.name, 'articles', file_name)
+            with io.open(path, mode='w', encoding='utf-8') as article_file:
+                article_file.write('TITLE: Artikel ' + file_name)
+            self.paths.append(path)
+        self.manifest_file_name = os.path.join(self.folder.name, 'manifest.jsonl')
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_expand_inputs(self):
+        articles = os.path.join(self.folder.name, 'articles')
+        self.assertEqual(expand_inputs([articles]), sorted(self.paths))
+        self.assertEqual(expand_inputs([os.path.join(articles, '**', '*.txt')]), sorted(self.paths[:3]))
+        self.assertEqual(expand_inputs([self.paths[1], os.path.join(articles, '*.txt')]), sorted(self.paths[:2]))
+        self.assertEqual(input_root([articles]), articles)
+        self.assertEqual(input_root([os.path.join(articles, '2019'), self.paths[0]]), articles)
+        self.assertEqual(input_root([os.path.join(articles, '*', '*.txt')]), articles)
+        self.assertEqual([article_id(path, articles) for path in self.paths[1:3]], ['2.txt', os.path.join('2019', '3.txt')])
+        self.assertEqual(input_root([self.paths[0]]), articles)
+        self.assertTrue(is_batch_input([articles]))
+        self.assertTrue(is_batch_input([os.path.join(articles, '*.txt')]))
+        self.assertFalse(is_batch_input([self.paths[0]]))
+
+    def test_run_batch_resumes(self):
+        processed = []
+        def extract(path):
+            processed.append(path)
+            if path.endswith('2.txt'):
+                raise ValueError('The content of file is too short to be analysed.')
+        paths = sorted(self.paths)
+        statistics = run_batch(paths, self.manifest_file_name, extract)
+        self.assertEqual((statistics.number_of_done_files, statistics.number_of_failed_files, statistics.number_of_skipped_files), (3, 1, 0))
+        records = read_manifest(self.manifest_file_name)
+        self.assertEqual(records[paths[1]]['status'], 'ValueError: The content of file is too short to be analysed.')
+        self.assertEqual(records[paths[0]]['status'], 'done')
+        self.assertEqual(sorted(records[paths[0]]), ['duration', 'hash', 'mtime', 'path', 'size', 'status'])
+
+        #Second run: only the failed file and the changed file are processed again
+        with io.open(paths[2], mode='a', encoding='utf-8') as article_file:
+            article_file.write(' geändert')
+        del processed[:]
+        statistics = run_batch(paths, self.manifest_file_name, extract)
+        self.assertEqual(processed, [paths[1], paths[2]])
+        self.assertEqual((statistics.number_of_done_files, statistics.number_of_failed_files, statistics.number_of_skipped_files), (1, 1, 2))
+
+        #A touched file whose content has not changed is skipped
+        os.utime(paths[0], (0, 0))
+        del processed[:]
+        run_batch(paths, self.manifest_file_name, extract)
+        self.assertEqual(processed, [paths[1]])
+
+
+if __name__ == '__main__':
+    unittest.main()
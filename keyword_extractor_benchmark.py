@@ -0,0 +1,304 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Benchmarks of the parts of the keyword extractor that have been made faster.
+Each benchmark compares the new code with the straightforward way of doing the same thing,
+checks that both give the same result and prints the time they take.
+
+Usage: python keyword_extractor_benchmark.py -b edit_distance -n 10000
+"""
+
+import argparse, os, random, re, tempfile, time, editdistance
+from keyword_extractor_indexes import find_similar_strings
+from keyword_extractor_ingestion import Article
+from keyword_extractor_inverted_index import InvertedIndex
+from keyword_extractor_language import LanguageDetector
+from keyword_extractor_sinks import SqliteSink
+
+
+def _timed(function, *args):
+    """
+    Calls the function with the given arguments and returns its result and the time it took.
+    """
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter()-start
+
+
+def _generate_candidates(size: int, seed: int = 0) -> list:
+    """
+    Generates a list of synthetic keyword candidates, some of which differ by 1 or 2 letters.
+    """
+    generator = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyzäöüß"
+    candidates = []
+    while len(candidates) < size:
+        word = "".join(generator.choice(letters) for _ in range(generator.randint(3, 18)))
+        candidates.append(word)
+        #Variants of the word (plural, typo)
+        for _ in range(generator.randint(0, 2)):
+            variant = list(word)
+            position = generator.randrange(len(variant))
+            variant[position] = generator.choice(letters)
+            candidates.append("".join(variant)+generator.choice(["", "n", "en", "s"]))
+    return candidates[:size]
+
+
+def _pairwise_similar_strings(strings: list, max_distance: int) -> dict:
+    """
+    Compares all the pairs of strings of the list, as the keyword extractor used to do.
+    """
+    similar_strings = {}
+    for i, s in enumerate(strings):
+        for j, s2 in enumerate(strings):
+            if i != j and s is not None and s2 is not None and editdistance.eval(s, s2) <= max_distance:
+                similar_strings.setdefault(i, []).append(j)
+    return similar_strings
+
+
+def benchmark_edit_distance(size: int) -> None:
+    """
+    Near duplicate detection among the given number of synthetic candidates: all the pairs vs the index of deletion variants.
+    """
+    candidates = [candidate if len(candidate) > 4 else None for candidate in _generate_candidates(size)]
+    similar, new_time = _timed(find_similar_strings, candidates, 2)
+    similar_pairwise, old_time = _timed(_pairwise_similar_strings, candidates, 2)
+    print("Edit distance on %d candidates: all the pairs %.2fs, deletion index %.2fs (x%.1f), same result: %s" % (size, old_time, new_time, old_time/new_time, similar == similar_pairwise))
+
+
+def _join_case_differences_pairwise(lemmas_hash: dict) -> None:
+    """
+    Joins the lemmas that differ only in case, comparing all the pairs of lemmas, as the keyword extractor used to do.
+    """
+    new_counts = {}
+    keys_to_delete = set()
+    for lemma in lemmas_hash:
+        for lemma2 in lemmas_hash:
+            if lemma != lemma2 and lemma.lower() == lemma2.lower():
+                if lemma not in keys_to_delete and lemma2 not in keys_to_delete:
+                    new_counts[lemma.lower()] = lemmas_hash[lemma]+lemmas_hash[lemma2]
+                    if lemmas_hash[lemma2] <= lemmas_hash[lemma]:
+                        keys_to_delete.add(lemma2)
+                    else:
+                        keys_to_delete.add(lemma)
+    for key in keys_to_delete:
+        del lemmas_hash[key]
+    for lemma in lemmas_hash:
+        if lemma.lower() in new_counts:
+            lemmas_hash[lemma] = new_counts[lemma.lower()]
+
+
+def _generate_lemma_counts(size: int) -> dict:
+    """
+    Generates the counts of the given number of synthetic lemmas, one in 10 having also a lowercase variant.
+    """
+    lemmas_hash = {}
+    for i in range(size):
+        lemmas_hash["Lemma"+str(i)] = 1.0
+        if i % 10 == 0:
+            lemmas_hash["lemma"+str(i)] = 0.5
+    return lemmas_hash
+
+
+def benchmark_case_variants(size: int) -> None:
+    """
+    Joining of the lemmas that differ only in case in vocabularies of the given size and of 4 times this size: all the pairs vs the groups of case variants.
+    The pairs are compared only in the smaller vocabulary (they take minutes beyond a few thousand lemmas).
+    """
+    from keyword_extractor_salto import KeywordExtractor
+    key_word_extractor = object.__new__(KeywordExtractor) #No article is needed to join the lemmas
+    lemmas_hash = _generate_lemma_counts(size)
+    lemmas_hash_pairwise = dict(lemmas_hash)
+    _, new_time = _timed(key_word_extractor._join_case_differences, lemmas_hash)
+    _, old_time = _timed(_join_case_differences_pairwise, lemmas_hash_pairwise)
+    _, larger_time = _timed(key_word_extractor._join_case_differences, _generate_lemma_counts(4*size))
+    print("Case variants of %d lemmas: all the pairs %.2fs, groups %.3fs (x%.1f), same result: %s; groups for %d lemmas %.3fs (x%.1f for 4 times more lemmas)" % (
+        size, old_time, new_time, old_time/new_time, lemmas_hash == lemmas_hash_pairwise, 4*size, larger_time, larger_time/new_time))
+
+
+def _extract_keywords_with_engine(folder: str, file_name: str, compound_engine: str) -> tuple:
+    """
+    Extracts the keywords of an article of the test folder with the given compound engine.
+    Returns the main language of the article and its keywords.
+    """
+    from keyword_extractor_salto import KeywordExtractor
+    with tempfile.TemporaryDirectory() as output_folder:
+        key_word_extractor = KeywordExtractor(folder, file_name, output_folder)
+        if key_word_extractor.lang != "de":
+            return key_word_extractor.lang, set()
+        key_word_extractor.compound_engine = compound_engine
+        return key_word_extractor.lang, key_word_extractor.extract_keywords()
+
+
+def benchmark_compound_splitter(size: int) -> None:
+    """
+    Keyword extraction from the German articles of the test folder (at most the given number of articles) with SMOR and with the compound splitter:
+    the time each engine takes and the agreement between their keywords (number of common keywords divided by the number of keywords of both).
+    Needs TreeTagger and SMOR.
+    """
+    folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test")
+    times = {"smor": 0.0, "splitter": 0.0}
+    agreements = []
+    for file_name in sorted(os.listdir(folder))[:size]:
+        keywords = {}
+        for compound_engine in times:
+            (lang, keywords[compound_engine]), duration = _timed(_extract_keywords_with_engine, folder, file_name, compound_engine)
+            if lang != "de":
+                break
+            times[compound_engine] += duration
+        else:
+            union = keywords["smor"] | keywords["splitter"]
+            agreements.append(len(keywords["smor"] & keywords["splitter"])/len(union) if union else 1.0)
+    if len(agreements) == 0:
+        print("Compound splitter: no German article found")
+        return
+    print("Compound splitter on %d German articles: SMOR %.2f articles/s, splitter %.2f articles/s, keyword agreement %.2f" % (len(agreements), len(agreements)/times["smor"], len(agreements)/times["splitter"], sum(agreements)/len(agreements)))
+
+
+def _read_test_lines(size: int) -> list:
+    """
+    Reads the non-empty lines of the sentences of the articles of the test folder, repeated up to the given number of lines.
+    """
+    from segtok.segmenter import split_multi
+    folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test")
+    lines = []
+    for file_name in sorted(os.listdir(folder)):
+        with open(os.path.join(folder, file_name), encoding="utf-8") as article_file:
+            for sentence in split_multi(article_file.read()):
+                lines.extend(line.strip() for line in sentence.split("\n") if len(line.strip()) > 0)
+    return (lines*(size//len(lines)+1))[:size]
+
+
+def _detect_all(detect, lines: list) -> list:
+    """
+    Detects the language of each line, None for the lines whose language cannot be detected.
+    """
+    languages = []
+    for line in lines:
+        try:
+            languages.append(detect(line))
+        except Exception:
+            languages.append(None)
+    return languages
+
+
+def benchmark_language(size: int) -> None:
+    """
+    Language detection of the given number of lines of the test articles: langdetect for every line vs the German/Italian classifier with langdetect for the unclear lines.
+    """
+    from langdetect import detect
+    lines = _read_test_lines(size)
+    language_detector = LanguageDetector()
+    new_languages, new_time = _timed(_detect_all, language_detector.detect, lines)
+    old_languages, old_time = _timed(_detect_all, detect, lines)
+    agreement = sum(1 for old, new in zip(old_languages, new_languages) if old == new)/len(lines)
+    print("Language of %d lines: langdetect %.0f lines/s, classifier %.0f lines/s (x%.1f), agreement %.3f, lines left to langdetect %.3f" % (len(lines), len(lines)/old_time, len(lines)/new_time, old_time/new_time, agreement, language_detector.number_of_fallback_lines/len(lines)))
+
+
+def _ingest_as_before(text: str) -> tuple:
+    """
+    Cleans and splits an article as the keyword extractor used to do: several passes over the text,
+    sentences of the whole text, whose section is found by looking for the names of the sections at their beginning.
+    """
+    from segtok.segmenter import split_multi
+    text = re.sub(r"[\da-zA-Z\.\-\_]+@[\da-zA-Z\.\-\_]+", "", text)
+    text = re.sub(r"(https?:\/\/)?www\.[^ ]+", "", text)
+    for character, replacement in (("(", ","), (")", ","), ("*", "###"), ("|", "==="), ("+", "#=#")):
+        text = text.replace(character, replacement)
+    lines = []
+    where_is_the_sentence = "BODY:"
+    for sent in split_multi(text):
+        for section_name in ("TITLE:", "TEASER:", "BODY:"):
+            if sent.startswith(section_name):
+                sent = sent[len(section_name):]
+                where_is_the_sentence = section_name
+        lines.extend([line.strip(), where_is_the_sentence] for line in sent.split("\n") if len(line.strip()) > 0)
+    return text, lines
+
+
+def _ingest_all(ingest, texts: list) -> list:
+    """
+    Ingests each text and returns the list of the lines of each of them.
+    """
+    return [ingest(text) for text in texts]
+
+
+def benchmark_ingestion(size: int) -> None:
+    """
+    Cleaning and splitting of the given number of articles (the articles of the test folder, repeated): the way it used to be done vs the ingestion stage.
+    """
+    folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test")
+    texts = []
+    for file_name in sorted(os.listdir(folder)):
+        with open(os.path.join(folder, file_name), encoding="utf-8") as article_file:
+            texts.append(article_file.read())
+    texts = (texts*(size//len(texts)+1))[:size]
+    new_lines, new_time = _timed(_ingest_all, lambda text: Article.from_text(text).lines, texts)
+    old_lines, old_time = _timed(_ingest_all, lambda text: _ingest_as_before(text)[1], texts)
+    #The articles whose lines differ are those in which a section begins in the same sentence as the end of the previous one (the ingestion stage finds its name)
+    number_of_different_articles = sum(1 for new, old in zip(new_lines, old_lines) if new != old)
+    print("Ingestion of %d articles: as before %.0f articles/s, ingestion stage %.0f articles/s (x%.1f), articles with different lines: %d" % (size, size/old_time, size/new_time, old_time/new_time, number_of_different_articles))
+
+
+def _generate_articles(size: int, vocabulary_size: int = 200000, seed: int = 0):
+    """
+    Yields the given number of synthetic articles: (article id, keywords, counts), 3 to 12 keywords per article,
+    the keywords of low numbers being much more frequent than the others, as the names of the main politicians and places in the archive.
+    """
+    generator = random.Random(seed)
+    for number in range(size):
+        keywords = sorted({"Keyword%d" % int(vocabulary_size**generator.random()) for _ in range(generator.randint(3, 12))})
+        yield "article%07d" % number, keywords, {keyword: generator.randint(1, 9) for keyword in keywords}
+
+
+def benchmark_inverted_index(size: int) -> None:
+    """
+    Lookup of the articles of a keyword among the given number of synthetic articles: a scan of the keywords table of the sqlite output vs the inverted index.
+    """
+    number_of_lookups = 1000
+    number_of_scans = 5 #A scan reads the whole table
+    with tempfile.TemporaryDirectory() as folder:
+        keywords_table = SqliteSink(os.path.join(folder, "keywords.sqlite"), 10000)
+        inverted_index = InvertedIndex(os.path.join(folder, "index.sqlite"), 10000)
+        start = time.perf_counter()
+        for article_id, keywords, counts in _generate_articles(size):
+            inverted_index.write(article_id, "de", keywords, counts)
+        inverted_index.flush()
+        build_time = time.perf_counter()-start
+        for article_id, keywords, counts in _generate_articles(size):
+            keywords_table.write(article_id, "de", keywords, counts)
+        keywords_table.flush()
+        generator = random.Random(1)
+        queries = ["keyword%d" % int(200000**generator.random()) for _ in range(number_of_lookups)]
+        latencies = []
+        for query in queries:
+            articles, latency = _timed(inverted_index.articles_of, query)
+            latencies.append(latency)
+        latencies.sort()
+        scan_time = 0.0
+        same_results = True
+        for query in queries[:number_of_scans]:
+            scanned_articles, latency = _timed(lambda keyword: keywords_table.connection.execute("SELECT article_id FROM keywords WHERE lower(keyword) = ?", (keyword,)).fetchall(), query)
+            scan_time += latency
+            same_results = same_results and sorted(article_id for article_id, in scanned_articles) == sorted(article_id for article_id, _ in inverted_index.articles_of(query))
+        _, top_latency = _timed(lambda: [inverted_index.articles_of(query, 10) for query in queries])
+        keywords_table.close()
+        inverted_index.close()
+    print("Inverted index of %d articles: built at %.0f articles/s; lookup of all the articles of a keyword: scan %.1f ms, index mean %.2f ms, median %.2f ms, p99 %.2f ms; top 10 articles: %.3f ms; same results: %s" % (
+        size, size/build_time, scan_time/number_of_scans*1000, sum(latencies)/len(latencies)*1000, latencies[len(latencies)//2]*1000, latencies[len(latencies)*99//100]*1000, top_latency/number_of_lookups*1000, same_results))
+
+
+BENCHMARKS = {"case_variants": benchmark_case_variants, "compound_splitter": benchmark_compound_splitter, "edit_distance": benchmark_edit_distance, "ingestion": benchmark_ingestion, "inverted_index": benchmark_inverted_index, "language": benchmark_language}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks of the keyword extractor.")
+    parser.add_argument("-b", "--benchmark", choices=sorted(BENCHMARKS), action="append", help="the benchmark to run (all of them by default)")
+    parser.add_argument("-n", "--size", type=int, default=10000, help="the size of the synthetic data")
+    args = parser.parse_args()
+    for name in args.benchmark or sorted(BENCHMARKS):
+        BENCHMARKS[name](args.size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Result cache of the KeywordExtractor (keyword_extractor_salto.py): the keywords of the articles already processed, so that an article sent again unchanged
+(ex: after an edit of its metadata) is not tagged and analysed again.
+The results are stored in a SQLite file, under a hash of the normalised text of the article, the settings of the extraction and the version of the cache:
+the versions of the lexicon files and of the extractor, so that the results computed with other lexicons or another extractor are not used.
+The number of results is bounded: when it is reached, the least recently used results are removed.
+"""
+
+import hashlib, io, json, os, sqlite3
+
+
+MAX_ENTRIES = 100000 #The default maximum number of results kept
+
+
+def file_version(file_name: str) -> str:
+    """
+    Returns the SHA-1 of the content of the file, or "missing" if it does not exist.
+    """
+    if not os.path.isfile(file_name):
+        return "missing"
+    with io.open(file_name, mode="rb") as input_file:
+        return hashlib.sha1(input_file.read()).hexdigest()
+
+
+class ResultCache():
+    """
+    The table results (key, result, last_used) of a SQLite database. last_used increases with each use of a result, the least recently used results have the lowest ones.
+    The version is a part of the keys: a cache opened with another version does not find the results of the previous one (they are removed as the least recently used).
+    """
+
+    def __init__(self, file_name: str, version: str, max_entries: int = MAX_ENTRIES) -> None:
+        self.file_name = file_name
+        self.version = version
+        self.max_entries = max_entries
+        self.number_of_hits = 0
+        self.number_of_misses = 0
+        self.connection = sqlite3.connect(file_name)
+        with self.connection:
+            self.connection.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, result TEXT, last_used INTEGER)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+        self._size, last_used = self.connection.execute("SELECT COUNT(*), MAX(last_used) FROM results").fetchone()
+        self._clock = last_used or 0 #The last_used of the most recently used result
+
+
+    def __enter__(self) -> "ResultCache":
+        return self
+
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+    def key(self, text: str, *settings: str) -> str:
+        """
+        Returns the key of the result of the extraction of the text with the given settings (ex: the compound engine).
+        """
+        key_hash = hashlib.sha256(self.version.encode("utf-8"))
+        for part in settings+(text,):
+            key_hash.update(b"\0"+part.encode("utf-8"))
+        return key_hash.hexdigest()
+
+
+    def _tick(self) -> int:
+        self._clock += 1
+        return self._clock
+
+
+    def get(self, key: str) -> dict:
+        """
+        Returns the result stored under the key, None if there is none.
+        """
+        row = self.connection.execute("SELECT result FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.number_of_misses += 1
+            return None
+        self.number_of_hits += 1
+        with self.connection:
+            self.connection.execute("UPDATE results SET last_used = ? WHERE key = ?", (self._tick(), key))
+        return json.loads(row[0])
+
+
+    def put(self, key: str, result: dict) -> None:
+        """
+        Stores the result (which has to be serialisable in JSON) under the key, and removes the least recently used results above the maximum number of results.
+        """
+        with self.connection:
+            if self.connection.execute("INSERT OR IGNORE INTO results VALUES (?, ?, ?)", (key, json.dumps(result, ensure_ascii=False), self._tick())).rowcount == 1:
+                self._size += 1
+            else:
+                self.connection.execute("UPDATE results SET result = ?, last_used = ? WHERE key = ?", (json.dumps(result, ensure_ascii=False), self._clock, key))
+            if self._size > self.max_entries:
+                self.connection.execute("DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY last_used LIMIT ?)", (self._size-self.max_entries,))
+                self._size = self.max_entries
+
+
+    def __len__(self) -> int:
+        return self._size
+
+
+    def __str__(self) -> str:
+        return "{} results cached, {} hits, {} misses".format(self._size, self.number_of_hits, self.number_of_misses)
+
+
+    def close(self) -> None:
+        self.connection.close()
@@ -0,0 +1,65 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Unit tests for testing keyword_extractor_cache.py
+"""
+
+import os
+import tempfile
+import unittest
+from keyword_extractor_cache import ResultCache, file_version
+
+
+RESULT = {'language': 'de', 'counts': {'Landtag': 3, 'SVP': 5}}
+
+
+class KeywordExtractorCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.folder.name, 'cache.sqlite')
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_hit_and_miss(self):
+        with ResultCache(self.file_name, '1') as cache:
+            key = cache.key('Der Landtag tagt.', 'smor', 'False')
+            self.assertIsNone(cache.get(key))
+            cache.put(key, RESULT)
+            self.assertEqual(cache.get(key), RESULT)
+            self.assertIsNone(cache.get(cache.key('Der Landtag tagt.', 'splitter', 'False'))) #Other settings
+            self.assertEqual((cache.number_of_hits, cache.number_of_misses), (1, 2))
+        with ResultCache(self.file_name, '1') as cache: #The results are kept in the file
+            self.assertEqual(cache.get(cache.key('Der Landtag tagt.', 'smor', 'False')), RESULT)
+        with ResultCache(self.file_name, '2') as cache: #Another version of the lexicons or of the extractor
+            self.assertIsNone(cache.get(cache.key('Der Landtag tagt.', 'smor', 'False')))
+
+    def test_least_recently_used_results_are_removed(self):
+        with ResultCache(self.file_name, '1', 2) as cache:
+            cache.put('a', RESULT)
+            cache.put('b', RESULT)
+            cache.get('a')
+            cache.put('c', RESULT)
+            cache.put('c', RESULT) #Replaced, not added
+            self.assertEqual(len(cache), 2)
+            self.assertIsNone(cache.get('b'))
+            self.assertEqual(cache.get('a'), RESULT)
+        with ResultCache(self.file_name, '1', 2) as cache:
+            cache.put('d', RESULT) #The clock goes on from the previous run: c is the least recently used
+            self.assertIsNone(cache.get('c'))
+            self.assertEqual(cache.get('a'), RESULT)
+
+    def test_file_version(self):
+        lexicon_file_name = os.path.join(self.folder.name, 'lexicon.txt')
+        self.assertEqual(file_version(lexicon_file_name), 'missing')
+        with open(lexicon_file_name, 'w', encoding='utf-8') as lexicon_file:
+            lexicon_file.write('Kompatscher\n')
+        version = file_version(lexicon_file_name)
+        with open(lexicon_file_name, 'a', encoding='utf-8') as lexicon_file:
+            lexicon_file.write('Durnwalder\n')
+        self.assertNotEqual(file_version(lexicon_file_name), version)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Splitter of German compounds, used by the KeywordExtractor (keyword_extractor_salto.py) instead of SMOR where SMOR is not installed or too slow.
+A compound is split into parts found in a frequency lexicon, possibly joined by linking elements (Arbeit-s-markt, Straße-n-bahn),
+choosing with dynamic programming the split whose parts have the highest geometric mean of frequencies.
+The results are written in the notation of SMOR (ex: Arbeit<NN>Markt<+NN>), so that they are read as SMOR analyses.
+"""
+
+import io, math
+
+
+LINKING_ELEMENTS = ("", "s", "es", "n", "en") #Elements that may join two parts of a compound
+MIN_PART_LENGTH = 3
+
+
+class CompoundSplitter():
+    """
+    Splits compounds into the parts of a lexicon: key: word in lowercase, value: its frequency.
+    A splitter may be built on top of a base splitter (ex: the lexicon file, read once and shared by the articles), whose lexicon is added to its own.
+    The words of the own lexicon of such a splitter (ex: the lemmas of an article, among which are the compounds to split) are parts of the other words:
+    a compound of the article is not returned as a single part because it occurs in the article. Such a word is returned as a single part only if it cannot be split.
+    """
+
+    def __init__(self, lexicon: dict = None, base: "CompoundSplitter" = None) -> None:
+        self.lexicon = {}
+        self.base = base
+        if lexicon is not None:
+            for word, frequency in lexicon.items():
+                self.add(word, frequency)
+
+
+    @classmethod
+    def from_file(cls, file_name: str) -> "CompoundSplitter":
+        """
+        Reads the lexicon from a text file: one word per line, optionally followed by its frequency (separated by a space or a tab).
+        """
+        splitter = cls()
+        with io.open(file_name, mode="r", encoding="utf-8") as lexicon_file:
+            for line in lexicon_file:
+                fields = line.split()
+                if len(fields) == 0:
+                    continue
+                frequency = float(fields[1]) if len(fields) > 1 else 1
+                splitter.add(fields[0], frequency)
+        return splitter
+
+
+    def add(self, word: str, frequency: float = 1) -> None:
+        """
+        Adds the frequency to the word (in lowercase) of the lexicon.
+        """
+        word = word.lower()
+        self.lexicon[word] = self.lexicon.get(word, 0)+frequency
+
+
+    def _frequency(self, part: str, word: str) -> float:
+        """
+        Returns the frequency of the part of the word (both in lowercase), None if it is not in the lexicons.
+        """
+        frequency = self.base.lexicon.get(part) if self.base is not None else None
+        if part in self.lexicon and (part != word or self.base is None):
+            frequency = (frequency or 0)+self.lexicon[part]
+        return frequency
+
+
+    def split(self, word: str) -> list:
+        """
+        Returns the parts of the word, without the linking elements, or None if the word cannot be built out of words of the lexicons.
+        A word of the lexicons that cannot be split is returned as a single part.
+        """
+        lowercase_word = word.lower()
+        length = len(lowercase_word)
+        #best[i]: key: number of parts, value: (sum of the logarithms of the frequencies of the parts, list of the parts) of the best way to build word[:i],
+        #each of the parts being followed by a linking element
+        best = [{} for _ in range(length+1)]
+        best[0][0] = (0.0, [])
+        for start in range(length):
+            if not best[start]:
+                continue
+            for end in range(start+MIN_PART_LENGTH, length+1):
+                frequency = self._frequency(lowercase_word[start:end], lowercase_word)
+                if frequency is None:
+                    continue
+                for number_of_parts, (score, parts) in best[start].items():
+                    candidate = (score+math.log(frequency+1), parts+[(start, end)])
+                    if end == length:
+                        linking_elements = ("",)
+                    else:
+                        linking_elements = LINKING_ELEMENTS
+                    for linking_element in linking_elements:
+                        following = end+len(linking_element)
+                        if following > length or not lowercase_word.startswith(linking_element, end):
+                            continue
+                        if following == length and end != length:
+                            continue #A compound does not end with a linking element
+                        known = best[following].get(number_of_parts+1)
+                        if known is None or candidate[0] > known[0]:
+                            best[following][number_of_parts+1] = candidate
+
+        if not best[length]:
+            if self.base is not None and lowercase_word in self.lexicon: #A word of the own lexicon that is not made of other words
+                return [word]
+            return None
+        #The split whose parts have the highest geometric mean of frequencies; with equal means, the one with fewer parts
+        number_of_parts = max(best[length], key=lambda n: (best[length][n][0]/n, -n))
+        return [word[start:end] for start, end in best[length][number_of_parts][1]]
+
+
+    def analyse(self, word: str) -> list:
+        """
+        Returns the analyses of the word in the notation of SMOR (an empty list if the word cannot be split).
+        The parts of a capitalised word are capitalised, as nouns.
+        """
+        parts = self.split(word)
+        if parts is None:
+            return []
+        if word[:1].isupper():
+            parts = [part[0].upper()+part[1:] for part in parts]
+        return ["<NN>".join(parts)+"<+NN>"]
+
+
+    def analyse_file(self, input_file_name: str, output_file_name: str) -> None:
+        """
+        Analyses the words of the input file (one word per line) and writes the analyses into the output file as SMOR does:
+        each word on a line starting with "> ", followed by its analyses, or by "no result for" and the word.
+        """
+        with io.open(input_file_name, mode="r", encoding="utf-8") as input_file, io.open(output_file_name, mode="w", encoding="utf-8") as output_file:
+            for line in input_file:
+                word = line.rstrip("\n")
+                if len(word) == 0:
+                    continue
+                output_file.write("> "+word+"\n")
+                analyses = self.analyse(word)
+                if len(analyses) == 0:
+                    output_file.write("no result for "+word+"\n")
+                for analysis in analyses:
+                    output_file.write(analysis+"\n")
@@ -0,0 +1,79 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Unit tests for testing keyword_extractor_compounds.py
+"""
+
+import io
+import os
+import tempfile
+import unittest
+from keyword_extractor_compounds import CompoundSplitter
+
+
+#Frequencies of German words in a news corpus (rounded)
+GERMAN_LEXICON = {'arbeit': 5200, 'markt': 3100, 'land': 9800, 'haupt': 900, 'mann': 6100, 'hauptmann': 150, 'gemeinde': 2900, 'rat': 4100, 'verkehr': 1800, 'unfall': 2200,
+                  'straße': 3900, 'bahn': 2600, 'bürger': 2700, 'meister': 1500, 'presse': 1900, 'konferenz': 1200, 'wetter': 2100, 'bericht': 3300}
+LEXICON = {'arbeit': 50, 'markt': 40, 'arbeitsmarkt': 2, 'land': 100, 'tag': 80, 'landtag': 30, 'straße': 20, 'bahn': 30, 'sprachig': 3, 'drei': 40}
+
+
+class KeywordExtractorCompoundsTest(unittest.TestCase):
+
+    def test_split(self):
+        splitter = CompoundSplitter(LEXICON)
+        self.assertEqual(splitter.split('Arbeitsmarkt'), ['Arbeit', 'markt']) #Linking element s
+        self.assertEqual(splitter.split('Straßenbahn'), ['Straße', 'bahn']) #Linking element n
+        self.assertEqual(splitter.split('Landtagsarbeit'), ['Land', 'tag', 'arbeit'])
+        self.assertEqual(splitter.split('dreisprachig'), ['drei', 'sprachig'])
+        self.assertEqual(splitter.split('Markt'), ['Markt'])
+        self.assertIsNone(splitter.split('Marktes')) #A compound does not end with a linking element
+        self.assertIsNone(splitter.split('Xylophon'))
+
+    def test_split_prefers_frequent_parts(self):
+        splitter = CompoundSplitter({'landtag': 1000, 'land': 2, 'tag': 2})
+        self.assertEqual(splitter.split('Landtag'), ['Landtag'])
+
+    def test_split_on_base(self):
+        base = CompoundSplitter(LEXICON)
+        splitter = CompoundSplitter({'arbeitsmarkt': 12, 'markt': 5, 'wehrlein': 3, 'wehr': 2}, base)
+        self.assertEqual(splitter.split('Arbeitsmarkt'), ['Arbeit', 'markt']) #The lemma of the article is not a part of itself
+        self.assertEqual(splitter.split('Markt'), ['Markt']) #A word of the base lexicon is
+        self.assertEqual(splitter.split('Wehrmarkt'), ['Wehr', 'markt'])
+        self.assertEqual(splitter.split('Wehrlein'), ['Wehrlein']) #A lemma of the article that cannot be split is a single part
+        self.assertIsNone(splitter.split('Xylophon'))
+        self.assertEqual(base.lexicon, LEXICON) #The base lexicon is not changed
+
+    def test_split_german_nouns(self):
+        base = CompoundSplitter(GERMAN_LEXICON)
+        article_lemmas = {'Landeshauptmann': 4, 'Gemeinderat': 3, 'Verkehrsunfall': 2, 'Unfall': 2, 'Pressekonferenz': 1, 'Wetterbericht': 1, 'Straßenbahn': 1, 'Passeiertal': 1, 'Bürgermeisterin': 1}
+        splitter = CompoundSplitter(article_lemmas, base)
+        expected_parts = {'Landeshauptmann': ['Land', 'haupt', 'mann'], 'Gemeinderat': ['Gemeinde', 'rat'], 'Verkehrsunfall': ['Verkehr', 'unfall'], 'Unfall': ['Unfall'],
+                          'Pressekonferenz': ['Presse', 'konferenz'], 'Wetterbericht': ['Wetter', 'bericht'], 'Straßenbahn': ['Straße', 'bahn'],
+                          'Passeiertal': ['Passeiertal'], 'Bürgermeisterin': ['Bürgermeisterin']} #No lexicon word for tal or meisterin
+        self.assertEqual({lemma: splitter.split(lemma) for lemma in article_lemmas}, expected_parts)
+        self.assertEqual(splitter.analyse('Unfall'), ['Unfall<+NN>']) #A simplex noun is analysed, as by SMOR, not left without result
+
+    def test_analyse_file(self):
+        splitter = CompoundSplitter(LEXICON)
+        self.assertEqual(splitter.analyse('Arbeitsmarkt'), ['Arbeit<NN>Markt<+NN>'])
+        self.assertEqual(splitter.analyse('dreisprachig'), ['drei<NN>sprachig<+NN>'])
+        with tempfile.TemporaryDirectory() as folder:
+            input_file_name = os.path.join(folder, 'lemmas.txt')
+            output_file_name = os.path.join(folder, 'lemmas.txt.smor.txt')
+            with io.open(input_file_name, mode='w', encoding='utf-8') as input_file:
+                input_file.write('Straßenbahn\nXylophon\n')
+            splitter.analyse_file(input_file_name, output_file_name)
+            with io.open(output_file_name, mode='r', encoding='utf-8') as output_file:
+                self.assertEqual(output_file.read(), '> Straßenbahn\nStraße<NN>Bahn<+NN>\n> Xylophon\nno result for Xylophon\n')
+
+    def test_from_file(self):
+        with tempfile.TemporaryDirectory() as folder:
+            file_name = os.path.join(folder, 'lexicon.txt')
+            with io.open(file_name, mode='w', encoding='utf-8') as lexicon_file:
+                lexicon_file.write('Arbeit\t50\nmarkt 40\nland\n\n')
+            splitter = CompoundSplitter.from_file(file_name)
+        self.assertEqual(splitter.lexicon, {'arbeit': 50, 'markt': 40, 'land': 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
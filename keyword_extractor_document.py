@@ -0,0 +1,314 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+The article analysed by the KeywordExtractor (keyword_extractor_salto.py), built once and read by the stages that need the tags of its words (the POS trimming stages)
+and the phrase index of its text (the stages that look up a word sequence: words that never go alone, keyword shortening and overlaps).
+Three stages still read the text itself, because they match across punctuation and line breaks that are not kept in the tokens:
+the quotes (_find_pieces_between_quotes), the collocations of two words (_word_always_followed_by_word2 and the like) and the preceding word index (_build_preceding_word_index).
+Keeps the text of the article, its sentences with their section (title, teaser or body) and language,
+and the tokens given by TreeTagger, so that the stages that need the tags of a word do not have to tag it again.
+The tokens are kept in arrays indexed by the position of the token in the document:
+the id of the token, lemma and POS tag in the Vocabulary of the article, the class of the POS tag,
+the sentence of the token, its character offsets in the tagged text and its capitalisation flags.
+"""
+
+import re
+from array import array
+from keyword_extractor_indexes import PhraseIndex
+from keyword_extractor_vocabulary import Vocabulary
+
+
+SECTIONS = ("TITLE:", "TEASER:", "BODY:") #The id of a section is its position in this tuple, -1 if the section is unknown
+
+#Classes of the POS tags of TreeTagger (German STTS and Italian tagsets)
+POS_OTHER = 0
+POS_NOUN = 1
+POS_PROPER_NOUN = 2
+POS_VERB = 3
+POS_ADJECTIVE = 4
+POS_CLASS_PATTERNS = ((POS_PROPER_NOUN, re.compile(r"(NE|NPR)")), (POS_NOUN, re.compile(r"(NN|NOM)")), (POS_VERB, re.compile(r"(V|VER)")), (POS_ADJECTIVE, re.compile(r"ADJ")))
+
+#Capitalisation flags of the tokens
+CAPITALISED = 1 #The first letter is in upper case
+ALL_CAPITALS = 2 #All the letters are in upper case
+FIRST_OF_SENTENCE = 4 #The token is the first word of its sentence
+
+
+def find_pos_class(pos: str) -> int:
+    """
+    Returns the class of the POS tag (noun, proper noun, verb, adjective or other).
+    """
+    for pos_class, pattern in POS_CLASS_PATTERNS:
+        if pattern.match(pos):
+            return pos_class
+    return POS_OTHER
+
+
+def find_capitalisation_flags(token: str, is_first_word_of_sentence: bool) -> int:
+    """
+    Returns the capitalisation flags of the token.
+    """
+    flags = FIRST_OF_SENTENCE if is_first_word_of_sentence else 0
+    if token[:1].isupper():
+        flags |= CAPITALISED
+        if token.isupper():
+            flags |= ALL_CAPITALS
+    return flags
+
+
+class Document():
+    """
+    An article: its raw text, its tagged sentences and their tokens.
+    The sentences are added with add_sentence() and their tokens with add_token() while they are tagged.
+    The tagged text of the document is the text of its sentences as it has been given to TreeTagger, joined by line breaks;
+    the character offsets of the tokens refer to it.
+    """
+
+    def __init__(self, raw_text: str, vocabulary: Vocabulary = None) -> None:
+        self.raw_text = raw_text
+        self.vocabulary = vocabulary if vocabulary is not None else Vocabulary()
+
+        #Sentences
+        self.sentences = [] #The tagged text of each sentence
+        self.sentence_sections = array('b') #The id of the section of each sentence
+        self.sentence_languages = [] #The language of each sentence
+        self.sentence_starts = array('i') #The offset of each sentence in the tagged text
+        self.sentence_first_tokens = array('i') #The position of the first token of each sentence
+        self._length = 0 #The length of the tagged text
+
+        #Tokens
+        self.token_ids = array('i')
+        self.lemma_ids = array('i')
+        self.pos_ids = array('i')
+        self.pos_classes = array('b')
+        self.flags = array('b')
+        self.token_sentences = array('i')
+        self.starts = array('i') #Offset of the token in the tagged text, -1 if the token is not found in its sentence (replaced URLs)
+        self.ends = array('i')
+        self._token_at_start = {} #Key: offset, value: position of the token starting at this offset
+        self._token_at_end = {} #Key: offset, value: position of the token ending at this offset
+        self._cursor = 0 #The offset in the current sentence from which the next token is searched
+
+        #Annotations of the lexicons (see keyword_extractor_gazetteer.py)
+        self.gazetteer_flags = array('b') #The categories of each token
+        self.gazetteer_spans = [] #The entries of several tokens: tuples (position of the first token, position of the token following the last one, categories)
+
+        self._phrase_index = None
+        self._text = None
+
+
+    def __len__(self) -> int:
+        return len(self.token_ids)
+
+
+    def add_sentence(self, sentence: str, section: str = None, language: str = None) -> int:
+        """
+        Adds a sentence, as it is given to TreeTagger. Its tokens have to be added after it with add_token().
+        Returns the id of the sentence.
+        """
+        if self.sentences:
+            self._length += 1 #The line break between sentences
+        sentence_id = len(self.sentences)
+        self.sentences.append(sentence)
+        self.sentence_sections.append(SECTIONS.index(section) if section in SECTIONS else -1)
+        self.sentence_languages.append(language)
+        self.sentence_starts.append(self._length)
+        self.sentence_first_tokens.append(len(self.token_ids))
+        self._length += len(sentence)
+        self._cursor = 0
+        self._text = None
+        return sentence_id
+
+
+    def add_token(self, token: str, pos: str, lemma: str) -> int:
+        """
+        Adds a token of the last sentence, with its POS tag and lemma given by TreeTagger.
+        Returns the position of the token in the document.
+        """
+        sentence_id = len(self.sentences)-1
+        position = len(self.token_ids)
+        vocabulary = self.vocabulary
+        self.token_ids.append(vocabulary.intern(token))
+        self.lemma_ids.append(vocabulary.intern(lemma))
+        self.pos_ids.append(vocabulary.intern(pos))
+        self.pos_classes.append(find_pos_class(pos))
+        self.flags.append(find_capitalisation_flags(token, position == self.sentence_first_tokens[sentence_id]))
+        self.token_sentences.append(sentence_id)
+
+        offset = self.sentences[sentence_id].find(token, self._cursor)
+        if offset == -1:
+            self.starts.append(-1)
+            self.ends.append(-1)
+        else:
+            self._cursor = offset+len(token)
+            start = self.sentence_starts[sentence_id]+offset
+            self.starts.append(start)
+            self.ends.append(start+len(token))
+            self._token_at_start[start] = position
+            self._token_at_end[start+len(token)] = position
+        return position
+
+
+    def add_tagged_sentence(self, sentence: str, tags: list, section: str = None, language: str = None) -> tuple:
+        """
+        Adds a sentence and its tokens, read from the output of TreeTagger ("token\tPOS\tlemma").
+        Unknown lemmas are replaced by the token; of several possible lemmas, the longest is taken.
+        Returns the positions of the first token of the sentence and of the token following its last one.
+        """
+        self.add_sentence(sentence, section, language)
+        first = len(self.token_ids)
+        for tag in tags:
+            tableForToken = tag.split("\t")
+            if len(tableForToken) != 3:
+                continue
+            token, pos, lemma = tableForToken
+            if lemma == "<UNKNOWN>":
+                lemma = token
+            #If TreeTagger suggests more than 1 possible lemma, we take the longest one
+            if "|" in lemma:
+                lemma = max(lemma.split("|"), key=len)
+            self.add_token(token, pos, lemma)
+        return first, len(self.token_ids)
+
+
+    @property
+    def text(self) -> str:
+        """
+        The tagged text of the document.
+        """
+        if self._text is None:
+            self._text = "\n".join(self.sentences)
+        return self._text
+
+
+    def section_of(self, position: int) -> str:
+        """
+        Returns the section of the token at the given position (None if it is unknown).
+        """
+        section_id = self.sentence_sections[self.token_sentences[position]]
+        return SECTIONS[section_id] if section_id >= 0 else None
+
+
+    def language_of(self, position: int) -> str:
+        """
+        Returns the language of the token at the given position.
+        """
+        return self.sentence_languages[self.token_sentences[position]]
+
+
+    def find_phrase(self, phrase: str, language: str = None) -> tuple:
+        """
+        Finds the first occurrence of the phrase in the tagged text that begins at the beginning of a token and ends at the end of a token.
+        If a language is given, only the sentences of this language are searched.
+        Returns the positions of its first token and of the token following its last one, or None if the phrase does not occur.
+        """
+        if len(phrase) == 0:
+            return None
+        text = self.text
+        offset = text.find(phrase)
+        while offset != -1:
+            first = self._token_at_start.get(offset)
+            last = self._token_at_end.get(offset+len(phrase))
+            if first is not None and last is not None and self.token_sentences[first] == self.token_sentences[last]:
+                if language is None or self.language_of(first) == language:
+                    return first, last+1
+            offset = text.find(phrase, offset+1)
+        return None
+
+
+    def tags_of(self, phrase: str, language: str = None) -> list:
+        """
+        Returns the tags of the tokens of the first occurrence of the phrase, in the format of TreeTagger ("token\tPOS\tlemma"),
+        or None if the phrase does not occur in the tagged text.
+        """
+        found = self.find_phrase(phrase, language)
+        if found is None:
+            return None
+        strings = self.vocabulary.strings
+        return [strings[self.token_ids[p]]+"\t"+strings[self.pos_ids[p]]+"\t"+strings[self.lemma_ids[p]] for p in range(found[0], found[1])]
+
+
+    def phrase_index(self) -> PhraseIndex:
+        """
+        Returns the index of the phrases of the raw text. Builds it the first time it is needed.
+        """
+        if self._phrase_index is None:
+            self._phrase_index = PhraseIndex(self.raw_text)
+        return self._phrase_index
+
+
+#Lowercase words that may link the capitalised words of a name (ex: Walther von Goethe, Leonardo da Vinci, Giovanni dell'Orto)
+CONNECTORS = frozenset({"von", "vom", "van", "de", "di", "da", "del", "della", "dell", "dell'", "dei", "degli", "delle", "dalla"})
+
+SECTION_WEIGHTS = (2, 1.5, 1) #The weight of a word of the title, teaser and body; a word of an unknown section weighs 1
+
+#Kinds of tokens for the runs of capitalised words
+NOT_A_NAME = 0
+NAME = 1
+NAME_CONTINUATION = 2 #A German capitalised common noun: only continues a run (ex: Süddeutsche Zeitung), as all German nouns are capitalised
+
+
+def find_name_kind(document: Document, position: int) -> int:
+    """
+    Finds out if the token at the given position can be part of a name: it has to be capitalised,
+    and if it is the first word of its sentence (capitalised whatever it is), it has to be tagged as a proper noun.
+    In German, it also has to be tagged as a noun, a proper noun or an adjective (ex: Süddeutsche Zeitung), since the polite pronouns are capitalised (ex: Sie, Ihre).
+    """
+    flags = document.flags[position]
+    if not flags & CAPITALISED or document.starts[position] == -1:
+        return NOT_A_NAME
+    pos_class = document.pos_classes[position]
+    if flags & FIRST_OF_SENTENCE and pos_class != POS_PROPER_NOUN:
+        return NOT_A_NAME
+    if document.language_of(position) == "de":
+        if pos_class not in (POS_NOUN, POS_PROPER_NOUN, POS_ADJECTIVE):
+            return NOT_A_NAME
+        if pos_class == POS_NOUN:
+            return NAME_CONTINUATION
+    return NAME
+
+
+def find_capitalised_runs(document: Document, connectors: set = CONNECTORS, language: str = None) -> list:
+    """
+    Loops once through the tokens of the document and finds the maximal runs of capitalised words (ex: Süddeutsche Zeitung, Nico Rosberg),
+    that may contain lowercase connectors (ex: von, di), but neither begin nor end with them.
+    If a language is given, only the sentences of this language are taken into account.
+    Returns the list of the runs of at least 2 capitalised words: tuples (position of the first token, position of the token following the last one).
+    """
+    runs = []
+    strings = document.vocabulary.strings
+    number_of_tokens = len(document)
+    position = 0
+    while position < number_of_tokens:
+        if find_name_kind(document, position) != NAME or (language is not None and document.language_of(position) != language):
+            position += 1
+            continue
+        sentence_id = document.token_sentences[position]
+        first = position
+        last = position
+        position += 1
+        while position < number_of_tokens and document.token_sentences[position] == sentence_id:
+            name_kind = find_name_kind(document, position)
+            if name_kind == NAME or (name_kind == NAME_CONTINUATION and last == position-1):
+                last = position
+            elif strings[document.token_ids[position]] not in connectors:
+                break
+            position += 1
+        if last > first:
+            runs.append((first, last+1))
+        position = last+1
+    return runs
+
+
+def count_capitalised_spans(document: Document, runs: list) -> dict:
+    """
+    Returns a hash: key: the text of a run of capitalised words, value: its frequency,
+    each occurrence weighing as much as a word of its section (title, teaser or body).
+    """
+    spans = {}
+    for first, last in runs:
+        span = document.text[document.starts[first]:document.ends[last-1]]
+        section_id = document.sentence_sections[document.token_sentences[first]]
+        weight = SECTION_WEIGHTS[section_id] if section_id >= 0 else 1
+        spans[span] = spans.get(span, 0)+weight
+    return spans
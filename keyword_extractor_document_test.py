@@ -0,0 +1,92 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Unit tests for testing keyword_extractor_document.py
+"""
+
+import unittest
+from keyword_extractor_document import Document, POS_NOUN, POS_PROPER_NOUN, POS_VERB, POS_ADJECTIVE, POS_OTHER, CAPITALISED, ALL_CAPITALS, FIRST_OF_SENTENCE, count_capitalised_spans, find_capitalised_runs
+
+
+TAGGED_SENTENCES = [
+    ("Der Landtag in Bozen", "TITLE:", "de", [("Der", "ART", "die"), ("Landtag", "NN", "Landtag"), ("in", "APPR", "in"), ("Bozen", "NE", "Bozen")]),
+    ("Die SVP stimmt dem Antrag zu", "BODY:", "de", [("Die", "ART", "die"), ("SVP", "NE", "SVP"), ("stimmt", "VVFIN", "stimmen"), ("dem", "ART", "die"), ("Antrag", "NN", "Antrag"), ("zu", "PTKVZ", "zu")]),
+    ("il Consiglio provinciale", None, "it", [("il", "DET:def", "il"), ("Consiglio", "NOM", "consiglio"), ("provinciale", "ADJ", "provinciale")]),
+]
+
+
+def build_document() -> Document:
+    document = Document("Der Landtag in Bozen\nDie SVP stimmt dem Antrag zu. Il Consiglio provinciale")
+    for sentence, section, language, tags in TAGGED_SENTENCES:
+        document.add_sentence(sentence, section, language)
+        for token, pos, lemma in tags:
+            document.add_token(token, pos, lemma)
+    return document
+
+
+class KeywordExtractorDocumentTest(unittest.TestCase):
+
+    def test_tokens(self):
+        document = build_document()
+        self.assertEqual(len(document), 13)
+        self.assertEqual(document.text, "Der Landtag in Bozen\nDie SVP stimmt dem Antrag zu\nil Consiglio provinciale")
+        for position in range(len(document)):
+            self.assertEqual(document.text[document.starts[position]:document.ends[position]], document.vocabulary.strings[document.token_ids[position]])
+        self.assertEqual(list(document.token_sentences), [0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 2, 2, 2])
+        self.assertEqual([document.section_of(p) for p in (0, 4, 10)], ["TITLE:", "BODY:", None])
+        self.assertEqual([document.language_of(p) for p in (0, 4, 10)], ["de", "de", "it"])
+        self.assertEqual([document.pos_classes[p] for p in (1, 3, 6, 11, 12)], [POS_NOUN, POS_PROPER_NOUN, POS_VERB, POS_NOUN, POS_ADJECTIVE])
+        self.assertEqual(document.pos_classes[0], POS_OTHER)
+        self.assertEqual(document.flags[0], CAPITALISED | FIRST_OF_SENTENCE)
+        self.assertEqual(document.flags[5], CAPITALISED | ALL_CAPITALS)
+        self.assertEqual(document.flags[6], 0)
+        self.assertEqual(document.vocabulary.strings[document.lemma_ids[6]], "stimmen")
+
+    def test_tags_of(self):
+        document = build_document()
+        self.assertEqual(document.tags_of("Landtag in Bozen"), ["Landtag\tNN\tLandtag", "in\tAPPR\tin", "Bozen\tNE\tBozen"])
+        self.assertEqual(document.tags_of("Consiglio provinciale", "it"), ["Consiglio\tNOM\tconsiglio", "provinciale\tADJ\tprovinciale"])
+        self.assertIsNone(document.tags_of("Consiglio provinciale", "de"))
+        self.assertIsNone(document.tags_of("andtag")) #Not at the beginning of a token
+        self.assertIsNone(document.tags_of("Bozen Die")) #Not in a single sentence
+        self.assertIsNone(document.tags_of(""))
+
+    def test_phrase_index(self):
+        document = build_document()
+        self.assertTrue(document.phrase_index().occurs("svp stimmt", ignore_case=True))
+        self.assertIs(document.phrase_index(), document.phrase_index())
+
+    def test_capitalised_runs(self):
+        document = Document("")
+        tagged_sentences = [
+            ("Laut der Süddeutschen Zeitung gewinnt Nico Rosberg", "TITLE:", "de", [("Laut", "APPR", "laut"), ("der", "ART", "die"), ("Süddeutschen", "ADJA", "süddeutsch"), ("Zeitung", "NN", "Zeitung"), ("gewinnt", "VVFIN", "gewinnen"), ("Nico", "NE", "Nico"), ("Rosberg", "NE", "Rosberg")]),
+            ("Der Landtag lobt Nico Rosberg", "BODY:", "de", [("Der", "ART", "die"), ("Landtag", "NN", "Landtag"), ("lobt", "VVFIN", "loben"), ("Nico", "NE", "Nico"), ("Rosberg", "NE", "Rosberg")]),
+            ("Rosberg und Walther von Goethe", "BODY:", "de", [("Rosberg", "NE", "Rosberg"), ("und", "KON", "und"), ("Walther", "NE", "Walther"), ("von", "APPR", "von"), ("Goethe", "NE", "Goethe")]),
+            ("Ne parla Giovanni dell Orto", "BODY:", "it", [("Ne", "CLI", "ne"), ("parla", "VER:pres", "parlare"), ("Giovanni", "NPR", "Giovanni"), ("dell", "PRE:det", "del"), ("Orto", "NPR", "Orto")]),
+        ]
+        for sentence, section, language, tags in tagged_sentences:
+            document.add_sentence(sentence, section, language)
+            for token, pos, lemma in tags:
+                document.add_token(token, pos, lemma)
+        runs = find_capitalised_runs(document)
+        self.assertEqual([document.text[document.starts[first]:document.ends[last-1]] for first, last in runs], ["Süddeutschen Zeitung", "Nico Rosberg", "Nico Rosberg", "Walther von Goethe", "Giovanni dell Orto"])
+        self.assertEqual(count_capitalised_spans(document, runs), {"Süddeutschen Zeitung": 2, "Nico Rosberg": 3, "Walther von Goethe": 1, "Giovanni dell Orto": 1})
+        self.assertEqual(len(find_capitalised_runs(document, language="it")), 1)
+
+    def test_capitalised_runs_after_polite_pronoun(self):
+        document = Document("")
+        tagged_sentences = [
+            ("Das sagte Sie Angela Merkel gestern", "BODY:", "de", [("Das", "PDS", "die"), ("sagte", "VVFIN", "sagen"), ("Sie", "PPER", "Sie"), ("Angela", "NE", "Angela"), ("Merkel", "NE", "Merkel"), ("gestern", "ADV", "gestern")]),
+            ("Wir danken Ihre Angela Merkel", "BODY:", "de", [("Wir", "PPER", "wir"), ("danken", "VVFIN", "danken"), ("Ihre", "PPOSAT", "Ihr"), ("Angela", "NE", "Angela"), ("Merkel", "NE", "Merkel")]),
+        ]
+        for sentence, section, language, tags in tagged_sentences:
+            document.add_sentence(sentence, section, language)
+            for token, pos, lemma in tags:
+                document.add_token(token, pos, lemma)
+        runs = find_capitalised_runs(document)
+        self.assertEqual([document.text[document.starts[first]:document.ends[last-1]] for first, last in runs], ["Angela Merkel", "Angela Merkel"])
+        self.assertEqual(count_capitalised_spans(document, runs), {"Angela Merkel": 2})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Reader of the dump files of the Salto archive for the KeywordExtractor (keyword_extractor_salto.py):
+a single file containing thousands of articles in the Salto format (TITLE:, TEASER:, BODY:) back to back, each article beginning with a line starting with TITLE:.
+The file is memory-mapped and never read as a whole. The beginnings of the articles are indexed as the articles are asked for,
+and the articles are given as slices of the mapped file (memoryview), which are decoded only when they are processed.
+A dump can be shared between workers by ranges of byte offsets: each worker reads the articles beginning in its range.
+"""
+
+import io, logging, mmap
+from array import array
+
+
+RECORD_MARKER = b"TITLE:" #The beginning of a line that begins an article
+
+
+def decode(record: memoryview) -> str:
+    """
+    Returns the text of an article given by a DumpReader.
+    """
+    return str(record, "utf-8")
+
+
+class DumpReader():
+    """
+    Memory-mapped dump file. The articles are numbered from 0 in the order of the file.
+    The text that precedes the first article (if any) is not an article.
+    """
+
+    def __init__(self, file_name: str) -> None:
+        self.file_name = file_name
+        self._file = io.open(file_name, mode="rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError: #An empty file cannot be mapped
+            self._map = b""
+        self._view = memoryview(self._map)
+        self._starts = array('q') #The offsets of the beginnings of the articles indexed so far
+        self._indexed_to = 0 #The offset from which the next beginning of an article is searched
+        self._complete = False #True when all the articles are indexed
+
+
+    def __enter__(self) -> "DumpReader":
+        return self
+
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+    def close(self) -> None:
+        """
+        Closes the file and the mapping. If articles given by the reader are still in use, the mapping cannot be closed at once:
+        the reader lets it go, and it is closed when the last of them is released (when the mmap object is garbage collected).
+        """
+        self._view.release()
+        if isinstance(self._map, mmap.mmap):
+            try:
+                self._map.close()
+            except BufferError:
+                logging.info("The mapping of the dump {} stays open until the articles still in use are released".format(self.file_name))
+        self._map = b""
+        self._view = memoryview(self._map)
+        self._file.close()
+
+
+    @property
+    def size(self) -> int:
+        """
+        The size of the file in bytes.
+        """
+        return len(self._map)
+
+
+    def _find_record_start(self, offset: int) -> int:
+        """
+        Returns the offset of the first beginning of an article at or after the given offset, -1 if there is none.
+        """
+        if offset == 0 and self._map[:len(RECORD_MARKER)] == RECORD_MARKER:
+            return 0
+        found = self._map.find(b"\n"+RECORD_MARKER, max(offset-1, 0))
+        return found+1 if found != -1 else -1
+
+
+    def _index_next(self) -> bool:
+        """
+        Indexes the beginning of the next article. Returns False if there is no more article.
+        """
+        if self._complete:
+            return False
+        start = self._find_record_start(self._indexed_to)
+        if start == -1:
+            self._complete = True
+            return False
+        self._starts.append(start)
+        self._indexed_to = start+len(RECORD_MARKER)
+        return True
+
+
+    def _end_of(self, number: int) -> int:
+        """
+        Returns the offset of the end of the article of the given number, which has to be indexed.
+        """
+        if number+1 < len(self._starts) or self._index_next():
+            return self._starts[number+1]
+        return len(self._map)
+
+
+    def __len__(self) -> int:
+        """
+        Returns the number of articles of the dump. Indexes all of them.
+        """
+        while self._index_next():
+            pass
+        return len(self._starts)
+
+
+    def __iter__(self):
+        """
+        Yields the articles of the dump, in order.
+        """
+        number = 0
+        while number < len(self._starts) or self._index_next():
+            yield self.record(number)
+            number += 1
+
+
+    def record(self, number: int) -> memoryview:
+        """
+        Returns the article of the given number (random access). Indexes the articles that precede it if they are not indexed yet.
+        """
+        while number >= len(self._starts):
+            if not self._index_next():
+                raise IndexError("The dump {} has only {} articles".format(self.file_name, len(self._starts)))
+        return self._view[self._starts[number]:self._end_of(number)]
+
+
+    def records_in_range(self, start: int, end: int):
+        """
+        Yields the articles that begin at an offset between start (included) and end (excluded), in order.
+        The ranges of split() give each article to exactly one worker. Does not use nor change the index.
+        """
+        record_start = self._find_record_start(start)
+        while record_start != -1 and record_start < end:
+            next_start = self._find_record_start(record_start+len(RECORD_MARKER))
+            yield self._view[record_start:next_start if next_start != -1 else len(self._map)]
+            record_start = next_start
+
+
+    def split(self, number_of_parts: int) -> list:
+        """
+        Divides the file into ranges of byte offsets of about the same size, to be given to records_in_range() by different workers.
+        """
+        size = len(self._map)
+        bounds = [size*part//number_of_parts for part in range(number_of_parts+1)]
+        return [(bounds[part], bounds[part+1]) for part in range(number_of_parts)]
@@ -0,0 +1,69 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Unit tests for testing keyword_extractor_dump.py
+"""
+
+import gc
+import io
+import os
+import tempfile
+import unittest
+import weakref
+from keyword_extractor_dump import DumpReader, decode
+
+
+ARTICLES = ["TITLE: Landtag %d\n\nTEASER: Über die Reform %d\n\nBODY: Der Text. TITLE: ist kein Anfang\n" % (i, i) for i in range(20)]
+
+
+class KeywordExtractorDumpTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.dump_file_name = os.path.join(self.folder.name, 'dump.txt')
+        with io.open(self.dump_file_name, mode='w', encoding='utf-8') as dump_file:
+            dump_file.write('Salto export\n' + ''.join(ARTICLES))
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_iterate(self):
+        with DumpReader(self.dump_file_name) as dump_reader:
+            self.assertEqual([decode(record) for record in dump_reader], ARTICLES)
+            self.assertEqual(len(dump_reader), 20)
+
+    def test_record(self):
+        with DumpReader(self.dump_file_name) as dump_reader:
+            self.assertEqual(decode(dump_reader.record(12)), ARTICLES[12])
+            self.assertEqual(decode(dump_reader.record(3)), ARTICLES[3])
+            self.assertEqual(decode(dump_reader.record(19)), ARTICLES[19])
+            with self.assertRaises(IndexError):
+                dump_reader.record(20)
+
+    def test_records_in_range(self):
+        with DumpReader(self.dump_file_name) as dump_reader:
+            for number_of_parts in (1, 2, 3, 7, 50):
+                records = [decode(record) for start, end in dump_reader.split(number_of_parts) for record in dump_reader.records_in_range(start, end)]
+                self.assertEqual(records, ARTICLES) #Each article is read by exactly one worker
+
+    def test_close_with_articles_in_use(self):
+        dump_reader = DumpReader(self.dump_file_name)
+        mapping = weakref.ref(dump_reader._map)
+        record = dump_reader.record(5)
+        dump_reader.close()
+        self.assertEqual(decode(record), ARTICLES[5]) #The article can still be read
+        self.assertIsNotNone(mapping())
+        del record
+        gc.collect()
+        self.assertIsNone(mapping()) #The mapping is closed with the last article
+
+    def test_empty_dump(self):
+        empty_file_name = os.path.join(self.folder.name, 'empty.txt')
+        io.open(empty_file_name, mode='w').close()
+        with DumpReader(empty_file_name) as dump_reader:
+            self.assertEqual(len(dump_reader), 0)
+            self.assertEqual(list(dump_reader.records_in_range(0, 10)), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+The lexicons of the KeywordExtractor (keyword_extractor_salto.py): first names, surnames, titles and the list of good keywords,
+put together in a trie of lowercase tokens built once, when the lexicons are read.
+The trie annotates the tokens of a Document (keyword_extractor_document.py) with the lexicons they belong to,
+and finds the longest entries of several tokens (ex: fünf sterne bewegung), so that the stages read the annotations
+instead of looking each word up in each lexicon.
+"""
+
+from array import array
+from keyword_extractor_document import Document
+
+
+#Categories of the entries, combined as bit flags
+FIRST_NAME = 1
+SURNAME = 2
+TITLE = 4
+LIST_KEYWORD = 8
+
+_CATEGORIES = None #The key of the categories of an entry in a node of the trie (tokens are never None)
+
+
+class Gazetteer():
+    """
+    Trie of the entries of the lexicons. Each node is a hash: key: lowercase token, value: the node of the entries continuing with this token;
+    the node in which an entry ends has the categories of the entry under the key None.
+    An entry is also found by categories_of() exactly as it is in the lexicon (spaces included), as with a set.
+    """
+
+    def __init__(self) -> None:
+        self._root = {}
+
+
+    @classmethod
+    def from_lexicons(cls, first_names: set, surnames: set, titles: set, list_keywords: set) -> "Gazetteer":
+        """
+        Builds the trie of the given lexicons, whose entries are in lowercase.
+        """
+        gazetteer = cls()
+        for entries, category in ((first_names, FIRST_NAME), (surnames, SURNAME), (titles, TITLE), (list_keywords, LIST_KEYWORD)):
+            for entry in entries:
+                gazetteer.add(entry, category)
+        return gazetteer
+
+
+    def add(self, entry: str, category: int) -> None:
+        """
+        Adds an entry (in lowercase) of the given category.
+        Entries of several words are also added as sequences of tokens, the words being separated by spaces.
+        """
+        node = self._root.setdefault(entry, {})
+        node[_CATEGORIES] = node.get(_CATEGORIES, 0) | category
+        tokens = entry.split()
+        if len(tokens) > 1:
+            node = self._root
+            for token in tokens:
+                node = node.setdefault(token, {})
+            node[_CATEGORIES] = node.get(_CATEGORIES, 0) | category
+
+
+    def categories_of(self, lowercase_word: str) -> int:
+        """
+        Returns the categories of the entry equal to the given word (0 if there is no such entry).
+        """
+        node = self._root.get(lowercase_word)
+        if node is None:
+            return 0
+        return node.get(_CATEGORIES, 0)
+
+
+    def longest_entry(self, lowercase_tokens: list, start: int) -> tuple:
+        """
+        Returns the end (the position of the token following the last one) and the categories of the longest entry of several tokens
+        beginning at the given position of the list of tokens, (start, 0) if there is none.
+        """
+        end, categories = start, 0
+        node = self._root.get(lowercase_tokens[start])
+        position = start+1
+        while node is not None and position < len(lowercase_tokens):
+            node = node.get(lowercase_tokens[position])
+            position += 1
+            if node is not None and _CATEGORIES in node:
+                end, categories = position, node[_CATEGORIES]
+        return end, categories
+
+
+    def annotate(self, document: Document, first: int, last: int) -> None:
+        """
+        Annotates the tokens of the document between the positions first and last (a sentence):
+        document.gazetteer_flags receives the categories of the token or of its lemma (in lowercase),
+        document.gazetteer_spans receives the entries of several tokens, the longest one where several begin at the same token and none overlapping another:
+        tuples (position of the first token, position of the token following the last one, categories).
+        """
+        vocabulary = document.vocabulary
+        strings = vocabulary.strings
+        flags = document.gazetteer_flags
+        if len(flags) < last:
+            flags.extend(array('b', bytes(last-len(flags))))
+        lowercase_tokens = [strings[vocabulary.lowercase(document.token_ids[position])] for position in range(first, last)]
+
+        span_end = first #The position following the last span found
+        for position in range(first, last):
+            flags[position] = self.categories_of(lowercase_tokens[position-first]) | self.categories_of(strings[vocabulary.lowercase(document.lemma_ids[position])])
+            if position < span_end:
+                continue
+            end, categories = self.longest_entry(lowercase_tokens, position-first)
+            if categories:
+                span_end = first+end
+                document.gazetteer_spans.append((position, span_end, categories))
@@ -0,0 +1,51 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Unit tests for testing keyword_extractor_gazetteer.py
+"""
+
+import unittest
+from keyword_extractor_document import Document
+from keyword_extractor_gazetteer import Gazetteer, FIRST_NAME, SURNAME, TITLE, LIST_KEYWORD
+
+
+class KeywordExtractorGazetteerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.gazetteer = Gazetteer.from_lexicons({'arno', 'maria'}, {'kompatscher', 'maria'}, {'herr', 'hr.', 'landeshauptmann'}, {'svp', 'fünf sterne bewegung', 'fünf sterne', 'sterne bewegung'})
+
+    def test_categories_of(self):
+        self.assertEqual(self.gazetteer.categories_of('arno'), FIRST_NAME)
+        self.assertEqual(self.gazetteer.categories_of('maria'), FIRST_NAME | SURNAME)
+        self.assertEqual(self.gazetteer.categories_of('hr.'), TITLE)
+        self.assertEqual(self.gazetteer.categories_of('fünf sterne bewegung'), LIST_KEYWORD)
+        self.assertEqual(self.gazetteer.categories_of('fünf'), 0)
+        self.assertEqual(self.gazetteer.categories_of('Arno'), 0) #Words are looked up in lowercase
+
+    def test_longest_entry(self):
+        gazetteer = Gazetteer.from_lexicons(set(), {'de la'}, set(), {'de la cruz', 'la cruz'})
+        tokens = ['juan', 'de', 'la', 'cruz', 'kommt']
+        self.assertEqual(gazetteer.longest_entry(tokens, 1), (4, LIST_KEYWORD))
+        self.assertEqual(gazetteer.longest_entry(tokens[:3], 1), (3, SURNAME)) #The longer entry is not complete
+        self.assertEqual(gazetteer.longest_entry(tokens, 0), (0, 0))
+        document = Document("")
+        first, last = document.add_tagged_sentence("Juan de la Cruz kommt", ["Juan\tNE\tJuan", "de\tNE\tde", "la\tNE\tla", "Cruz\tNE\tCruz", "kommt\tVVFIN\tkommen"])
+        gazetteer.annotate(document, first, last)
+        self.assertEqual(document.gazetteer_spans, [(1, 4, LIST_KEYWORD)]) #la cruz overlaps it
+
+    def test_annotate(self):
+        document = Document("")
+        tags = ["Landeshauptmann\tNN\tLandeshauptmann", "Arno\tNE\tArno", "Kompatscher\tNE\tKompatscher", "lobt\tVVFIN\tloben", "die\tART\tdie", "Fünf\tADJA\tfünf", "Sterne\tNN\tStern", "Bewegung\tNN\tBewegung", "und\tKON\tund", "die\tART\tdie", "SVP\tNE\tSVP"]
+        first, last = document.add_tagged_sentence("Landeshauptmann Arno Kompatscher lobt die Fünf Sterne Bewegung und die SVP", tags, "BODY:", "de")
+        self.gazetteer.annotate(document, first, last)
+        self.assertEqual(list(document.gazetteer_flags), [TITLE, FIRST_NAME, SURNAME, 0, 0, 0, 0, 0, 0, 0, LIST_KEYWORD])
+        self.assertEqual(document.gazetteer_spans, [(5, 8, LIST_KEYWORD)]) #The longest entry, not fünf sterne or sterne bewegung
+
+        #The lemma is also looked up
+        first, last = document.add_tagged_sentence("Herren", ["Herren\tNN\tHerr"])
+        self.gazetteer.annotate(document, first, last)
+        self.assertEqual(document.gazetteer_flags[first], TITLE)
+
+
+if __name__ == '__main__':
+    unittest.main()
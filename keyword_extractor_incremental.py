@@ -0,0 +1,143 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Incremental mode of the KeywordExtractor (keyword_extractor_salto.py): the extraction of an article keeps the tags of its sentences by TreeTagger
+and the analyses of its lemmas by SMOR, so that the extraction of its next version (ex: a live blog with new entries, a corrected article)
+tags only the sentences that are new and analyses only the lemmas that are new.
+The dictionaries of the extractor are filled again from the tags of the sentences of the new version: the sentences removed from the article are not counted anymore,
+and the keywords are the same as those of an extraction from scratch. The tags and analyses not used by the new version are dropped.
+The states of the articles are kept in a SQLite file, under the ids of the articles.
+"""
+
+import json, sqlite3
+
+
+class ArticleState():
+    """
+    The tags of the sentences of an article (key: language of the tagger and sentence, value: the tags, "token\tPOS\tlemma")
+    and the analyses of its lemmas by SMOR (key: lemma, value: the lines of its analyses, None if SMOR gave none).
+    The version is the key of the text of the version of the article they come from (its key in the result cache), None if it is not known.
+    """
+
+    def __init__(self, tags: dict = None, analyses: dict = None, version: str = None) -> None:
+        self.tags = tags if tags is not None else {}
+        self.analyses = analyses if analyses is not None else {}
+        self.version = version
+        self._used_tags = set() #The keys of the tags used by the current version of the article
+        self._used_analyses = set()
+        self.number_of_tagged_sentences = 0
+        self.number_of_reused_sentences = 0
+        self.number_of_removed_sentences = 0
+        self.number_of_analysed_lemmas = 0
+        self.number_of_reused_lemmas = 0
+
+
+    def start_version(self) -> None:
+        """
+        Begins the extraction of a new version of the article.
+        """
+        self._used_tags = set()
+        self._used_analyses = set()
+        self.number_of_tagged_sentences = 0
+        self.number_of_reused_sentences = 0
+        self.number_of_removed_sentences = 0
+        self.number_of_analysed_lemmas = 0
+        self.number_of_reused_lemmas = 0
+
+
+    def end_version(self) -> None:
+        """
+        Ends the extraction of the version of the article: drops the tags of the sentences and the analyses of the lemmas it does not contain anymore.
+        """
+        self.number_of_removed_sentences = len(self.tags)-len(self._used_tags)
+        self.tags = {key: tags for key, tags in self.tags.items() if key in self._used_tags}
+        self.analyses = {lemma: analyses for lemma, analyses in self.analyses.items() if lemma in self._used_analyses}
+
+
+    def tag(self, tagger, text: str) -> list:
+        """
+        Returns the tags of the text by the tagger (a TreeTagger of treetaggerwrapper). The text is tagged only if it was not tagged for the previous version.
+        """
+        key = tagger.lang+"\t"+text
+        self._used_tags.add(key)
+        if key in self.tags:
+            self.number_of_reused_sentences += 1
+        else:
+            self.tags[key] = tagger.tag_text(text)
+            self.number_of_tagged_sentences += 1
+        return self.tags[key]
+
+
+    def missing_analyses(self, lemmas: list) -> list:
+        """
+        Returns the lemmas of the list that have not been analysed by SMOR for the previous version.
+        """
+        missing_lemmas = [lemma for lemma in lemmas if lemma not in self.analyses]
+        self.number_of_reused_lemmas += len(lemmas)-len(missing_lemmas)
+        self.number_of_analysed_lemmas += len(missing_lemmas)
+        return missing_lemmas
+
+
+    def add_analyses(self, lemmas: list, smor_analysis_hash: dict) -> None:
+        """
+        Adds the analyses by SMOR of the lemmas (key: lemma, value: the lines of its analyses). The lemmas without analysis are recorded as such.
+        """
+        for lemma in lemmas:
+            self.analyses[lemma] = None
+        self.analyses.update(smor_analysis_hash)
+
+
+    def analyses_of(self, lemmas: list) -> dict:
+        """
+        Returns the hash of the analyses by SMOR of the lemmas that have some, in the order of the list.
+        """
+        self._used_analyses.update(lemmas)
+        return {lemma: list(self.analyses[lemma]) for lemma in lemmas if self.analyses.get(lemma) is not None}
+
+
+    def __str__(self) -> str:
+        return "{} sentences tagged, {} reused, {} removed; {} lemmas analysed, {} reused".format(self.number_of_tagged_sentences, self.number_of_reused_sentences,
+            self.number_of_removed_sentences, self.number_of_analysed_lemmas, self.number_of_reused_lemmas)
+
+
+class IncrementalStore():
+    """
+    The table states (article_id, state) of a SQLite database: the states of the articles, in JSON.
+    """
+
+    def __init__(self, file_name: str) -> None:
+        self.file_name = file_name
+        self.connection = sqlite3.connect(file_name)
+        with self.connection:
+            self.connection.execute("CREATE TABLE IF NOT EXISTS states (article_id TEXT PRIMARY KEY, state TEXT)")
+
+
+    def __enter__(self) -> "IncrementalStore":
+        return self
+
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+    def get(self, article_id: str) -> ArticleState:
+        """
+        Returns the state of the article, an empty state if it has never been processed.
+        """
+        row = self.connection.execute("SELECT state FROM states WHERE article_id = ?", (article_id,)).fetchone()
+        if row is None:
+            return ArticleState()
+        state = json.loads(row[0])
+        return ArticleState(state["tags"], state["analyses"], state.get("version"))
+
+
+    def put(self, article_id: str, state: ArticleState) -> None:
+        """
+        Stores the state of the article, in place of the previous one.
+        """
+        with self.connection:
+            self.connection.execute("INSERT OR REPLACE INTO states VALUES (?, ?)", (article_id, json.dumps({"tags": state.tags, "analyses": state.analyses, "version": state.version}, ensure_ascii=False)))
+
+
+    def close(self) -> None:
+        self.connection.close()
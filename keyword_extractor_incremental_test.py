@@ -0,0 +1,70 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Unit tests for testing keyword_extractor_incremental.py
+"""
+
+import os
+import tempfile
+import unittest
+from keyword_extractor_incremental import ArticleState, IncrementalStore
+
+
+class FakeTagger():
+    """
+    Tags each word as a noun, and records the texts it tags.
+    """
+
+    def __init__(self, lang):
+        self.lang = lang
+        self.tagged_texts = []
+
+    def tag_text(self, text):
+        self.tagged_texts.append(text)
+        return ['{}\tNN\t{}'.format(word, word) for word in text.split()]
+
+
+class KeywordExtractorIncrementalTest(unittest.TestCase):
+
+    def test_only_new_sentences_are_tagged(self):
+        tagger = FakeTagger('de')
+        state = ArticleState()
+        state.start_version()
+        for sentence in ('Der Landtag tagt.', 'Die SVP stimmt zu.'):
+            state.tag(tagger, sentence)
+        state.end_version()
+        state.start_version() #The second version: a sentence removed, a sentence added
+        self.assertEqual(state.tag(tagger, 'Der Landtag tagt.'), ['Der\tNN\tDer', 'Landtag\tNN\tLandtag', 'tagt.\tNN\ttagt.'])
+        state.tag(tagger, 'Kompatscher antwortet.')
+        state.end_version()
+        self.assertEqual(tagger.tagged_texts, ['Der Landtag tagt.', 'Die SVP stimmt zu.', 'Kompatscher antwortet.'])
+        self.assertEqual((state.number_of_tagged_sentences, state.number_of_reused_sentences, state.number_of_removed_sentences), (1, 1, 1))
+        self.assertEqual(sorted(state.tags), ['de\tDer Landtag tagt.', 'de\tKompatscher antwortet.'])
+
+    def test_only_new_lemmas_are_analysed(self):
+        state = ArticleState()
+        state.start_version()
+        self.assertEqual(state.missing_analyses(['Landtag', 'Xyz']), ['Landtag', 'Xyz'])
+        state.add_analyses(['Landtag', 'Xyz'], {'Landtag': ['Land<NN>Tag<+NN>']})
+        self.assertEqual(state.analyses_of(['Landtag', 'Xyz']), {'Landtag': ['Land<NN>Tag<+NN>']})
+        state.end_version()
+        state.start_version()
+        self.assertEqual(state.missing_analyses(['Xyz', 'Landtag', 'Gemeinderat']), ['Gemeinderat']) #Xyz has no analysis, but was analysed
+        self.assertEqual(state.number_of_reused_lemmas, 2)
+
+    def test_store(self):
+        with tempfile.TemporaryDirectory() as folder:
+            file_name = os.path.join(folder, 'incremental.sqlite')
+            with IncrementalStore(file_name) as store:
+                self.assertEqual(store.get('21717.txt').tags, {})
+                state = ArticleState({'de\tDer Landtag tagt.': ['Landtag\tNN\tLandtag']}, {'Landtag': ['Land<NN>Tag<+NN>'], 'Xyz': None}, 'a1b2')
+                store.put('21717.txt', state)
+            with IncrementalStore(file_name) as store:
+                state = store.get('21717.txt')
+                self.assertEqual(state.tags, {'de\tDer Landtag tagt.': ['Landtag\tNN\tLandtag']})
+                self.assertEqual(state.analyses, {'Landtag': ['Land<NN>Tag<+NN>'], 'Xyz': None})
+                self.assertEqual(state.version, 'a1b2')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,545 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Indexes built once per article and used by the KeywordExtractor (keyword_extractor_salto.py)
+instead of scanning the text or comparing all the pairs of keywords again and again.
+"""
+
+import re, editdistance
+from bisect import bisect_left, bisect_right
+
+
+#A token of a keyword or of the text: a sequence of letters and digits
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize_with_offsets(text: str) -> list:
+    """
+    Splits a text into tokens (sequences of letters and digits).
+    Returns a list of tuples (token, position of its first character, position following its last character).
+    """
+    return [(match.group(), match.start(), match.end()) for match in TOKEN_PATTERN.finditer(text)]
+
+
+def fold_case(text: str) -> str:
+    """
+    Casefolds a text character by character, keeping the characters whose casefolded form is longer than 1 character (ß) unchanged.
+    The casefolded text has the same length as the original text, so that positions in one are positions in the other.
+    """
+    folded_text = text.casefold()
+    if len(folded_text) == len(text): #No character has a longer casefolded form
+        return folded_text
+    folded_characters = []
+    for character in text:
+        folded_character = character.casefold()
+        if len(folded_character) != 1:
+            folded_character = character
+        folded_characters.append(folded_character)
+    return "".join(folded_characters)
+
+
+def build_suffix_array(sequence: list) -> list:
+    """
+    Builds the suffix array of a sequence of integers by prefix doubling:
+    suffixes are sorted by their first character, then by their first 2, 4, 8... characters, until all of them are distinguished.
+    Returns the list of the start positions of the suffixes of the sequence in lexicographic order.
+    """
+    n = len(sequence)
+    suffix_array = sorted(range(n), key=sequence.__getitem__)
+    rank = [0]*n
+    for i in range(1, n):
+        rank[suffix_array[i]] = rank[suffix_array[i-1]]+(sequence[suffix_array[i]] != sequence[suffix_array[i-1]])
+
+    k = 1
+    while n > 0 and rank[suffix_array[-1]] < n-1:
+        sort_key = [(rank[i], rank[i+k] if i+k < n else -1) for i in range(n)]
+        suffix_array.sort(key=sort_key.__getitem__)
+        new_rank = [0]*n
+        for i in range(1, n):
+            new_rank[suffix_array[i]] = new_rank[suffix_array[i-1]]+(sort_key[suffix_array[i]] != sort_key[suffix_array[i-1]])
+        rank = new_rank
+        k *= 2
+
+    return suffix_array
+
+
+class SuffixArray():
+    """
+    Suffix array of a sequence (a string or a list of integers).
+    Finds the suffixes that start with a given prefix with a binary search.
+    """
+
+    def __init__(self, sequence) -> None:
+        self.sequence = sequence
+        if isinstance(sequence, str):
+            self.suffix_array = build_suffix_array([ord(character) for character in sequence])
+        else:
+            self.suffix_array = build_suffix_array(sequence)
+
+
+    def find_range(self, prefix) -> tuple:
+        """
+        Returns the range (start, end) of the suffix array containing the suffixes that start with the given prefix.
+        """
+        m = len(prefix)
+        sequence = self.sequence
+        suffix_array = self.suffix_array
+        low, high = 0, len(suffix_array)
+        while low < high:
+            middle = (low+high)//2
+            if sequence[suffix_array[middle]:suffix_array[middle]+m] < prefix:
+                low = middle+1
+            else:
+                high = middle
+        start = low
+        high = len(suffix_array)
+        while low < high:
+            middle = (low+high)//2
+            if sequence[suffix_array[middle]:suffix_array[middle]+m] <= prefix:
+                low = middle+1
+            else:
+                high = middle
+        return start, low
+
+
+class PhraseIndex():
+    """
+    Answers the question "does this phrase occur in the text?"
+    with a suffix array built once per text over the sequence of its tokens (ids of casefolded tokens), to look for whole words,
+    instead of scanning the whole text with regular expressions.
+    Any other piece of text is looked for in the casefolded text with str.find: a suffix array of the characters would take seconds to build in Python for a long article.
+    """
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.folded_text = fold_case(text)
+
+        self.token_starts = []
+        self.token_ends = []
+        self.token_ids = {} #Key: casefolded token, value: its id
+        self._token_id_sequence = []
+        for match in TOKEN_PATTERN.finditer(self.folded_text):
+            self.token_starts.append(match.start())
+            self.token_ends.append(match.end())
+            self._token_id_sequence.append(self.token_ids.setdefault(match.group(), len(self.token_ids)))
+        self._token_suffix_array = None
+
+
+    @property
+    def token_suffix_array(self) -> SuffixArray:
+        """
+        The suffix array of the tokens of the text. Built the first time a whole-word phrase is looked for.
+        """
+        if self._token_suffix_array is None:
+            self._token_suffix_array = SuffixArray(self._token_id_sequence)
+        return self._token_suffix_array
+
+
+    def _find_pieces(self, folded_phrase: str) -> list:
+        """
+        Returns the positions of the casefolded piece of text in the casefolded text (overlapping occurrences included).
+        """
+        positions = []
+        position = self.folded_text.find(folded_phrase)
+        while position != -1:
+            positions.append(position)
+            position = self.folded_text.find(folded_phrase, position+1)
+        return positions
+
+
+    def _find_positions(self, phrase: str, ignore_case: bool, whole_tokens: bool) -> list:
+        """
+        Returns the positions of the phrase in the text.
+        If whole_tokens is True, the phrase must start at the beginning of a token and end at the end of a token
+        (a phrase without any word in it is looked for as a piece of text).
+        """
+        folded_phrase = fold_case(phrase)
+        tokens = list(TOKEN_PATTERN.finditer(folded_phrase))
+        if whole_tokens and len(tokens) > 0:
+            token_id_sequence = []
+            for token in tokens:
+                if token.group() not in self.token_ids:
+                    return []
+                token_id_sequence.append(self.token_ids[token.group()])
+
+            start, end = self.token_suffix_array.find_range(token_id_sequence)
+            candidates = sorted(self.token_starts[t]-tokens[0].start() for t in self.token_suffix_array.suffix_array[start:end])
+            positions = []
+            for position in candidates:
+                phrase_end = position+len(phrase)
+                if position < 0 or self.folded_text[position:phrase_end] != folded_phrase:
+                    continue
+                #The phrase must not end in the middle of a token of the text
+                if phrase[-1].isalnum() and phrase_end < len(self.text) and self.text[phrase_end].isalnum():
+                    continue
+                positions.append(position)
+        else:
+            if len(phrase) == 0:
+                return []
+            positions = self._find_pieces(folded_phrase)
+
+        if not ignore_case:
+            positions = [position for position in positions if self.text.startswith(phrase, position)]
+        return positions
+
+
+    def occurs(self, phrase: str, ignore_case: bool = False, whole_tokens: bool = True) -> bool:
+        """
+        Returns True if the phrase occurs in the text.
+        By default the comparison is case sensitive and the phrase must start and end at token boundaries.
+        """
+        if ignore_case and not whole_tokens:
+            return len(phrase) > 0 and fold_case(phrase) in self.folded_text
+        return len(self._find_positions(phrase, ignore_case, whole_tokens)) > 0
+
+
+def find_keywords_containing_keywords(keywords: list) -> dict:
+    """
+    Finds, for each keyword of the list, the other keywords of the list that contain it.
+    All the keywords are put one after another into a single string, in which each keyword is looked for,
+    instead of comparing all the pairs of keywords.
+    Returns a hash: key: keyword, value: list of the keywords that contain it.
+    """
+    all_keywords_string = "\x00".join(keywords)
+    keyword_starts = []
+    position = 0
+    for keyword in keywords:
+        keyword_starts.append(position)
+        position += len(keyword)+1
+
+    containing_keywords = {}
+    for keyword in keywords:
+        if len(keyword) == 0:
+            continue
+        position = all_keywords_string.find(keyword)
+        while position != -1:
+            k = bisect_right(keyword_starts, position)-1
+            if keywords[k] != keyword and position+len(keyword) <= keyword_starts[k]+len(keywords[k]):
+                if keyword in containing_keywords:
+                    if keywords[k] not in containing_keywords[keyword]:
+                        containing_keywords[keyword].append(keywords[k])
+                else:
+                    containing_keywords[keyword] = [keywords[k]]
+            position = all_keywords_string.find(keyword, position+1)
+
+    return containing_keywords
+
+
+def find_keywords_contained_in(keywords: list, containers: list) -> dict:
+    """
+    Finds, for each container of the list, the keywords of the other list that it contains (and that are not equal to it).
+    The containers are put one after another into a single string, in which each keyword is looked for.
+    Returns a hash: key: container, value: list of the keywords it contains, in the order of the list of keywords.
+    """
+    all_containers_string = "\x00".join(containers)
+    container_starts = []
+    position = 0
+    for container in containers:
+        container_starts.append(position)
+        position += len(container)+1
+
+    contained_keywords = {}
+    for keyword in keywords:
+        if len(keyword) == 0:
+            continue
+        position = all_containers_string.find(keyword)
+        while position != -1:
+            c = bisect_right(container_starts, position)-1
+            container = containers[c]
+            if container != keyword and position+len(keyword) <= container_starts[c]+len(container):
+                if container in contained_keywords:
+                    if contained_keywords[container][-1] != keyword:
+                        contained_keywords[container].append(keyword)
+                else:
+                    contained_keywords[container] = [keyword]
+            position = all_containers_string.find(keyword, position+1)
+
+    return contained_keywords
+
+
+#The characters that separate a keyword from the rest of a longer keyword that contains it
+KEYWORD_DELIMITERS = " -._,:&\"'*+^$"
+KEYWORD_DELIMITERS_PATTERN = re.compile("["+re.escape(KEYWORD_DELIMITERS)+"]+")
+KEYWORD_PIECE_PATTERN = re.compile("[^"+re.escape(KEYWORD_DELIMITERS)+"]+")
+
+
+class ContainmentIndex():
+    """
+    Index of a set of keywords, used to check if a keyword is part of one of them.
+    A keyword is part of another one if it occurs in it (ignoring the case) just after or just before a delimiter (space, hyphen, dot, apostrophe...):
+    "rossi" is part of "Mario Rossi", "dfb" of "DFB-Team", "rom" of "AS Roma", but "rom" is not part of "Roma".
+    Each keyword is split into pieces at the delimiters. The pieces are sorted, so that all the pieces that start with a word
+    (or that end with it, for the reversed pieces) are found with a binary search, and each piece points to the keywords that contain it.
+    """
+
+    def __init__(self, keywords) -> None:
+        self.keywords = list(keywords)
+        self.lowercase_keywords = [keyword.lower() for keyword in self.keywords]
+        starting_pieces = {} #Key: piece that follows a delimiter, value: set of the ids of the keywords in which it does
+        ending_pieces = {} #Key: reversed piece that precedes a delimiter, value: set of the ids of the keywords in which it does
+        self.pieces = {} #Key: piece, value: set of the ids of the keywords in which it is preceded and followed by a delimiter
+        self.keywords_with_delimiters = set()
+        for k, keyword in enumerate(self.lowercase_keywords):
+            for match in KEYWORD_PIECE_PATTERN.finditer(keyword):
+                preceded = match.start() > 0
+                followed = match.end() < len(keyword)
+                if preceded:
+                    starting_pieces.setdefault(match.group(), set()).add(k)
+                if followed:
+                    ending_pieces.setdefault(match.group()[::-1], set()).add(k)
+                if preceded and followed:
+                    self.pieces.setdefault(match.group(), set()).add(k)
+            if KEYWORD_DELIMITERS_PATTERN.search(keyword):
+                self.keywords_with_delimiters.add(k)
+
+        self.starting_pieces = sorted(starting_pieces.items())
+        self.starting_piece_keys = [piece for piece, _ in self.starting_pieces]
+        self.ending_pieces = sorted(ending_pieces.items())
+        self.ending_piece_keys = [piece for piece, _ in self.ending_pieces]
+
+
+    def _keywords_with_pieces_starting_with(self, prefix: str) -> set:
+        """
+        Returns the ids of the keywords that contain a piece that follows a delimiter and starts with the prefix.
+        """
+        return self._find_in_sorted_pieces(self.starting_pieces, self.starting_piece_keys, prefix)
+
+
+    def _keywords_with_pieces_ending_with(self, suffix: str) -> set:
+        """
+        Returns the ids of the keywords that contain a piece that precedes a delimiter and ends with the suffix.
+        """
+        return self._find_in_sorted_pieces(self.ending_pieces, self.ending_piece_keys, suffix[::-1])
+
+
+    def _find_in_sorted_pieces(self, sorted_pieces: list, sorted_keys: list, prefix: str) -> set:
+        """
+        Returns the union of the keyword ids of the sorted pieces that start with the prefix.
+        """
+        found = set()
+        i = bisect_left(sorted_keys, prefix)
+        while i < len(sorted_keys) and sorted_keys[i].startswith(prefix):
+            found.update(sorted_pieces[i][1])
+            i += 1
+        return found
+
+
+    def _find_candidates(self, form: str) -> set:
+        """
+        Returns the ids of the keywords in which the lowercase form may occur next to a delimiter.
+        """
+        form_pieces = KEYWORD_DELIMITERS_PATTERN.split(form)
+        if len(form_pieces) == 1:
+            return self._keywords_with_pieces_starting_with(form) | self._keywords_with_pieces_ending_with(form)
+
+        #The form contains delimiters: its first piece ends a piece of the keyword, its last piece starts one and the others are whole pieces
+        candidates = self.keywords_with_delimiters
+        for i, piece in enumerate(form_pieces):
+            if len(piece) == 0:
+                continue
+            if i == 0:
+                candidates = candidates & self._keywords_with_pieces_ending_with(piece)
+            elif i == len(form_pieces)-1:
+                candidates = candidates & self._keywords_with_pieces_starting_with(piece)
+            else:
+                candidates = candidates & self.pieces.get(piece, set())
+            if len(candidates) == 0:
+                break
+        return candidates
+
+
+    def _occurs_next_to_delimiter(self, form: str, keyword: str) -> bool:
+        """
+        Returns True if the lowercase form occurs in the lowercase keyword just after or just before a delimiter.
+        """
+        position = keyword.find(form)
+        while position != -1:
+            end = position+len(form)
+            if (position > 0 and keyword[position-1] in KEYWORD_DELIMITERS) or (end < len(keyword) and keyword[end] in KEYWORD_DELIMITERS):
+                return True
+            position = keyword.find(form, position+1)
+        return False
+
+
+    def is_part_of_another_keyword(self, keyword: str, forms: list = None) -> bool:
+        """
+        Returns True if the keyword (or one of its forms, if they are given) is part of a keyword of the index other than the keyword itself.
+        """
+        if forms is None:
+            forms = [keyword]
+        for form in forms:
+            form = form.lower()
+            for k in self._find_candidates(form):
+                if self.keywords[k] != keyword and self._occurs_next_to_delimiter(form, self.lowercase_keywords[k]):
+                    return True
+        return False
+
+
+def _deletion_neighbourhood(string: str, max_deletions: int) -> set:
+    """
+    Returns the set of the strings that are obtained by deleting at most max_deletions characters from the string.
+    """
+    neighbourhood = {string}
+    level = {string}
+    for _ in range(max_deletions):
+        level = {variant[:i]+variant[i+1:] for variant in level for i in range(len(variant))}
+        neighbourhood.update(level)
+    return neighbourhood
+
+
+def find_similar_strings(strings: list, max_distance: int) -> dict:
+    """
+    Finds the pairs of strings of the list whose edit distance is not greater than max_distance (None in the list are ignored).
+    Instead of comparing all the pairs of strings, each string is indexed by the strings obtained by deleting up to max_distance
+    of its characters: 2 strings can only be that similar if they have one of these variants in common.
+    Only these candidate pairs whose lengths do not differ by more than max_distance are compared, each of them once.
+    Returns a hash: key: index of a string, value: sorted list of the indexes of the strings similar to it.
+    """
+    indexes_of_strings = {} #Key: string, value: list of the indexes where it occurs in the list
+    for i, s in enumerate(strings):
+        if s is not None:
+            indexes_of_strings.setdefault(s, []).append(i)
+
+    unique_strings = list(indexes_of_strings)
+    variant_to_strings = {} #Key: string obtained by deleting characters, value: ids of the strings it is obtained from
+    for n, s in enumerate(unique_strings):
+        for variant in _deletion_neighbourhood(s, max_distance):
+            variant_to_strings.setdefault(variant, []).append(n)
+
+    candidate_pairs = set()
+    for ids in variant_to_strings.values():
+        for k, n in enumerate(ids):
+            for n2 in ids[k+1:]:
+                candidate_pairs.add((n, n2))
+
+    similar_strings = {}
+    for indexes in indexes_of_strings.values():
+        if len(indexes) > 1:
+            for i in indexes:
+                similar_strings.setdefault(i, set()).update(j for j in indexes if j != i)
+    for n, n2 in candidate_pairs:
+        s = unique_strings[n]
+        s2 = unique_strings[n2]
+        if abs(len(s)-len(s2)) <= max_distance and editdistance.eval(s, s2) <= max_distance:
+            for i in indexes_of_strings[s]:
+                similar_strings.setdefault(i, set()).update(indexes_of_strings[s2])
+            for i in indexes_of_strings[s2]:
+                similar_strings.setdefault(i, set()).update(indexes_of_strings[s])
+
+    return {i: sorted(similar) for i, similar in similar_strings.items()}
+
+
+def find_words_sharing_parts(words: list, word_to_parts: dict) -> dict:
+    """
+    Finds the pairs of words of the list that have at least 1 part in common (the parts of a word are given by word_to_parts).
+    Uses an inverted index: key: part, value: indexes of the words that contain it.
+    Returns a hash: key: index of a word, value: set of the indexes of the other words that share a part with it.
+    """
+    part_to_words = {}
+    for i, word in enumerate(words):
+        if word in word_to_parts:
+            for part in word_to_parts[word]:
+                part_to_words.setdefault(part, []).append(i)
+
+    words_sharing_parts = {}
+    for indexes in part_to_words.values():
+        if len(indexes) > 1:
+            for i in indexes:
+                words_sharing_parts.setdefault(i, set()).update(j for j in indexes if j != i)
+    return words_sharing_parts
+
+
+def find_words_related_by_parts(words: list, word_to_parts: dict) -> dict:
+    """
+    Finds the pairs of words of the list that are related through their parts (the parts of a word are given by word_to_parts):
+    2 words that have parts and share at least 1 of them, or a word that has parts and 1 of its parts that has none.
+    Returns a hash: key: index of a word, value: set of the indexes of the words related to it.
+    """
+    related_words = find_words_sharing_parts(words, word_to_parts)
+    word_positions = {word: i for i, word in enumerate(words)}
+    for i, word in enumerate(words):
+        if word in word_to_parts:
+            for part in word_to_parts[word]:
+                if part in word_positions and part not in word_to_parts:
+                    j = word_positions[part]
+                    related_words.setdefault(i, set()).add(j)
+                    related_words.setdefault(j, set()).add(i)
+    return related_words
+
+
+def find_compounds_of_parts(parts, part_to_compounds: dict) -> dict:
+    """
+    Inverts the index of the compounds of each part, for the given parts:
+    returns a hash: key: compound, value: list of its parts among the given ones, in their order.
+    """
+    compound_to_parts = {}
+    for part in parts:
+        if part in part_to_compounds:
+            for compound in part_to_compounds[part]:
+                compound_to_parts.setdefault(compound, []).append(part)
+    return compound_to_parts
+
+
+def find_case_variants(keywords) -> list:
+    """
+    Groups the keywords that only differ in case, with a single pass over the keywords: key of the group: the lowercase keyword.
+    Returns the list of the groups of more than 1 keyword, each group keeping the order of the keywords.
+    """
+    groups = {}
+    for keyword in keywords:
+        groups.setdefault(keyword.lower(), []).append(keyword)
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def join_overlapping_keywords(keywords: set, phrase_index: PhraseIndex, repeat: bool = True) -> set:
+    """
+    If the last tokens of a keyword are the first tokens of another keyword (Pascal Wehrlein + Wehrlein und Nico Rosberg),
+    joins them and checks if the joined keyword occurs in the text. If yes, replaces the 2 keywords by the joined one.
+    A keyword contained in another keyword that occurs in the text is replaced by the latter.
+    Keywords are indexed by their first token, so that each keyword is only compared with the keywords that can continue it.
+    If repeat is True, repeats the operation until there is nothing left to join.
+    """
+    while True:
+        keywords_tokens = {}
+        keywords_by_first_token = {}
+        for keyword in keywords:
+            tokens = tokenize_with_offsets(keyword)
+            if len(tokens) == 0:
+                continue
+            keywords_tokens[keyword] = tokens
+            if tokens[0][0] in keywords_by_first_token:
+                keywords_by_first_token[tokens[0][0]].append(keyword)
+            else:
+                keywords_by_first_token[tokens[0][0]] = [keyword]
+
+        joined_keywords = set()
+        not_needed_keywords = set()
+        for keyword, tokens in keywords_tokens.items():
+            token_texts = [token[0] for token in tokens]
+            for i in range(1, len(tokens)):
+                for keyword2 in keywords_by_first_token.get(token_texts[i], []):
+                    tokens2 = keywords_tokens[keyword2]
+                    overlap_length = len(tokens)-i
+                    if len(tokens2) <= overlap_length or [token[0] for token in tokens2[:overlap_length]] != token_texts[i:]:
+                        continue
+
+                    joined_keyword = keyword+keyword2[tokens2[overlap_length-1][2]:]
+                    if phrase_index.occurs(joined_keyword):
+                        joined_keywords.add(joined_keyword)
+                        not_needed_keywords.add(keyword)
+                        not_needed_keywords.add(keyword2)
+
+        for keyword2, containing_keywords in find_keywords_containing_keywords(list(keywords)).items():
+            for keyword in containing_keywords:
+                if phrase_index.occurs(keyword):
+                    joined_keywords.add(keyword)
+                    not_needed_keywords.add(keyword)
+                    not_needed_keywords.add(keyword2)
+
+        if len(not_needed_keywords) == 0:
+            return keywords
+
+        new_keywords = keywords.difference(not_needed_keywords).union(joined_keywords)
+        if not repeat or new_keywords == keywords:
+            return new_keywords
+        keywords = new_keywords
@@ -0,0 +1,99 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Unit tests for testing keyword_extractor_indexes.py
+"""
+
+import unittest
+from keyword_extractor_indexes import PhraseIndex, SuffixArray, ContainmentIndex, find_case_variants, find_compounds_of_parts, find_keywords_containing_keywords, find_keywords_contained_in, find_similar_strings, find_words_related_by_parts, find_words_sharing_parts, join_overlapping_keywords
+
+
+TEXT = "Wer ist Schuld am Unfall der beiden Rennfahrer Pascal Wehrlein und Nico Rosberg. Der Trainer des DFB-Teams, Oliver Bierhoff."
+
+
+class KeywordExtractorIndexesTest(unittest.TestCase):
+
+    def test_phrase_index_occurs(self):
+        phrase_index = PhraseIndex(TEXT)
+        self.assertTrue(phrase_index.occurs('Pascal Wehrlein und Nico'))
+        self.assertTrue(phrase_index.occurs('DFB-Teams'))
+        self.assertFalse(phrase_index.occurs('pascal Wehrlein'))
+        self.assertFalse(phrase_index.occurs('Pascal Wehr'))
+        self.assertFalse(phrase_index.occurs('Nico Rosberg und Pascal'))
+
+    def test_phrase_index_occurs_ignoring_case(self):
+        phrase_index = PhraseIndex(TEXT)
+        self.assertTrue(phrase_index.occurs('der', ignore_case=True))
+        self.assertFalse(phrase_index.occurs('nico rosberg'))
+        self.assertTrue(phrase_index.occurs('nico rosberg', ignore_case=True))
+        self.assertTrue(phrase_index.occurs('FAHRER', ignore_case=True, whole_tokens=False))
+        self.assertFalse(phrase_index.occurs('FAHRER', ignore_case=True))
+        self.assertFalse(phrase_index.occurs('Trainer der'))
+
+    def test_suffix_array(self):
+        suffix_array = SuffixArray("banana")
+        self.assertEqual(suffix_array.suffix_array, [5, 3, 1, 0, 4, 2])
+        self.assertEqual(suffix_array.find_range("ana"), (1, 3))
+        self.assertEqual(suffix_array.find_range("x"), (6, 6))
+        suffix_array = SuffixArray([2, 1, 2, 1, 3])
+        self.assertEqual(sorted(suffix_array.suffix_array[slice(*suffix_array.find_range([2, 1]))]), [0, 2])
+
+    def test_find_keywords_containing_keywords(self):
+        containing = find_keywords_containing_keywords(['Nico Rosberg', 'Nico', 'Ma', 'Mario Rossi', 'Rossi'])
+        self.assertEqual(containing, {'Nico': ['Nico Rosberg'], 'Ma': ['Mario Rossi'], 'Rossi': ['Mario Rossi']})
+
+    def test_find_keywords_contained_in(self):
+        contained = find_keywords_contained_in(['Rossi', 'Nico', 'Mario', 'Mario Rossi'], ['Mario Rossi', 'Nico Rosberg'])
+        self.assertEqual(contained, {'Mario Rossi': ['Rossi', 'Mario'], 'Nico Rosberg': ['Nico']})
+
+    def test_containment_index(self):
+        containment_index = ContainmentIndex({'Mario Rossi', 'DFB-Team', "Dell'Orto", 'AS Roma', 'Roma', 'F.C. Südtirol'})
+        self.assertTrue(containment_index.is_part_of_another_keyword('Rossi'))
+        self.assertTrue(containment_index.is_part_of_another_keyword('dfb'))
+        self.assertTrue(containment_index.is_part_of_another_keyword('Orto'))
+        self.assertTrue(containment_index.is_part_of_another_keyword('Rom'))
+        self.assertTrue(containment_index.is_part_of_another_keyword('C. Südtirol'))
+        self.assertFalse(containment_index.is_part_of_another_keyword('Roma'.lower(), ['oma']))
+        self.assertFalse(containment_index.is_part_of_another_keyword('ari'))
+        self.assertFalse(containment_index.is_part_of_another_keyword('Team Rossi'))
+        self.assertTrue(containment_index.is_part_of_another_keyword('Rossis', ['Rossis', 'Rossi']))
+
+    def test_find_similar_strings(self):
+        similar = find_similar_strings(['bürgermeister', 'burgermeisters', None, 'bürgermeister', 'landtag', 'landtage', 'landesrat'], 2)
+        self.assertEqual(similar, {0: [1, 3], 1: [0, 3], 3: [0, 1], 4: [5], 5: [4]})
+        self.assertEqual(find_similar_strings(['abcd', 'bcda'], 1), {})
+        self.assertEqual(find_similar_strings(['abcd', 'bcda'], 2), {0: [1], 1: [0]})
+
+    def test_find_words_sharing_parts(self):
+        word_to_parts = {'Landtagswahl': {'Land', 'Tag', 'Wahl'}, 'Gemeinderatswahl': {'Gemeinde', 'Rat', 'Wahl'}, 'Landesrat': {'Land', 'Rat'}}
+        sharing = find_words_sharing_parts(['Landtagswahl', 'Gemeinderatswahl', 'Landesrat', 'Bozen'], word_to_parts)
+        self.assertEqual(sharing, {0: {1, 2}, 1: {0, 2}, 2: {0, 1}})
+
+    def test_find_words_related_by_parts(self):
+        word_to_parts = {'Landtagswahl': {'Landtag', 'Wahl'}, 'Gemeinderatswahl': {'Gemeinderat', 'Wahl'}, 'Landtag': {'Land', 'Tag'}}
+        related = find_words_related_by_parts(['Landtagswahl', 'Gemeinderatswahl', 'Wahl', 'Landtag', 'Bozen'], word_to_parts)
+        self.assertEqual(related, {0: {1, 2}, 1: {0, 2}, 2: {0, 1}})
+
+    def test_find_compounds_of_parts(self):
+        part_to_compounds = {'wahl': {'Landtagswahl': 1.0, 'Gemeinderatswahl': 2.0}, 'land': {'Landtagswahl': 1.0}, 'rat': {'Gemeinderatswahl': 2.0}}
+        compounds = find_compounds_of_parts(['land', 'wahl', 'bozen'], part_to_compounds)
+        self.assertEqual(compounds, {'Landtagswahl': ['land', 'wahl'], 'Gemeinderatswahl': ['wahl']})
+
+    def test_find_case_variants(self):
+        self.assertEqual(find_case_variants(['Haus', 'Bozen', 'HAUS', 'haus', 'SVP', 'Svp']), [['Haus', 'HAUS', 'haus'], ['SVP', 'Svp']])
+
+    def test_join_overlapping_keywords(self):
+        phrase_index = PhraseIndex(TEXT)
+        self.assertEqual(join_overlapping_keywords({'Pascal Wehrlein', 'Wehrlein und Nico', 'Nico Rosberg'}, phrase_index), {'Pascal Wehrlein und Nico Rosberg'})
+        self.assertEqual(join_overlapping_keywords({'Trainer des DFB', 'DFB-Teams', 'Bierhoff'}, phrase_index), {'Trainer des DFB-Teams', 'Bierhoff'})
+        self.assertEqual(join_overlapping_keywords({'Oliver Bierhoff', 'Bierhoff'}, phrase_index), {'Oliver Bierhoff'})
+        #The joined keyword does not occur in the text
+        self.assertEqual(join_overlapping_keywords({'Nico Rosberg', 'Rosberg und Pascal'}, phrase_index), {'Nico Rosberg', 'Rosberg und Pascal'})
+
+    def test_join_overlapping_keywords_only_once(self):
+        phrase_index = PhraseIndex(TEXT)
+        self.assertEqual(join_overlapping_keywords({'Pascal Wehrlein', 'Wehrlein und Nico', 'Nico Rosberg'}, phrase_index, repeat=False), {'Pascal Wehrlein und Nico', 'Wehrlein und Nico Rosberg'})
+
+
+if __name__ == "__main__":
+    unittest.main()
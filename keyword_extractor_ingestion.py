@@ -0,0 +1,111 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Ingestion of the articles read by the KeywordExtractor (keyword_extractor_salto.py), the same for the 3 input forms (file, text and json).
+The text of an article is cleaned in a single pass (emails and URLs deleted, the characters that disturb TreeTagger and SMOR replaced),
+divided into its sections (TITLE:, TEASER: and BODY:) and each section is split into sentences and lines,
+so that each line knows its section without looking for the names of the sections at the beginning of the sentences.
+"""
+
+import re
+from segtok.segmenter import split_multi
+
+
+SECTION_NAMES = ("TITLE:", "TEASER:", "BODY:")
+DEFAULT_SECTION = "BODY:" #The section of the text that precedes the name of any section
+
+#A name of section at the beginning of a line
+SECTION_PATTERN = re.compile(r"^[ \t]*(TITLE:|TEASER:|BODY:)", re.MULTILINE)
+
+#What is deleted or replaced when the text is cleaned: emails, URLs, and the characters that disturb TreeTagger and SMOR
+CLEANING_PATTERN = re.compile(r"[\da-zA-Z\.\-\_]+@[\da-zA-Z\.\-\_]+|(?:https?:\/\/)?www\.[^ ]+|[()*|+]")
+REPLACEMENTS = {"(": ",", ")": ",", "*": "###", "|": "===", "+": "#=#"} #Emails and URLs are replaced by nothing
+EMAIL_URL_PATTERN = re.compile(r"[\da-zA-Z\.\-\_]+@[\da-zA-Z\.\-\_]+|(?:https?:\/\/)?www\.[^ ]+")
+
+
+def clean_text(text: str) -> str:
+    """
+    Deletes emails and URLs from the text and replaces the characters that disturb TreeTagger and SMOR (parentheses, *, |, +), in one pass.
+    """
+    return CLEANING_PATTERN.sub(lambda match: REPLACEMENTS.get(match.group(), ""), text)
+
+
+def strip_email_url(text: str) -> str:
+    """
+    Deletes emails and URLs from the text.
+    """
+    return EMAIL_URL_PATTERN.sub("", text)
+
+
+def find_sections(text: str) -> list:
+    """
+    Returns the sections of the text: tuples (name of the section, offset of the beginning of its content, offset of its end).
+    The text that precedes the name of any section belongs to the body.
+    """
+    sections = []
+    section_name = DEFAULT_SECTION
+    start = 0
+    for match in SECTION_PATTERN.finditer(text):
+        if match.start() > start:
+            sections.append((section_name, start, match.start()))
+        section_name = match.group(1)
+        start = match.end()
+    if start < len(text):
+        sections.append((section_name, start, len(text)))
+    return sections
+
+
+class Article():
+    """
+    The cleaned text of an article and its lines: lists [line, name of its section], in the order of the text.
+    A line is a line of a sentence found by segtok in a section, without the spaces that surround it.
+    """
+
+    def __init__(self, text: str, sections: list) -> None:
+        self.text = text
+        self.lines = []
+        for section_name, start, end in sections:
+            for sentence in split_multi(text[start:end]):
+                for line in sentence.split("\n"):
+                    line = line.strip()
+                    if len(line) > 0:
+                        self.lines.append([line, section_name])
+
+
+    @classmethod
+    def from_text(cls, text: str) -> "Article":
+        """
+        Reads an article in the Salto format: the title, teaser and body, each preceded by the name of its section (TITLE:, TEASER:, BODY:).
+        """
+        text = clean_text(text)
+        return cls(text, find_sections(text))
+
+
+    @classmethod
+    def from_fields(cls, title: str, teaser: str, body: str) -> "Article":
+        """
+        Reads an article given as its title, teaser and body. Its text is made of them, separated by line breaks.
+        """
+        sections = []
+        parts = []
+        offset = 0
+        for section_name, part in zip(SECTION_NAMES, (title, teaser, body)):
+            part = clean_text(part)
+            sections.append((section_name, offset, offset+len(part)))
+            parts.append(part)
+            offset += len(part)+1
+        return cls("\n".join(parts), sections)
+
+
+    def number_of_head_lines(self) -> int:
+        """
+        Returns the number of lines of the title and the teaser.
+        """
+        return sum(1 for line in self.lines if line[1] != "BODY:")
+
+
+    def detect_languages(self, language_detector, strict: bool = False) -> list:
+        """
+        Returns the language of each line, detected by the given LanguageDetector (keyword_extractor_language.py), None if it cannot be detected.
+        """
+        return language_detector.detect_article([line[0] for line in self.lines], self.number_of_head_lines(), strict)
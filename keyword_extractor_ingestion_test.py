@@ -0,0 +1,34 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Unit tests for testing keyword_extractor_ingestion.py
+"""
+
+import unittest
+from keyword_extractor_ingestion import Article, clean_text, find_sections, strip_email_url
+
+
+class KeywordExtractorIngestionTest(unittest.TestCase):
+
+    def test_clean_text(self):
+        self.assertEqual(strip_email_url("ecco la mia email io-ho_33Anni@poste.paese e il mio sito:http://www.sito.kria"), 'ecco la mia email  e il mio sito:')
+        self.assertEqual(clean_text("Die SVP (Volkspartei) *neu* | A+B, info@svp.it (www.svp.it)"), 'Die SVP ,Volkspartei, ###neu### === A#=#B,  ,')
+
+    def test_find_sections(self):
+        text = "Vorwort\nTITLE: Titel \n\nTEASER: Teaser\nBODY: Text"
+        self.assertEqual([(name, text[start:end]) for name, start, end in find_sections(text)], [('BODY:', 'Vorwort\n'), ('TITLE:', ' Titel \n\n'), ('TEASER:', ' Teaser\n'), ('BODY:', ' Text')])
+
+    def test_article_from_text(self):
+        article = Article.from_text("TITLE: Nazis all'Italiana \n\nTEASER: Italienische Nazis plakatieren in Bozen. Die DIGOS ermittelt.\n\nBODY: \n  Die Plakate (siehe Foto) hängen\nin der Altstadt.")
+        self.assertEqual(article.lines, [["Nazis all'Italiana", 'TITLE:'], ['Italienische Nazis plakatieren in Bozen.', 'TEASER:'], ['Die DIGOS ermittelt.', 'TEASER:'],
+                                         ['Die Plakate ,siehe Foto, hängen', 'BODY:'], ['in der Altstadt.', 'BODY:']])
+        self.assertEqual(article.number_of_head_lines(), 3)
+
+    def test_article_from_fields(self):
+        article = Article.from_fields('Um Aufklärung bemüht', 'Wer ist Schuld? Die Fahrer (DFB)?', 'Antworten gab es. Mehr auf www.salto.bz')
+        self.assertEqual(article.text, 'Um Aufklärung bemüht\nWer ist Schuld? Die Fahrer ,DFB,?\nAntworten gab es. Mehr auf ')
+        self.assertEqual(article.lines, [['Um Aufklärung bemüht', 'TITLE:'], ['Wer ist Schuld?', 'TEASER:'], ['Die Fahrer ,DFB,?', 'TEASER:'], ['Antworten gab es.', 'BODY:'], ['Mehr auf', 'BODY:']])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Inverted index of the keywords extracted by the KeywordExtractor (keyword_extractor_salto.py): for each keyword (casefolded), the articles it was extracted from,
+with the number of occurrences of the keyword in each article. The index is a SQLite database, updated as the articles are processed in batch mode,
+so that the articles of a keyword are found without reading the keywords of all the articles.
+"""
+
+import sqlite3
+from keyword_extractor_sinks import BATCH_SIZE, _BufferedSink
+
+
+class InvertedIndex(_BufferedSink):
+    """
+    The table postings (keyword, article_id, count) of a SQLite database, whose primary key is (keyword, article_id), so that the articles of a keyword are read from a single range of the table.
+    Used as an output of the batch mode: the articles are kept in memory and written by batches, in a transaction per batch.
+    The postings of an article written again (ex: a changed file) replace its previous postings.
+    """
+
+    def __init__(self, file_name: str, batch_size: int = BATCH_SIZE) -> None:
+        super().__init__(file_name, batch_size)
+        self.connection = sqlite3.connect(file_name)
+        with self.connection:
+            self.connection.execute("CREATE TABLE IF NOT EXISTS postings (keyword TEXT, article_id TEXT, count INTEGER, PRIMARY KEY (keyword, article_id)) WITHOUT ROWID")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS postings_article_id ON postings (article_id)")
+
+
+    def write(self, article_id: str, language: str, keywords: list, counts: dict = None) -> None:
+        """
+        Adds the keywords of an article, with their numbers of occurrences in the article (1 if they are not given).
+        """
+        postings = {}
+        for keyword in keywords:
+            casefolded_keyword = keyword.casefold()
+            postings[casefolded_keyword] = postings.get(casefolded_keyword, 0)+(counts.get(keyword, 1) if counts is not None else 1)
+        super().write(article_id, language, postings)
+
+
+    def _write_batch(self, articles: list) -> None:
+        with self.connection:
+            self.connection.executemany("DELETE FROM postings WHERE article_id = ?", [(article_id,) for article_id, _, _ in articles])
+            self.connection.executemany("INSERT OR REPLACE INTO postings VALUES (?, ?, ?)", [(keyword, article_id, count) for article_id, _, postings in articles for keyword, count in postings.items()])
+
+
+    def articles_of(self, keyword: str, limit: int = None) -> list:
+        """
+        Returns the articles of the keyword (case insensitive): tuples (article id, number of occurrences of the keyword in the article),
+        from the article in which the keyword occurs most often. The articles not written yet (see flush()) are not found.
+        """
+        query = "SELECT article_id, count FROM postings WHERE keyword = ? ORDER BY count DESC, article_id"
+        if limit is not None:
+            return self.connection.execute(query+" LIMIT ?", (keyword.casefold(), limit)).fetchall()
+        return self.connection.execute(query, (keyword.casefold(),)).fetchall()
+
+
+    def keywords_of(self, article_id: str) -> dict:
+        """
+        Returns the keywords (casefolded) of the article: key: keyword, value: its number of occurrences in the article.
+        """
+        return dict(self.connection.execute("SELECT keyword, count FROM postings WHERE article_id = ?", (article_id,)))
+
+
+    def number_of_articles(self, keyword: str) -> int:
+        """
+        Returns the number of articles of the keyword (case insensitive).
+        """
+        return self.connection.execute("SELECT COUNT(*) FROM postings WHERE keyword = ?", (keyword.casefold(),)).fetchone()[0]
+
+
+    def close(self) -> None:
+        self.flush()
+        self.connection.close()
@@ -0,0 +1,55 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Unit tests for testing keyword_extractor_inverted_index.py
+"""
+
+import os
+import tempfile
+import unittest
+from keyword_extractor_inverted_index import InvertedIndex
+from keyword_extractor_sinks import SinkGroup, open_sink
+
+
+class KeywordExtractorInvertedIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.folder.name, 'index.sqlite')
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_articles_of_a_keyword(self):
+        with InvertedIndex(self.file_name, 2) as inverted_index:
+            inverted_index.write('21717.txt', 'de', ['Landtag', 'SVP'], {'Landtag': 3, 'SVP': 5})
+            inverted_index.write('21718.txt', 'de', ['SVP', 'svp', 'Kompatscher'], {'SVP': 2, 'svp': 1, 'Kompatscher': 4})
+            inverted_index.write('1008-it.txt', 'it', ['Svp'])
+            self.assertEqual(inverted_index.articles_of('svp'), [('21717.txt', 5), ('21718.txt', 3)]) #The third article is not written yet
+            inverted_index.flush()
+            self.assertEqual(inverted_index.articles_of('SVP'), [('21717.txt', 5), ('21718.txt', 3), ('1008-it.txt', 1)])
+            self.assertEqual(inverted_index.articles_of('SVP', 1), [('21717.txt', 5)])
+            self.assertEqual(inverted_index.number_of_articles('svp'), 3)
+            self.assertEqual(inverted_index.keywords_of('21718.txt'), {'svp': 3, 'kompatscher': 4})
+            self.assertEqual(inverted_index.articles_of('Bozen'), [])
+
+    def test_updated_article(self):
+        with InvertedIndex(self.file_name) as inverted_index:
+            inverted_index.write('21717.txt', 'de', ['Landtag', 'SVP'], {'Landtag': 3, 'SVP': 5})
+        with InvertedIndex(self.file_name) as inverted_index: #A second run, in which the article has changed
+            inverted_index.write('21717.txt', 'de', ['Landtag'], {'Landtag': 2})
+        with InvertedIndex(self.file_name) as inverted_index:
+            self.assertEqual(inverted_index.articles_of('Landtag'), [('21717.txt', 2)])
+            self.assertEqual(inverted_index.articles_of('SVP'), [])
+
+    def test_sink_group(self):
+        with SinkGroup([open_sink('tsv', self.folder.name, 1), InvertedIndex(self.file_name, 2)]) as sink:
+            sink.write('21717.txt', 'de', ['SVP', 'Landtag'], {'Landtag': 3, 'SVP': 5})
+            self.assertEqual(sink.number_of_pending_articles, 1)
+        with InvertedIndex(self.file_name) as inverted_index:
+            self.assertEqual(inverted_index.articles_of('landtag'), [('21717.txt', 3)])
+        self.assertTrue(os.path.exists(os.path.join(self.folder.name, 'keywords.tsv')))
+
+
+if __name__ == '__main__':
+    unittest.main()
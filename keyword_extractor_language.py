@@ -0,0 +1,199 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Detection of the language of the lines of an article for the KeywordExtractor (keyword_extractor_salto.py).
+The articles are almost all in German or in Italian, so a line is first classified as German or Italian
+with the function words, the German letters (ß, ä, ö, ü) and the characteristic letter sequences of both languages.
+Only the lines for which this is not clear enough (short lines, lines in another language) are given to langdetect,
+whose random generator is seeded so that it gives the same language for the same line on every run.
+As most articles are written in a single language, the language of a whole article can be decided at once: its lines with a function word
+or a German letter get it, the lines without such evidence being detected one by one, and all the lines when some of them show signs of the other language.
+"""
+
+import re, hashlib
+from langdetect import detect, DetectorFactory
+
+DetectorFactory.seed = 0 #langdetect is probabilistic: with a fixed seed, it always gives the same result for the same text
+
+
+#Function words of each language, in lowercase. Words of both languages (in, da, so, am) are left out.
+GERMAN_FUNCTION_WORDS = frozenset({"der", "die", "das", "den", "dem", "des", "ein", "eine", "einen", "einem", "einer", "eines", "und", "zu", "zum", "zur",
+                                   "von", "vom", "nicht", "mit", "auch", "auf", "für", "dass", "es", "oder", "aber", "ist", "sind", "war", "wird", "werden",
+                                   "wurde", "hat", "haben", "sich", "im", "beim", "bei", "nach", "aus", "wie", "noch", "nur", "sie", "er", "wir", "ich", "ihr",
+                                   "sein", "seine", "über", "unter", "vor", "durch", "um", "wenn", "als", "schon", "sehr", "mehr", "kein", "keine"})
+ITALIAN_FUNCTION_WORDS = frozenset({"il", "lo", "la", "le", "gli", "i", "un", "uno", "una", "di", "del", "dello", "della", "dei", "degli", "delle", "al", "allo",
+                                    "alla", "ai", "agli", "alle", "dal", "dalla", "dai", "nel", "nello", "nella", "nei", "negli", "nelle", "sul", "sulla",
+                                    "sui", "per", "con", "tra", "fra", "e", "ed", "o", "che", "non", "è", "sono", "era", "ha", "hanno", "anche", "come", "più",
+                                    "ma", "se", "si", "ci", "questo", "questa", "quello", "quella", "suo", "sua", "loro", "essere", "stato", "stata"})
+#Elided Italian articles and prepositions (l'anno, dell'apertura, un'ora)
+ITALIAN_ELISION_PATTERN = re.compile(r"\b(l|dell|all|dall|nell|sull|un|d|c|quest|quell)['’]\w", re.IGNORECASE)
+GERMAN_LETTERS_PATTERN = re.compile(r"[ßäöü]", re.IGNORECASE)
+
+#Letter sequences found much more often in one language than in the other
+GERMAN_NGRAMS = ("sch", "ch", "ck", "tz", "ei", "ie", "eu", "au", "ung", "keit", "heit", "lich", "pf", "st", "w", "k")
+ITALIAN_NGRAMS = ("zz", "gli", "gn", "zion", "cc", "tt", "ll", "zia", "ment", "ss", "qu")
+VOWELS = frozenset("aeiouàèéìòù")
+
+WORD_PATTERN = re.compile(r"[^\W\d_]+")
+
+FUNCTION_WORD_WEIGHT = 2
+LETTER_WEIGHT = 2
+NGRAM_WEIGHT = 0.5
+ENDING_WEIGHT = 0.5 #Italian words end in a vowel, most German words do not
+
+MIN_EVIDENCE = 4 #The minimum weight of the evidence of both languages together for a confident decision
+MIN_CONFIDENCE = 0.5 #The minimum share of the evidence that has to go to the winning language (beyond the half)
+
+MAX_CACHE_SIZE = 100000 #The maximum number of lines whose language is kept by a LanguageDetector
+
+
+def score_german_italian(text: str) -> tuple:
+    """
+    Returns the weights of the evidence for German and for Italian found in the text,
+    and the number of function words and German letters found (a decision based only on letter sequences is not reliable).
+    """
+    german = 0.0
+    italian = 0.0
+    german_letters = len(GERMAN_LETTERS_PATTERN.findall(text))
+    german += german_letters*LETTER_WEIGHT
+    elisions = len(ITALIAN_ELISION_PATTERN.findall(text))
+    italian += elisions*FUNCTION_WORD_WEIGHT
+    number_of_function_words = elisions
+    for word in WORD_PATTERN.findall(text.lower()):
+        if word in GERMAN_FUNCTION_WORDS:
+            german += FUNCTION_WORD_WEIGHT
+            number_of_function_words += 1
+            continue
+        if word in ITALIAN_FUNCTION_WORDS:
+            italian += FUNCTION_WORD_WEIGHT
+            number_of_function_words += 1
+            continue
+        if len(word) < 3:
+            continue
+        for ngram in GERMAN_NGRAMS:
+            if ngram in word:
+                german += NGRAM_WEIGHT
+        for ngram in ITALIAN_NGRAMS:
+            if ngram in word:
+                italian += NGRAM_WEIGHT
+        if word[-1] in VOWELS:
+            italian += ENDING_WEIGHT
+        else:
+            german += ENDING_WEIGHT
+    return german, italian, number_of_function_words+german_letters
+
+
+def classify_german_italian(text: str) -> tuple:
+    """
+    Classifies the text as German or Italian.
+    Returns the language ("de" or "it", None if there is no evidence at all) and the confidence of the decision, between 0 and 1:
+    the share of the evidence going to the winning language beyond the half, 0 if the evidence is too weak to decide.
+    """
+    german, italian, number_of_strong_signals = score_german_italian(text)
+    evidence = german+italian
+    if evidence == 0:
+        return None, 0.0
+    language = "de" if german > italian else "it"
+    if evidence < MIN_EVIDENCE or number_of_strong_signals == 0:
+        return language, 0.0
+    return language, abs(german-italian)/evidence
+
+
+def has_mixed_language_signals(line: str, language: str) -> bool:
+    """
+    Finds out if a line of an article in the given language ("de" or "it") shows signs of the other language:
+    German letters in an Italian article, or a line in which the evidence for the other language is stronger, even if it is too weak for a decision.
+    """
+    if language == "it" and GERMAN_LETTERS_PATTERN.search(line):
+        return True
+    line_language, confidence = classify_german_italian(line)
+    return line_language is not None and line_language != language
+
+
+class LanguageDetector():
+    """
+    Detects the language of lines: German or Italian when the classifier is confident enough, else the language given by langdetect.
+    The languages of the lines are kept by the hash of the line, so that a line found again in another article (ex: a signature) is not detected again.
+    Counts the lines decided by the classifier, the lines given to langdetect, the lines found in the cache and the articles decided at once.
+    """
+
+    def __init__(self, min_confidence: float = MIN_CONFIDENCE, fallback=detect, max_cache_size: int = MAX_CACHE_SIZE) -> None:
+        self.min_confidence = min_confidence
+        self.fallback = fallback
+        self.max_cache_size = max_cache_size
+        self._cache = {} #Key: hash of a line, value: its language
+        self.number_of_classified_lines = 0
+        self.number_of_fallback_lines = 0
+        self.number_of_cached_lines = 0
+        self.number_of_single_language_articles = 0
+
+
+    def detect(self, line: str) -> str:
+        """
+        Returns the language of the line. Raises the exceptions of langdetect (ex: for a line without letters).
+        """
+        key = hashlib.blake2b(line.encode("utf-8"), digest_size=8).digest()
+        language = self._cache.get(key)
+        if language is not None:
+            self.number_of_cached_lines += 1
+            return language
+        language, confidence = classify_german_italian(line)
+        if language is not None and confidence >= self.min_confidence:
+            self.number_of_classified_lines += 1
+        else:
+            self.number_of_fallback_lines += 1
+            language = self.fallback(line)
+        if len(self._cache) >= self.max_cache_size:
+            del self._cache[next(iter(self._cache))] #The oldest line
+        self._cache[key] = language
+        return language
+
+
+    def detect_article(self, lines: list, number_of_head_lines: int = 0, strict: bool = False) -> list:
+        """
+        Returns the language of each line of an article, None for the lines whose language cannot be detected (lines without letters).
+        The language of the whole article is decided first with the head lines (title and teaser), or if they are not clear enough, with all the lines.
+        If none of the lines shows signs of the other language, the lines with a function word or a German letter leaning to the language of the article get it,
+        and the other lines (ex: a date, a line in English) are detected separately.
+        Else, and in strict mode, the language of each line is detected separately.
+        """
+        if not strict:
+            language = self._classify_article(lines, number_of_head_lines)
+            if language is not None and not any(has_mixed_language_signals(line, language) for line in lines):
+                self.number_of_single_language_articles += 1
+                return [self._detect_in_article(line, language) for line in lines]
+        languages = []
+        for line in lines:
+            try:
+                languages.append(self.detect(line))
+            except Exception:
+                languages.append(None)
+        return languages
+
+
+    def _detect_in_article(self, line: str, language: str) -> str:
+        """
+        Returns the language of a line of an article in the given language: the language of the article if the line has some strong evidence for it,
+        else the language detected for the line alone, None for a line without letters.
+        """
+        if not WORD_PATTERN.search(line):
+            return None
+        german, italian, number_of_strong_signals = score_german_italian(line)
+        if number_of_strong_signals > 0 and ("de" if german > italian else "it") == language:
+            self.number_of_classified_lines += 1
+            return language
+        try:
+            return self.detect(line)
+        except Exception:
+            return None
+
+
+    def _classify_article(self, lines: list, number_of_head_lines: int) -> str:
+        """
+        Returns the language of the head lines of the article, or else of all its lines, None if neither is classified confidently.
+        """
+        for text in (" ".join(lines[:number_of_head_lines]), " ".join(lines)):
+            language, confidence = classify_german_italian(text)
+            if language is not None and confidence >= self.min_confidence:
+                return language
+        return None
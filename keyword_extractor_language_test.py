@@ -0,0 +1,70 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Unit tests for testing keyword_extractor_language.py
+"""
+
+import unittest
+from keyword_extractor_language import LanguageDetector, classify_german_italian
+
+
+class KeywordExtractorLanguageTest(unittest.TestCase):
+
+    def test_classify_german_italian(self):
+        language, confidence = classify_german_italian('Der Landtag hat am Dienstag über die Reform der Gemeindeordnung abgestimmt.')
+        self.assertEqual(language, 'de')
+        self.assertGreaterEqual(confidence, 0.5)
+        language, confidence = classify_german_italian("Ieri il primario di Casa Basaglia è andato in pensione, nel giorno del decimo anniversario dell'apertura del Centro.")
+        self.assertEqual(language, 'it')
+        self.assertGreaterEqual(confidence, 0.5)
+        self.assertEqual(classify_german_italian('Bozen'), ('de', 0.0)) #No function word: not confident
+        self.assertEqual(classify_german_italian('2018 - 24'), (None, 0.0))
+
+    def test_detect_falls_back_on_unclear_lines(self):
+        fallback_lines = []
+        def fallback(line):
+            fallback_lines.append(line)
+            return 'en'
+        language_detector = LanguageDetector(fallback=fallback)
+        self.assertEqual(language_detector.detect('Und sie fordert mehr Geld für die Schulen.'), 'de')
+        self.assertEqual(language_detector.detect('La giunta provinciale non ha ancora deciso.'), 'it')
+        self.assertEqual(language_detector.detect('Thank you very much.'), 'en')
+        self.assertEqual(fallback_lines, ['Thank you very much.'])
+        self.assertEqual(language_detector.number_of_classified_lines, 2)
+        self.assertEqual(language_detector.number_of_fallback_lines, 1)
+
+    def test_detect_caches_lines(self):
+        fallback_lines = []
+        def fallback(line):
+            fallback_lines.append(line)
+            return 'en'
+        language_detector = LanguageDetector(fallback=fallback, max_cache_size=2)
+        for line in ['Thank you.', 'Thank you.', 'Good morning.', 'Good night.', 'Thank you.']:
+            language_detector.detect(line)
+        self.assertEqual(fallback_lines, ['Thank you.', 'Good morning.', 'Good night.', 'Thank you.']) #The oldest line has left the cache
+        self.assertEqual(language_detector.number_of_cached_lines, 1)
+
+    def test_detect_article(self):
+        fallback_lines = []
+        def fallback(line):
+            fallback_lines.append(line)
+            return 'en' if line.startswith('Thank') else 'de'
+        language_detector = LanguageDetector(fallback=fallback)
+        lines = ['Um Aufklärung bemüht', 'Wer ist Schuld am Unfall der beiden Rennfahrer?', 'Am Samstag, 31.', 'Thank you very much.', '2018']
+        self.assertEqual(language_detector.detect_article(lines, 2), ['de', 'de', 'de', 'en', None]) #Decided at once
+        self.assertEqual(fallback_lines, ['Am Samstag, 31.', 'Thank you very much.']) #Only the lines without evidence for German are given to langdetect
+        self.assertEqual(language_detector.number_of_single_language_articles, 1)
+
+        language_detector = LanguageDetector(fallback=lambda line: 'it')
+        lines = ['Um Aufklärung bemüht', 'Wer ist Schuld am Unfall der beiden Rennfahrer?', 'Bernardo Magnagi viene spesso.']
+        self.assertEqual(language_detector.detect_article(lines, 2), ['de', 'de', 'it']) #Mixed article: line by line
+        self.assertEqual(language_detector.detect_article(lines[:2], 2, strict=True), ['de', 'de'])
+        self.assertEqual(language_detector.number_of_single_language_articles, 0)
+
+    def test_detect_is_stable(self):
+        line = 'Alto Adige'
+        self.assertEqual(len({LanguageDetector().detect(line) for _ in range(10)}), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,11 +4,24 @@
 @author: Nadezda Okinina
 """
 
-import sys, io, os, subprocess, copy, difflib, argparse, logging, re, string, operator, treetaggerwrapper, editdistance, regex, shutil
-from segtok.segmenter import split_multi
-from langdetect import detect
+import sys, io, os, subprocess, copy, argparse, logging, re, string, operator, treetaggerwrapper, editdistance, regex, shutil, tempfile
 import requests, uuid, json
 from operator import itemgetter
+from urllib.parse import quote
+from keyword_extractor_indexes import PhraseIndex, ContainmentIndex, find_case_variants, find_compounds_of_parts, find_keywords_contained_in, find_similar_strings, find_words_related_by_parts, find_words_sharing_parts, join_overlapping_keywords
+from keyword_extractor_scoring import reduce_to_above_mean, select_above_mean, select_by_mean
+from keyword_extractor_vocabulary import Vocabulary, CounterView, IdSetView, IdMapView
+from keyword_extractor_document import Document, count_capitalised_spans, find_capitalised_runs
+from keyword_extractor_gazetteer import Gazetteer, FIRST_NAME, SURNAME, TITLE, LIST_KEYWORD
+from keyword_extractor_compounds import CompoundSplitter
+from keyword_extractor_language import LanguageDetector
+from keyword_extractor_ingestion import Article, strip_email_url
+from keyword_extractor_stream import stream_jsonl
+from keyword_extractor_batch import article_id, expand_inputs, input_root, is_batch_input, run_batch
+from keyword_extractor_sinks import BATCH_SIZE, SINK_FORMATS, KeywordFileSink, SinkGroup, open_sink
+from keyword_extractor_inverted_index import InvertedIndex
+from keyword_extractor_cache import MAX_ENTRIES, ResultCache, file_version
+from keyword_extractor_incremental import IncrementalStore
 
 
 """
@@ -45,8 +58,23 @@ The module needs the following files to be present in the same folder:
     common-de-surnames.txt
     styr_nachnamen.txt
     good-keywords.txt    
+    keyword_extractor_batch.py
+    keyword_extractor_cache.py
+    keyword_extractor_compounds.py
+    keyword_extractor_document.py
+    keyword_extractor_gazetteer.py
+    keyword_extractor_incremental.py
+    keyword_extractor_indexes.py
+    keyword_extractor_ingestion.py
+    keyword_extractor_inverted_index.py
+    keyword_extractor_language.py
+    keyword_extractor_scoring.py
+    keyword_extractor_sinks.py
+    keyword_extractor_stream.py
+    keyword_extractor_vocabulary.py
 It also needs the directory containing the SMOR tool to be present in the same folder.
 TreeTagger for German and Italian must be installed, because it is used by the Python module treetaggerwrapper.
+The scores of the keyword candidates are computed with NumPy.
 
 1) Depending on the input format, the KeywordExtractor module has to be initialised differently.
     There are 3 ways to initialise the KeywordExtractor module:
@@ -68,10 +96,26 @@ TreeTagger for German and Italian must be installed, because it is used by the P
 
 
 The main function of this script takes 3 arguments:
-    -i  the name of the file containing the newspaper text
+    -i  the name of the file containing the newspaper text, or directories and glob patterns of files (batch mode, keyword_extractor_batch.py:
+        the keywords of each file are written to its '.KEY' file, and each processed file is recorded in a manifest, so that an interrupted run resumes with the files not done yet)
     -o  the name of the output folder that will contain the file with keywords
-
-The extracted keywords are written to a text file of the same name as the input file, with the extension '.KEY' added at the end, 1 keyword \t its translation per line.
+    -c  the engine that splits German compounds: smor (default) or splitter (keyword_extractor_compounds.py, does not need SMOR)
+    -f  the output of the keywords (keyword_extractor_sinks.py): key (default, a '.KEY' file per article), or a single file in the output folder for all the articles:
+        jsonl (keywords.jsonl), tsv (keywords.tsv: article id, keyword, rank, language) or sqlite (table keywords of keywords.sqlite)
+    -t  the number of articles written at once to a jsonl, tsv or sqlite output (1000 by default)
+    -m  batch mode: the manifest of the processed files (manifest.jsonl in the output folder by default)
+    -r  batch and streaming modes: the SQLite file of a result cache (keyword_extractor_cache.py), keeping the keywords of the last 100000 articles processed,
+        so that an article sent again with the same text (same lexicons, settings and version of the extractor) is not processed again
+    -u  batch and streaming modes: incremental mode (keyword_extractor_incremental.py): the SQLite file keeping the tags of the sentences of each article by TreeTagger
+        and the analyses of its lemmas by SMOR, under its id (the name of its file, or its "id" in streaming mode): when a new version of the article is processed,
+        only its new sentences are tagged and only its new lemmas are analysed
+    -x  batch mode: the SQLite file of an inverted index (keyword_extractor_inverted_index.py), to which the keywords of each article are added
+        with their numbers of occurrences in the article, so that the articles of a keyword can be looked up
+    -s  strict language detection: the language of each sentence is detected separately, even in articles written in a single language
+    -j  streaming mode (keyword_extractor_stream.py): articles are read as JSON lines with the fields "Title", "Teaser", "Body" and "id" from the standard input,
+        and one JSON line per article with its id, language and keywords (or an error) is written to the standard output; -i is not used and -o is optional
+
+By default, the extracted keywords are written to a text file of the same name as the input file, with the extension '.KEY' added at the end, 1 keyword \t its translation per line.
 """
 
 SCRIPT_FOLDER=os.path.dirname(os.path.realpath(__file__))+"/"
@@ -84,22 +128,80 @@ TITLES_FILE = SCRIPT_FOLDER+"titles.txt"
 COMMON_DE_SURNAMES_FILE = SCRIPT_FOLDER+"common-de-surnames.txt"
 STYR_SURNAMES = SCRIPT_FOLDER+"styr_nachnamen.txt"
 GOOD_KEYWORDS_FILE = SCRIPT_FOLDER+"good-keywords.txt"
+COMPOUND_LEXICON_FILE = SCRIPT_FOLDER+"compound-lexicon-de.txt" #Optional frequency lexicon of the compound splitter
+LEXICON_FILES = [STOPLIST_DE_FILE, STOPLIST_IT_FILE, NAMES_FILE, TITLES_FILE, COMMON_DE_SURNAMES_FILE, STYR_SURNAMES, GOOD_KEYWORDS_FILE, COMPOUND_LEXICON_FILE]
+MAX_NAME_ANALYSES = 100000 #The maximum number of names and keywords from the list whose analyses by SMOR are kept from one article to the next
+EXTRACTOR_VERSION = "1" #To be increased by the changes of the code that change the keywords extracted, so that the results of the result cache are not used anymore
+
+#A word as it is delimited when looking for the words that precede proper nouns
+WORD_PATTERN = re.compile(r"[a-zA-Z'\-äöüÄÖÜßúùûóòôéèêÉÈÊÁÀÂÚÙÛÓÒÔ]+")
 
 
 class KeywordExtractor():
-    def __init__(self, *args) -> None:
+    language_detector = LanguageDetector() #Detects the language of the lines of the articles, shared by all the instances
+    strict_language_detection = False #If True, the language of each line is detected separately, even in articles written in a single language
+    _resources = None #The TreeTagger analysers, stop words and lexicons, loaded by the first instance (see _load_resources())
+    result_cache = None #If set, the results of the articles already processed (see open_result_cache())
+    incremental_store = None #If set, the tags and analyses of the articles already processed (keyword_extractor_incremental.py), reused for their next versions
+    article_state = None #In incremental mode, the tags and analyses of the previous version of the article
+    _name_analyses = {} #The analyses by SMOR of the names and keywords from the list of the articles already processed, shared by all the instances (see _select_lemmas_for_SMOR())
+    join_preceding_first_names = False #If True, proper nouns preceded by a first name are joined with it (ex: Pascal Wehrlein). Off: the regular expression that used to do it never matched, and the keywords were chosen without it
+
+    def __init__(self, *args, article: Article = None) -> None:
         
         if len(args) == 3 and args[0]!="json":
-            self._init_from_file(*args)
+            self._init_from_file(*args, article=article)
         elif len(args) == 2:
             self._init_from_text(*args)
         elif len(args) == 3 and args[0]=="json":
-            self._init_from_json(*args)
+            self._init_from_json(*args, article=article)
         else:
             logging.error('Could not initialise the KeywordExtractor due to the wrong number of arguments received by the constructor: {}'.format(len(args)))
 
     
-    def _init_from_json(self, json_word: str, json: dict, output_folder_name: str) -> None:
+    def _load_resources(self) -> None:
+        """
+        Sets the TreeTagger analysers, the stop words and the lexicons of the instance.
+        They are loaded by the first instance and shared by all the following ones, so that a process extracting the keywords of many articles
+        starts TreeTagger and reads the files only once.
+        """
+        resources = KeywordExtractor._resources
+        if resources is None:
+            resources = {}
+            #Initialise TreeTagger analysers for German and Italian
+            resources["tagger_de"] = treetaggerwrapper.TreeTagger(TAGLANG='de')
+            resources["tagger_it"] = treetaggerwrapper.TreeTagger(TAGLANG='it')
+            
+            #Read stop words files for both languages
+            resources["stop_words_set_de"] = self._read_stop_words_from_file(STOPLIST_DE_FILE)
+            resources["stop_words_set_it"] = self._read_stop_words_from_file(STOPLIST_IT_FILE)
+            
+            #Read the contents of files containing good and bad words
+            namesHashSet = set()
+            self._read_names_from_file(NAMES_FILE, namesHashSet)
+            titlesSet = set()
+            self._read_names_from_file(TITLES_FILE, titlesSet)
+            surnames_set = set()
+            self._read_names_from_file(COMMON_DE_SURNAMES_FILE, surnames_set)
+            self._read_names_from_file(STYR_SURNAMES, surnames_set)
+            good_keywords_set = set()
+            self._read_names_from_file(GOOD_KEYWORDS_FILE, good_keywords_set)
+            resources["namesHashSet"] = namesHashSet
+            resources["titlesSet"] = titlesSet
+            resources["surnames_set"] = surnames_set
+            resources["_good_keywords_set"] = good_keywords_set
+            resources["gazetteer"] = Gazetteer.from_lexicons(namesHashSet, surnames_set, titlesSet, good_keywords_set) #Annotates the tokens of the document that belong to these lists
+            if os.path.isfile(COMPOUND_LEXICON_FILE): #The lexicon of the compound splitter, to which the lemmas of each article are added (see _get_compound_splitter())
+                resources["_compound_lexicon"] = CompoundSplitter.from_file(COMPOUND_LEXICON_FILE)
+            else:
+                resources["_compound_lexicon"] = CompoundSplitter()
+            KeywordExtractor._resources = resources
+        
+        for name, value in resources.items():
+            setattr(self, name, value)
+    
+    
+    def _init_from_json(self, json_word: str, json: dict, output_folder_name: str, article: Article = None) -> None:
         """
         Keyword extractor class for salto.bz articles in German and Italian. Third init function.
     
@@ -107,6 +209,7 @@ class KeywordExtractor():
             :param json_word: string with value "json"
             :param hash json: a json object with a Title, a Teaser and a Body
             :param srt output_folder_name: The folder that will contain the file with keywords
+            :param Article article: the article of the json, if it has already been read (ex: for the key of the result cache)
         """
         
         #Compile POS patterns
@@ -128,31 +231,17 @@ class KeywordExtractor():
             self._main_lang_sentences = []
             self._second_lang_sentences = []
             output_folder_name
+            if article is None:
+                article = Article.from_fields(json["Title"], json["Teaser"], json["Body"])
+            self.file_text = article.text
             try:
-                self._distribute_sentences_per_language_json(json)
+                self._distribute_sentences_per_language(article)
             except ValueError as err:
                 raise ValueError(err)
 
             
-            #Initialise TreeTagger analysers for German and Italian
-            self.tagger_de = treetaggerwrapper.TreeTagger(TAGLANG='de')
-            self.tagger_it = treetaggerwrapper.TreeTagger(TAGLANG='it')
-            
-            #Read stop words files for both languages
-            self.stop_words_set_de = self._read_stop_words_from_file(STOPLIST_DE_FILE)
-            self.stop_words_set_it = self._read_stop_words_from_file(STOPLIST_IT_FILE)
-            
-            #Read the contents of files containing good and bad words
-            self.namesHashSet = set()
-            self._read_names_from_file(NAMES_FILE, self.namesHashSet)
-            self.titlesSet = set()
-            self._read_names_from_file(TITLES_FILE, self.titlesSet)
-            self.surnames_set = set()
-            self._read_names_from_file(COMMON_DE_SURNAMES_FILE, self.surnames_set)
-            self._read_names_from_file(STYR_SURNAMES, self.surnames_set)
-
-            self._good_keywords_set = set()
-            self._read_names_from_file(GOOD_KEYWORDS_FILE, self._good_keywords_set)
+            #TreeTagger analysers for German and Italian, stop words and lexicons, shared by all the instances
+            self._load_resources()
             
         
             if self.lang == "de": #If the main language of the text is German
@@ -176,26 +265,33 @@ class KeywordExtractor():
             
             self.key_words_set = set() #The set of keywords that will be returned to the user
             
-            self.lemma_dict = {} #Key: lemma, value: number of occurances of tokens of this lemma in the document (can be bugger if the word occurrs in the title or teaser)
-            self.lemma_dict_true_number = {} #Key: lemma, value: number of occurances of tokens of this lemma in the document
-            self.noun_lemma_dict = {} #Key: lemma (only nouns and verbs), value: number of occurances of tokens of this lemma in the document. Will countain nouns and verbs (both can be keywords)
-            self.title_noun_lemmas_dict = {}
-            self.token_dict = {} #Key: lemma, value: set of corresponding tokens
+            self.vocabulary = Vocabulary() #Ids of the tokens, lemmas and POS tags of the document, used by the following hashes
+            self.lemma_dict = CounterView(self.vocabulary) #Key: lemma, value: number of occurances of tokens of this lemma in the document (can be bugger if the word occurrs in the title or teaser)
+            self.lemma_dict_true_number = CounterView(self.vocabulary) #Key: lemma, value: number of occurances of tokens of this lemma in the document
+            self.noun_lemma_dict = CounterView(self.vocabulary) #Key: lemma (only nouns and verbs), value: number of occurances of tokens of this lemma in the document. Will countain nouns and verbs (both can be keywords)
+            self.title_noun_lemmas_dict = CounterView(self.vocabulary)
+            self.token_dict = IdSetView(self.vocabulary) #Key: lemma, value: set of corresponding tokens
             self.token_to_lemma_dict = {} #Key: token, value: corresponding lemma in lowercase
-            self.token_to_lemma_dict_original_case = {} #Key: token, value: corresponding lemma in original case
-            self.proper_nouns_hash = {}
-            self.lemma_token_to_POS = {}
+            self.token_to_lemma_dict_original_case = IdMapView(self.vocabulary) #Key: token, value: corresponding lemma in original case
+            self.proper_nouns_hash = CounterView(self.vocabulary)
+            self.lemma_token_to_POS = IdSetView(self.vocabulary)
             self.tree_taggers_proper_nouns = set()
             self.proper_noun_with_names_set = set()
             self.persons_set = set()
             self.from_good_words_proper_nouns = set()
             self.smor_analysis_hash =  {}            
+            self.number_of_lemmas_not_sent_to_SMOR = 0 #Names and keywords from the list whose analyses by SMOR are known from a previous article
+            self.compound_engine = "smor" #The engine that splits German compounds: "smor" or "splitter"
+            self._compound_splitter = None
+            self._preceding_word_index = None #Key: lowercase word, value: list of its occurrences with the word that precedes each of them
+            self.document = None #The tokenized article, built when its first sentence is tagged
             
         except ValueError as value_error:
             logging.error('Could not initialise the KeywordExtractor due to the following error: {}'.format(value_error))
+            raise ValueError('Could not initialise the KeywordExtractor due to the following error: {}'.format(value_error))
             
     
-    def _init_from_file(self, input_file_folder: str, file_name: str, output_folder_name: str) -> None:
+    def _init_from_file(self, input_file_folder: str, file_name: str, output_folder_name: str, article: Article = None) -> None:
         """
         Keyword extractor class for salto.bz articles in German and Italian.
     
@@ -204,6 +300,7 @@ class KeywordExtractor():
         :param str input_file_folder: The folder containing the plain text file with the article to find keywords in
         :param str file_name: The name of the plain text file with the article to find keywords in
         :param srt output_folder_name: The folder that will contain the file with keywords
+        :param Article article: The article of the file, if it has already been read (ex: for the key of the result cache)
     
         """        
         #Compile POS patterns
@@ -218,17 +315,14 @@ class KeywordExtractor():
             if not os.path.isdir(output_folder_name):
                 raise ValueError('Folder {} does not exist. Create it before calling the constructor of the KeywordExtractor.'.format(output_folder_name))
                 
-            output_directory=os.path.join(output_folder_name, "temp_folder_" + file_name)
+            output_directory=os.path.join(output_folder_name, "temp_folder_" + quote(file_name, safe="")) #The file name may be a path relative to the input folder (batch mode)
             self._make_output_directory(output_directory)
             self.output_directory = output_directory
                 
             input_file_path = os.path.join(input_file_folder, file_name)
-            self.file_text = self._read_file(input_file_path)
-            self.file_text = self.file_text.replace("(",",")
-            self.file_text = self.file_text.replace(")",",")
-            self.file_text = self.file_text.replace("*","###")
-            self.file_text = self.file_text.replace("|","===")
-            self.file_text = self.file_text.replace("+","#=#")
+            if article is None:
+                article = Article.from_text(self._read_file(input_file_path))
+            self.file_text = article.text
             
             #If the text of the file is too short (less than 50 characters), refuses to analyse it
             if len(self.file_text) < 50:
@@ -238,29 +332,12 @@ class KeywordExtractor():
             self._second_lang_sentences = []
             
             try:
-                self._distribute_sentences_per_language()
+                self._distribute_sentences_per_language(article)
             except ValueError as err:
                 raise ValueError(err)
             
-            #Initialise TreeTagger analysers for German and Italian
-            self.tagger_de = treetaggerwrapper.TreeTagger(TAGLANG='de')
-            self.tagger_it = treetaggerwrapper.TreeTagger(TAGLANG='it')
-            
-            #Read stop words files for both languages
-            self.stop_words_set_de = self._read_stop_words_from_file(STOPLIST_DE_FILE)
-            self.stop_words_set_it = self._read_stop_words_from_file(STOPLIST_IT_FILE)
-            
-            #Read the contents of files containing good and bad words
-            self.namesHashSet = set()
-            self._read_names_from_file(NAMES_FILE, self.namesHashSet)
-            self.titlesSet = set()
-            self._read_names_from_file(TITLES_FILE, self.titlesSet)
-            self.surnames_set = set()
-            self._read_names_from_file(COMMON_DE_SURNAMES_FILE, self.surnames_set)
-            self._read_names_from_file(STYR_SURNAMES, self.surnames_set)
-
-            self._good_keywords_set = set()
-            self._read_names_from_file(GOOD_KEYWORDS_FILE, self._good_keywords_set)
+            #TreeTagger analysers for German and Italian, stop words and lexicons, shared by all the instances
+            self._load_resources()
         
             if self.lang == "de": #If the main language of the text is German
                 self.main_tagger = self.tagger_de
@@ -283,20 +360,26 @@ class KeywordExtractor():
             
             self.key_words_set = set() #The set of keywords that will be returned to the user
             
-            self.lemma_dict = {} #Key: lemma, value: number of occurances of tokens of this lemma in the document (can be bugger if the word occurrs in the title or teaser)
-            self.lemma_dict_true_number = {} #Key: lemma, value: number of occurances of tokens of this lemma in the document
-            self.noun_lemma_dict = {} #Key: lemma (only nouns and verbs), value: number of occurances of tokens of this lemma in the document. Will countain nouns and verbs (both can be keywords)
-            self.title_noun_lemmas_dict = {}
-            self.token_dict = {} #Key: lemma, value: set of corresponding tokens
+            self.vocabulary = Vocabulary() #Ids of the tokens, lemmas and POS tags of the document, used by the following hashes
+            self.lemma_dict = CounterView(self.vocabulary) #Key: lemma, value: number of occurances of tokens of this lemma in the document (can be bugger if the word occurrs in the title or teaser)
+            self.lemma_dict_true_number = CounterView(self.vocabulary) #Key: lemma, value: number of occurances of tokens of this lemma in the document
+            self.noun_lemma_dict = CounterView(self.vocabulary) #Key: lemma (only nouns and verbs), value: number of occurances of tokens of this lemma in the document. Will countain nouns and verbs (both can be keywords)
+            self.title_noun_lemmas_dict = CounterView(self.vocabulary)
+            self.token_dict = IdSetView(self.vocabulary) #Key: lemma, value: set of corresponding tokens
             self.token_to_lemma_dict = {} #Key: token, value: corresponding lemma in lowercase
-            self.token_to_lemma_dict_original_case = {} #Key: token, value: corresponding lemma in original case
-            self.proper_nouns_hash = {}
-            self.lemma_token_to_POS = {}
+            self.token_to_lemma_dict_original_case = IdMapView(self.vocabulary) #Key: token, value: corresponding lemma in original case
+            self.proper_nouns_hash = CounterView(self.vocabulary)
+            self.lemma_token_to_POS = IdSetView(self.vocabulary)
             self.tree_taggers_proper_nouns = set()
             self.proper_noun_with_names_set = set()
             self.persons_set = set()
             self.from_good_words_proper_nouns = set()
             self.smor_analysis_hash =  {}            
+            self.number_of_lemmas_not_sent_to_SMOR = 0 #Names and keywords from the list whose analyses by SMOR are known from a previous article
+            self.compound_engine = "smor" #The engine that splits German compounds: "smor" or "splitter"
+            self._compound_splitter = None
+            self._preceding_word_index = None #Key: lowercase word, value: list of its occurrences with the word that precedes each of them
+            self.document = None #The tokenized article, built when its first sentence is tagged
             
         except ValueError as value_error:
             logging.error('Could not initialise the KeywordExtractor due to the following error: {}'.format(value_error))
@@ -326,18 +409,13 @@ class KeywordExtractor():
         self.pattern_digit_punct = re.compile(r"[\d{}]+$".format(re.escape(string.punctuation)))
         
         try:                
-            self.file_text = salto_text.decode()
+            article = Article.from_text(salto_text.decode())
+            self.file_text = article.text
             
             #If the text of the file is too short (less than 50 characters), refuses to analyse it
             if len(self.file_text) < 50:
                 raise ValueError('The text is too short to be analysed.'.format(self.file_text))
             
-            self.file_text = self.file_text.replace("(",",")
-            self.file_text = self.file_text.replace(")",",")
-            self.file_text = self.file_text.replace("*","###")
-            self.file_text = self.file_text.replace("|","===")
-            self.file_text = self.file_text.replace("+","#=#")
-            
             if not os.path.isdir(output_folder_name):
                 raise ValueError('Folder {} does not exist. Create it before calling the constructor of the KeywordExtractor.'.format(output_folder_name))
                 
@@ -349,29 +427,12 @@ class KeywordExtractor():
             self._second_lang_sentences = []
             
             try:
-                self._distribute_sentences_per_language()
+                self._distribute_sentences_per_language(article)
             except ValueError as err:
                 raise ValueError(err)
             
-            #Initialise TreeTagger analysers for German and Italian
-            self.tagger_de = treetaggerwrapper.TreeTagger(TAGLANG='de')
-            self.tagger_it = treetaggerwrapper.TreeTagger(TAGLANG='it')
-            
-            #Read stop words files for both languages
-            self.stop_words_set_de = self._read_stop_words_from_file(STOPLIST_DE_FILE)
-            self.stop_words_set_it = self._read_stop_words_from_file(STOPLIST_IT_FILE)
-            
-            #Read the contents of files containing good and bad words
-            self.namesHashSet = set()
-            self._read_names_from_file(NAMES_FILE, self.namesHashSet)
-            self.titlesSet = set()
-            self._read_names_from_file(TITLES_FILE, self.titlesSet)
-            self.surnames_set = set()
-            self._read_names_from_file(COMMON_DE_SURNAMES_FILE, self.surnames_set)
-            self._read_names_from_file(STYR_SURNAMES, self.surnames_set)
-
-            self._good_keywords_set = set()
-            self._read_names_from_file(GOOD_KEYWORDS_FILE, self._good_keywords_set)
+            #TreeTagger analysers for German and Italian, stop words and lexicons, shared by all the instances
+            self._load_resources()
         
             if self.lang == "de": #If the main language of the text is German
                 self.main_tagger = self.tagger_de
@@ -394,20 +455,26 @@ class KeywordExtractor():
             
             self.key_words_set = set() #The set of keywords that will be returned to the user
             
-            self.lemma_dict = {} #Key: lemma, value: number of occurances of tokens of this lemma in the document (can be bugger if the word occurrs in the title or teaser)
-            self.lemma_dict_true_number = {} #Key: lemma, value: number of occurances of tokens of this lemma in the document
-            self.noun_lemma_dict = {} #Key: lemma (only nouns and verbs), value: number of occurances of tokens of this lemma in the document. Will countain nouns and verbs (both can be keywords)
-            self.title_noun_lemmas_dict = {}
-            self.token_dict = {} #Key: lemma, value: set of corresponding tokens
+            self.vocabulary = Vocabulary() #Ids of the tokens, lemmas and POS tags of the document, used by the following hashes
+            self.lemma_dict = CounterView(self.vocabulary) #Key: lemma, value: number of occurances of tokens of this lemma in the document (can be bugger if the word occurrs in the title or teaser)
+            self.lemma_dict_true_number = CounterView(self.vocabulary) #Key: lemma, value: number of occurances of tokens of this lemma in the document
+            self.noun_lemma_dict = CounterView(self.vocabulary) #Key: lemma (only nouns and verbs), value: number of occurances of tokens of this lemma in the document. Will countain nouns and verbs (both can be keywords)
+            self.title_noun_lemmas_dict = CounterView(self.vocabulary)
+            self.token_dict = IdSetView(self.vocabulary) #Key: lemma, value: set of corresponding tokens
             self.token_to_lemma_dict = {} #Key: token, value: corresponding lemma in lowercase
-            self.token_to_lemma_dict_original_case = {} #Key: token, value: corresponding lemma in original case
-            self.proper_nouns_hash = {}
-            self.lemma_token_to_POS = {}
+            self.token_to_lemma_dict_original_case = IdMapView(self.vocabulary) #Key: token, value: corresponding lemma in original case
+            self.proper_nouns_hash = CounterView(self.vocabulary)
+            self.lemma_token_to_POS = IdSetView(self.vocabulary)
             self.tree_taggers_proper_nouns = set()
             self.proper_noun_with_names_set = set()
             self.persons_set = set()
             self.from_good_words_proper_nouns = set()
             self.smor_analysis_hash =  {}            
+            self.number_of_lemmas_not_sent_to_SMOR = 0 #Names and keywords from the list whose analyses by SMOR are known from a previous article
+            self.compound_engine = "smor" #The engine that splits German compounds: "smor" or "splitter"
+            self._compound_splitter = None
+            self._preceding_word_index = None #Key: lowercase word, value: list of its occurrences with the word that precedes each of them
+            self.document = None #The tokenized article, built when its first sentence is tagged
             
         except ValueError as value_error:
             logging.error('Could not initialise the KeywordExtractor due to the following error: {}'.format(value_error))
@@ -493,6 +560,24 @@ class KeywordExtractor():
         return self.key_words_set
         
     
+    def count_keywords(self, key_words_set: set) -> dict:
+        """
+        Returns a hash: key: keyword, value: the number of its occurrences in the text (case insensitive) as whole words: "Rom" is not counted in "Promotion".
+        """
+        lowercase_text = self.file_text.lower()
+        return {keyword: len(re.findall(r"(?<!\w)"+re.escape(keyword.lower())+r"(?!\w)", lowercase_text)) for keyword in key_words_set}
+        
+    
+    def rank_keywords(self, key_words_set: set, counts: dict = None) -> list:
+        """
+        Ranks the keywords from the most frequent in the text (case insensitive) to the least frequent; keywords of the same frequency in alphabetical order.
+        The numbers of occurrences of the keywords (see count_keywords()) are counted if they are not given.
+        """
+        if counts is None:
+            counts = self.count_keywords(key_words_set)
+        return rank_by_counts(counts)
+        
+    
     def _find_keywords_from_list_in_text(self) -> None:
         """
         Loops through the set of keywords from the good keywords file and looks for their occurrences in the text.
@@ -586,20 +671,9 @@ class KeywordExtractor():
 
         self._join_case_differences(newHash)
         
-        sorted_smorLemmasCountHash = sorted(newHash.items(), key=operator.itemgetter(1))
-        sorted_smorLemmasCountHash.reverse()
-
-        values_smorLemmasCountHash = sorted(newHash.values())
-        values_smorLemmasCountHash.reverse()
-        moyenneSmorf = sum(values_smorLemmasCountHash)/len(values_smorLemmasCountHash)
-
-        for m in range(len(values_smorLemmasCountHash)):
-            if sorted_smorLemmasCountHash[m][1] > moyenneSmorf and not sorted_smorLemmasCountHash[m][0].isdigit():
-                winningFromSmorHash[sorted_smorLemmasCountHash[m][0]] = sorted_smorLemmasCountHash[m][1]
-
-        len_winningFromSmorHash = len(winningFromSmorHash)
-        while len_winningFromSmorHash > 10:
-            len_winningFromSmorHash = self._reduce_winning_from_SMOR_hash(winningFromSmorHash)
+        #Take the lemmas with a score greater than the mean, and not more than 10 of them
+        winningFromSmorHash.update(select_above_mean(newHash, skip_digits=True))
+        reduce_to_above_mean(winningFromSmorHash, 10)
             
     
     def _choose_keywords(self, keyWordsSet: set, quoted_pieces_set: set) -> set:
@@ -667,32 +741,34 @@ class KeywordExtractor():
     def _add_words_to_delete_with_edit_distance_de(self, theSet: set, setToDelete: set) -> None:
         """
         Find similar German words with edit distance and add the to the set to delete.
+        Only the pairs of words that share a part or are close enough are looked at, in the same order as if all the pairs were compared.
         """
-        for word in theSet:
-            try:
-                wordPartsSet = self.compound_lemma_to_parts[word]
-            except:
+        words = list(theSet)
+        similarWords = self._find_similar_words([word.lower() for word in words])
+        wordsSharingParts = find_words_sharing_parts(words, self.compound_lemma_to_parts)
+        for i, word in enumerate(words):
+            if word not in self.compound_lemma_to_parts:
                 continue
             
-            for word2 in theSet:
+            sharingParts = wordsSharingParts.get(i, set())
+            for j in sorted(sharingParts.union(similarWords.get(i, []))):
+                word2 = words[j]
                 if word.lower() != word2.lower():
-                    try:
-                        word2PartsSet = self.compound_lemma_to_parts[word2]
-                        intersectionOfPartSets = wordPartsSet.intersection(word2PartsSet)
-                        #If 2 words contain the  same part, we take only  one of them
-                        if len(intersectionOfPartSets) > 0:
-                            self._add_the_shortest_word_to_set(setToDelete, word, word2)
-                        else:
-                            self._add_with_edit_distance(setToDelete, word.lower(), word2.lower())
-                    except:
-                        self._add_with_edit_distance(setToDelete, word.lower(), word2.lower())
+                    #If 2 words contain the  same part, we take only  one of them
+                    if j in sharingParts:
+                        self._add_the_shortest_word_to_set(setToDelete, word, word2)
+                    else:
+                        self._add_the_shortest_word_to_set(setToDelete, word.lower(), word2.lower())
               
                 
     def _add_words_to_delete_with_edit_distance_it(self, theSet: set, setToDelete: set) -> None:
-        for word in theSet:
-            for word2 in theSet:
+        words = list(theSet)
+        similarWords = self._find_similar_words([word.lower() for word in words])
+        for i, word in enumerate(words):
+            for j in similarWords.get(i, []):
+                word2 = words[j]
                 if word.lower() != word2.lower():
-                    self._add_with_edit_distance(setToDelete, word.lower(), word2.lower())
+                    self._add_the_shortest_word_to_set(setToDelete, word.lower(), word2.lower())
 
     def _clean_similar_keywords_with_edit_distance(self, theSet: set) -> None:
         """
@@ -742,7 +818,7 @@ class KeywordExtractor():
                                 lemmaListForSmor.write(secondKeyword+"\n")
                                 lemmaListForSmor.close()
                             try:
-                                subprocess.check_output([SMOR_EXECUTABLE, lemmasFileName, smorOutFile], cwd=SMOR_FOLDER)
+                                self._run_compound_analyser(lemmasFileName, smorOutFile)
                             except subprocess.CalledProcessError as error:
                                 logging.error("error analysing "+lemmasFileName+" with SMOR")
                                 logging.error(error.output)
@@ -789,62 +865,30 @@ class KeywordExtractor():
 
         self._join_case_differences(newHash)
 
-        sorted_smorLemmasCountHash = sorted(newHash.items(), key=operator.itemgetter(1))
-        sorted_smorLemmasCountHash.reverse()
-
-        values_smorLemmasCountHash = sorted(newHash.values())
-        values_smorLemmasCountHash.reverse()
-        moyenneSmorf = sum(values_smorLemmasCountHash)/len(values_smorLemmasCountHash)
-
-        for m in range(len(values_smorLemmasCountHash)):
-            if sorted_smorLemmasCountHash[m][1] > moyenneSmorf and not sorted_smorLemmasCountHash[m][0].isdigit():
-                winningFromSmorHash[sorted_smorLemmasCountHash[m][0]] = sorted_smorLemmasCountHash[m][1]
-
-        len_winningFromSmorHash = len(winningFromSmorHash)
-        while len_winningFromSmorHash > 10:
-            len_winningFromSmorHash = self._reduce_winning_from_SMOR_hash(winningFromSmorHash)
+        #Take the lemmas with a score greater than the mean, and not more than 10 of them
+        winningFromSmorHash.update(select_above_mean(newHash, skip_digits=True))
+        reduce_to_above_mean(winningFromSmorHash, 10)
 
         self._delete_words_with_same_parts(winningFromSmorHash, alreadyTakenScoresHash)
     
     
-    def _reduce_winning_from_SMOR_hash(self, winningFromSmorHash: dict) -> int:
-        """
-        Reduces the number of keyword candidates taking only candidates with the highest scores.
-        """
-        winningFromSmorHash2 = {}
-        sorted_smorLemmasCountHash = sorted(winningFromSmorHash.items(), key=operator.itemgetter(1))
-        sorted_smorLemmasCountHash.reverse()
-
-        values_smorLemmasCountHash = sorted(winningFromSmorHash.values())
-        values_smorLemmasCountHash.reverse()
-        meanSmorf = sum(values_smorLemmasCountHash)/len(values_smorLemmasCountHash)
-
-        for m in range(len(values_smorLemmasCountHash)):
-            if sorted_smorLemmasCountHash[m][1] > meanSmorf:
-                winningFromSmorHash2[sorted_smorLemmasCountHash[m][0]] = sorted_smorLemmasCountHash[m][1]
-
-        winningFromSmorHash.clear()
-        winningFromSmorHash.update(winningFromSmorHash2)
-
-        return len(winningFromSmorHash)
-
-    
     def _join_case_differences(self, smorLemmasCountHash: dict) -> None:
         """
         Deletes keys that differ only in case from the hash.
         """        
         smorLemmasCountHashNew = {}
         keysTodelete = set()
-        for lemma in smorLemmasCountHash:
-            for lemma2 in smorLemmasCountHash:
-                if lemma != lemma2 and lemma.lower() == lemma2.lower():
-                    if lemma not in keysTodelete and lemma2 not in keysTodelete:
-                        smorLemmasCountHashNew.update({lemma.lower():smorLemmasCountHash[lemma]+smorLemmasCountHash[lemma2]})
-                        # We delete the least frequent form
-                        if smorLemmasCountHash[lemma2] <= smorLemmasCountHash[lemma]:
-                            keysTodelete.add(lemma2)
-                        else:
-                            keysTodelete.add(lemma)
+        for caseVariants in find_case_variants(smorLemmasCountHash): #Only the lemmas that differ in case have to be compared
+            for lemma in caseVariants:
+                for lemma2 in caseVariants:
+                    if lemma != lemma2:
+                        if lemma not in keysTodelete and lemma2 not in keysTodelete:
+                            smorLemmasCountHashNew.update({lemma.lower():smorLemmasCountHash[lemma]+smorLemmasCountHash[lemma2]})
+                            # We delete the least frequent form
+                            if smorLemmasCountHash[lemma2] <= smorLemmasCountHash[lemma]:
+                                keysTodelete.add(lemma2)
+                            else:
+                                keysTodelete.add(lemma)
 
         for key in keysTodelete:
             try:
@@ -861,11 +905,12 @@ class KeywordExtractor():
         Deletes keys that differ only in case from the hash.
         """
         keysTodelete = set()
-        for lemma in smorLemmasCountSet:
-            for lemma2 in smorLemmasCountSet:
-                if lemma != lemma2 and lemma.lower() == lemma2.lower():
-                    if lemma not in keysTodelete and lemma2 not in keysTodelete:
-                        keysTodelete.add(lemma2)
+        for caseVariants in find_case_variants(smorLemmasCountSet):
+            for lemma in caseVariants:
+                for lemma2 in caseVariants:
+                    if lemma != lemma2:
+                        if lemma not in keysTodelete and lemma2 not in keysTodelete:
+                            keysTodelete.add(lemma2)
 
         return smorLemmasCountSet.difference(keysTodelete)
         
@@ -897,34 +942,26 @@ class KeywordExtractor():
         """
         wordsWithSameParts = {}
         greaterScoresHash = set()
-        for word in winningFromSmorHash:
-            for word2 in winningFromSmorHash:
-                if word != word2:
-                    if word in alreadyTakenScoresHash and word2 in alreadyTakenScoresHash:
-                        if len(alreadyTakenScoresHash[word].intersection(alreadyTakenScoresHash[word2])) > 0:
-                            self._register_words_in_tables(word, word2, winningFromSmorHash, greaterScoresHash, wordsWithSameParts)
-                    elif word in alreadyTakenScoresHash:
-                        if word2 in alreadyTakenScoresHash[word]:
-                            self._register_words_in_tables(word, word2, winningFromSmorHash, greaterScoresHash, wordsWithSameParts)
-                    elif word2 in alreadyTakenScoresHash:
-                        if word in alreadyTakenScoresHash[word2]:
-                            self._register_words_in_tables(word, word2, winningFromSmorHash, greaterScoresHash, wordsWithSameParts)
-
+        #Only the pairs of words related through their parts are looked at, in the order of the hash
+        words = list(winningFromSmorHash)
+        relatedWords = find_words_related_by_parts(words, alreadyTakenScoresHash)
+        for i, word in enumerate(words):
+            for j in sorted(relatedWords.get(i, [])):
+                self._register_words_in_tables(word, words[j], winningFromSmorHash, greaterScoresHash, wordsWithSameParts)
 
         greaterScoresHash2 = set()
         wordsToDelete = set()
-        for word in greaterScoresHash:
-            for word2 in greaterScoresHash:
-                if word != word2:
-                    if word in alreadyTakenScoresHash and word2 in alreadyTakenScoresHash:
-                        if len(alreadyTakenScoresHash[word].intersection(alreadyTakenScoresHash[word2])) > 0:
-                            self._add_to_delete(winningFromSmorHash, word, word2, wordsToDelete)
-                    elif word2 in alreadyTakenScoresHash:
-                        if word in alreadyTakenScoresHash[word2]:
-                            self._add_to_delete(winningFromSmorHash, word, word2, wordsToDelete)
-                    elif word in alreadyTakenScoresHash:
-                        if word2 in alreadyTakenScoresHash[word]:
-                            self._add_to_delete(winningFromSmorHash, word2, word, wordsToDelete)
+        words = list(greaterScoresHash)
+        relatedWords = find_words_related_by_parts(words, alreadyTakenScoresHash)
+        for i, word in enumerate(words):
+            for j in sorted(relatedWords.get(i, [])):
+                word2 = words[j]
+                if word not in alreadyTakenScoresHash and word2 in alreadyTakenScoresHash:
+                    self._add_to_delete(winningFromSmorHash, word, word2, wordsToDelete)
+                elif word in alreadyTakenScoresHash and word2 not in alreadyTakenScoresHash:
+                    self._add_to_delete(winningFromSmorHash, word2, word, wordsToDelete)
+                else:
+                    self._add_to_delete(winningFromSmorHash, word, word2, wordsToDelete)
 
         greaterScoresHash2 = greaterScoresHash.difference(wordsToDelete)
 
@@ -956,26 +993,12 @@ class KeywordExtractor():
         """
         Takes compounds from smorLemmasCountHash, finds parts that occur in more than 1 compound and finds their full forms.
         """
-        for w in smorLemmasCountHash:
-            for w2 in smorLemmasCountHash:
-                if w != w2:
-                    if w in nounPartsAndTheirCompoundsHash and w2 in nounPartsAndTheirCompoundsHash:
-                        wFullWordsSet = set(nounPartsAndTheirCompoundsHash[w].keys())
-                        w2FullWordsSet = set(nounPartsAndTheirCompoundsHash[w2].keys())
-                        commonFullForms = wFullWordsSet.intersection(w2FullWordsSet)
-
-                        for cFF in commonFullForms:
-                            if cFF not in commonFullFormsHash:
-                                commonFullFormsHash[cFF] = smorLemmasCountHash[w]+smorLemmasCountHash[w2]
-                                alreadyTakenScoresHash[cFF] = {w, w2}
-                            else:
-                                if w not in alreadyTakenScoresHash[cFF]:
-                                    commonFullFormsHash[cFF] += smorLemmasCountHash[w]
-                                    alreadyTakenScoresHash[cFF].add(w)
-
-                                if w2 not in alreadyTakenScoresHash[cFF]:
-                                    commonFullFormsHash[cFF] += smorLemmasCountHash[w2]
-                                    alreadyTakenScoresHash[cFF].add(w2)
+        compoundsToParts = find_compounds_of_parts(smorLemmasCountHash, nounPartsAndTheirCompoundsHash)
+        for cFF in compoundsToParts:
+            parts = compoundsToParts[cFF]
+            if len(parts) > 1: #The full form is common to several parts
+                commonFullFormsHash[cFF] = sum(smorLemmasCountHash[w] for w in parts)
+                alreadyTakenScoresHash[cFF] = set(parts)
                                 
     
     def _delete_POSes_from_end(self, wholeKeywordFirstFormTable: list, posesCopy: list) -> None:
@@ -1033,7 +1056,7 @@ class KeywordExtractor():
         newKeywordsSet = set()
 
         for keyword in properNounWithNamesSet:
-            tags = tagger.tag_text(keyword)
+            tags = self._tag_keyword(keyword, tagger)
             tokens = []
             poses = []
             self._create_POSes_tokens_with_SMOR(tags, tokens, poses, keyword)                            
@@ -1044,7 +1067,7 @@ class KeywordExtractor():
                 #We find the follower(s)
                 adjWithFollowers=self._find_follower_for_adj(tokens[0]).strip()
                 #We delete the follower(s), if they are irrelevant part of speech (article, preposition etc.)
-                tags_AdjWithFollowers = tagger.tag_text(adjWithFollowers)
+                tags_AdjWithFollowers = self._tag_keyword(adjWithFollowers, tagger)
                 tokens_AdjWithFollowers = []
                 poses_AdjWithFollowers = []
                 
@@ -1082,7 +1105,7 @@ class KeywordExtractor():
         newKeywordsSet = set()
 
         for keyword in properNounWithNamesSet:
-            tags = tagger.tag_text(keyword)
+            tags = self._tag_keyword(keyword, tagger)
             tokens = []
             poses = []
             for tag in tags:
@@ -1156,6 +1179,7 @@ class KeywordExtractor():
     def _word_always_followed_by_word2_adj(self, couplesHash: dict, couplesWords: dict, winningProperNounsWithFrequencies: dict, formsForPattern: str, formsForPattern2: str, word: str, word2: str, wordOrig: str, barier: int) -> None:
         """
         Finds out if an adjective (word) is in most cases followed by word2 in the text.
+        Matches the regular expressions on the text itself, not on the Document (see keyword_extractor_document.py).
         """
         
         patternTogether = re.compile(formsForPattern+r"[ \-\.\_\:\&\'\*\+]+"+formsForPattern2+r"([^a-zA-Z\-äöüÄÖÜßúùûóòôéèêÉÈÊÁÀÂÚÙÛÓÒÔ]|$)", re.IGNORECASE)
@@ -1220,7 +1244,7 @@ class KeywordExtractor():
 
             tokens = []
             poses = []
-            tags = tagger.tag_text(keyword)
+            tags = self._tag_keyword(keyword, tagger)
             
             if len(tags)<1:
                 continue
@@ -1282,7 +1306,7 @@ class KeywordExtractor():
 
             tokens = []
             poses = []
-            tags = tagger.tag_text(keyword)
+            tags = self._tag_keyword(keyword, tagger)
             self._create_POSes_tokens_with_SMOR(tags, tokens, poses, keyword)
             posesCopy = list(poses)
             self._delete_POSes_from_beginning(tokens, posesCopy)
@@ -1387,7 +1411,7 @@ class KeywordExtractor():
         tokensListForSmor.close()   
         
         if needSMOR:
-            subprocess.check_output([SMOR_EXECUTABLE, tokensFileName, smorOutFile], cwd=SMOR_FOLDER)
+            self._run_compound_analyser(tokensFileName, smorOutFile)
             smorAnalysisArray = self._read_SMOR_result_to_array(smorOutFile)
         
         s = 0
@@ -1421,105 +1445,64 @@ class KeywordExtractor():
     
     def _find_overlapping_keywords_rec(self, properNounWithNamesSet: set) -> set:
         """
-        Recursive. Goes back when there are no keywords to delete.
-        If 2 keywords that overlap (the end of 1 keyword is the beginning of another).
+        Repeats until there are no keywords to join.
+        If 2 keywords that overlap (the last words of 1 keyword are the first words of another).
         Unites them and checks if the united version occurs in the text.
         If yes, replaces the keywords by their union.
         """
-        joinedPNSet = set()
-        notNeededMorePNSet = set()
-        
-        for pn in properNounWithNamesSet:
-            for pn2 in properNounWithNamesSet:
-                if pn != pn2:
-                    overlap = self._get_overlap(pn, pn2)
-                    if len(overlap) == 0:
-                        continue
-
-                    joinedPN = ""
-                    if re.search(overlap, pn2)!=None and re.search(overlap, pn2).start() == 0:
-                        joinedPN = pn+pn2[re.search(overlap, pn2).end():]
-                    elif re.search(overlap, pn)!=None and re.search(overlap, pn).start() == 0:
-                        joinedPN = pn2+pn[re.search(overlap, pn).end():]
-
-                    if len(joinedPN) > 0:
-                        if re.search(joinedPN, self.file_text):
-                            joinedPNSet.add(joinedPN)
-                            notNeededMorePNSet.add(pn)
-                            notNeededMorePNSet.add(pn2)
-                            
-        if len(notNeededMorePNSet) == 0:
-            return properNounWithNamesSet
-        else:
-            newSet = properNounWithNamesSet.difference(notNeededMorePNSet).union(joinedPNSet)
-            newSet = self._find_overlapping_keywords_rec(newSet)
-        
-        return newSet
+        return join_overlapping_keywords(properNounWithNamesSet, self._get_phrase_index())
     
     def _find_overlapping_keywords(self, properNounWithNamesSet: set) -> set:
         """
-        If 2 keywords that overlap (the end of 1 keyword is the beginning of another).
+        If 2 keywords that overlap (the last words of 1 keyword are the first words of another).
         Unites them and checks if the united version occurs in the text.
         If yes, replaces the keywords by their union.
+        Contrary to _find_overlapping_keywords_rec, only joins keywords once.
         """
-        joinedPNSet = set()
-        notNeededMorePNSet = set()
-        
-        for pn in properNounWithNamesSet:
-            for pn2 in properNounWithNamesSet:
-                if pn != pn2:
-                    overlap = self._get_overlap(pn, pn2)
-                    if len(overlap) == 0:
-                        continue
+        return join_overlapping_keywords(properNounWithNamesSet, self._get_phrase_index(), repeat=False)
+    
 
-                    joinedPN = ""
-                    if re.search(overlap, pn2).start() == 0:
-                        joinedPN = pn+pn2[re.search(overlap, pn2).end():]
-                    elif re.search(overlap, pn).start() == 0:
-                        joinedPN = pn2+pn[re.search(overlap, pn).end():]
+    def _get_phrase_index(self) -> PhraseIndex:
+        """
+        Returns the index of the phrases of the text, kept by the document.
+        """
+        return self._get_document().phrase_index()
 
-                    if len(joinedPN) > 0:
-                        if re.search(joinedPN, self.file_text):
-                            joinedPNSet.add(joinedPN)
-                            notNeededMorePNSet.add(pn)
-                            notNeededMorePNSet.add(pn2)
 
-        newSet = properNounWithNamesSet.difference(notNeededMorePNSet).union(joinedPNSet)
-        
-        return newSet
-    
+    def _get_document(self) -> Document:
+        """
+        Returns the document of the article. Builds it the first time it is needed.
+        """
+        if self.document is None:
+            self.document = Document(self.file_text, self.vocabulary)
+        return self.document
 
-    def _get_overlap(self, s1: str, s2: str) -> str:
+
+    def _tag_keyword(self, keyword: str, tagger: object) -> list:
         """
-        Finds the overlap between 2 strings.
-        Returns the string that represents the overlap.
+        Returns the tags of the tokens of the keyword.
+        If the keyword occurs in a sentence of the document tagged in the language of the tagger, the tags are read from the document;
+        otherwise the keyword is tagged.
         """
-        s = difflib.SequenceMatcher(None, s1, s2)
-        pos_a, pos_b, size = s.find_longest_match(0, len(s1), 0, len(s2))
-        return s1[pos_a:pos_a+size]
+        if tagger is self.main_tagger:
+            tags = self._get_document().tags_of(keyword, self.lang)
+        elif tagger is self.second_tagger:
+            tags = self._get_document().tags_of(keyword, self.second_lang)
+        else:
+            tags = None
+        if tags is None:
+            tags = self._tag(tagger, keyword)
+        return tags
 
-    
-    def _find_mean(self, sortedProperNounsHashValues: list) -> float:
+
+    def _tag(self, tagger: object, text: str) -> list:
         """
-        Find the frequency above which keywords should be taken and below which they should be left out.
+        Tags the text with the tagger. In incremental mode, a text already tagged for the previous version of the article is not tagged again.
         """
-        mean = sum(sortedProperNounsHashValues)/len(sortedProperNounsHashValues)
-        numberToTake = 0
-        numbers = []
-        for v in sortedProperNounsHashValues:
-            if mean > sortedProperNounsHashValues[-1]:
-                if v >= mean:
-                    numberToTake += 1
-                    numbers.append(v)
-            else:
-                if v > mean:
-                    numberToTake += 1
-                    numbers.append(v)
+        if self.article_state is not None:
+            return self.article_state.tag(tagger, text)
+        return tagger.tag_text(text)
 
-        if numberToTake > 5:
-            mean = self._find_mean(numbers)
-   
-        return mean
     
     def _find_best_proper_nouns(self, hash_keywords_from_list) -> set:
         '''
@@ -1528,8 +1511,10 @@ class KeywordExtractor():
         
         self.proper_nouns_hash.update(hash_keywords_from_list)
         
-        #Check if some proper nouns go together
-        joint_proper_nouns = self._find_proper_nouns_that_always_go_together(set(self.proper_nouns_hash.keys()), self.proper_nouns_hash)
+        #Check if some proper nouns go together: first in the runs of capitalised words, then, for the proper nouns outside of them, with patterns
+        joint_proper_nouns, proper_nouns_not_in_runs = self._join_proper_nouns_with_capitalised_runs(set(self.proper_nouns_hash.keys()))
+        if proper_nouns_not_in_runs:
+            joint_proper_nouns |= self._find_proper_nouns_that_always_go_together(proper_nouns_not_in_runs, self.proper_nouns_hash)
         
         joint_proper_nouns = self._find_overlapping_keywords_rec(joint_proper_nouns)
         
@@ -1537,15 +1522,15 @@ class KeywordExtractor():
         
         newPNHash = {}
         pns_to_delete = set()
+        pns_in_joint_pns = find_keywords_contained_in(list(self.proper_nouns_hash), list(joint_proper_nouns))
         for pn_joint in joint_proper_nouns:
-            for pn in self.proper_nouns_hash:
-                if pn != pn_joint and pn in pn_joint:
-                    pns_to_delete.add(pn)
-                    if pn_joint not in newPNHash:
-                        newPNHash[pn_joint] = self.proper_nouns_hash[pn]
-                    else:
-                        if pn.lower() not in self.namesHashSet: #If the new part of the keyword which score we have to take into account is a surname, we don't add points (because the same surname may occur in different proper nouns and thus have a higher score)
-                            newPNHash[pn_joint] = max(self.proper_nouns_hash[pn],newPNHash[pn_joint])
+            for pn in pns_in_joint_pns.get(pn_joint, []): #The proper nouns contained in the joint proper noun
+                pns_to_delete.add(pn)
+                if pn_joint not in newPNHash:
+                    newPNHash[pn_joint] = self.proper_nouns_hash[pn]
+                else:
+                    if not self.gazetteer.categories_of(pn.lower()) & FIRST_NAME: #If the new part of the keyword which score we have to take into account is a surname, we don't add points (because the same surname may occur in different proper nouns and thus have a higher score)
+                        newPNHash[pn_joint] = max(self.proper_nouns_hash[pn],newPNHash[pn_joint])
                         
         
         for pn in self.proper_nouns_hash:
@@ -1568,26 +1553,10 @@ class KeywordExtractor():
                 
         
         #Find proper nouns with the best scores
-        sortedProperNounsHashValues = sorted(newPNHash.values())
-        sortedProperNounsHashValues.reverse()
-
-        sorted_properNounsHash = sorted(newPNHash.items(), key=operator.itemgetter(1))
-        sorted_properNounsHash.reverse()
         #We take proper nouns with a score greater than the mean. If all the proper nouns have the same score, we take none of them
-        moyenne = self._find_mean(sortedProperNounsHashValues)
-                
-        winningProperNouns = []
+        winningProperNouns = select_by_mean(newPNHash)
         winningProperNounsWithFrequencies = {}
-        numberOfTaken = 0
-        for d in range(len(sortedProperNounsHashValues)):
-            if moyenne > sortedProperNounsHashValues[-1]:
-                if sortedProperNounsHashValues[d] >= moyenne:
-                    winningProperNouns.append(sorted_properNounsHash[d][0])
-                    numberOfTaken += 1
-            else:
-                if sortedProperNounsHashValues[d] > moyenne:
-                    winningProperNouns.append(sorted_properNounsHash[d][0])
-                    numberOfTaken += 1
+        numberOfTaken = len(winningProperNouns)
 
         for pn in winningProperNouns:
             winningProperNounsWithFrequencies[pn] = newPNHash[pn]
@@ -1632,11 +1601,12 @@ class KeywordExtractor():
         Deletes proper nouns that only differ in capitalisation.
         """
         pnsToDelete = set()
-        for pn in properNounWithNamesSet:
-            for pn2 in properNounWithNamesSet:
-                if pn != pn2 and pn.lower() == pn2.lower():
-                    if pn not in pnsToDelete:
-                        pnsToDelete.add(pn2)
+        for caseVariants in find_case_variants(properNounWithNamesSet):
+            for pn in caseVariants:
+                for pn2 in caseVariants:
+                    if pn != pn2:
+                        if pn not in pnsToDelete:
+                            pnsToDelete.add(pn2)
     
         return properNounWithNamesSet.difference(pnsToDelete)
 
@@ -1648,25 +1618,35 @@ class KeywordExtractor():
         """
         newSet = set()
         setToDelete = set()
-        for word in theSet:
-            for word2 in theSet:
-                if word != word2:
-                    self._add_with_edit_distance(setToDelete, word, word2)
+        words = list(theSet)
+        similarWords = self._find_similar_words(words)
+        for i, word in enumerate(words):
+            for j in similarWords.get(i, []):
+                if word != words[j]:
+                    self._add_the_shortest_word_to_set(setToDelete, word, words[j])
         newSet = theSet.difference(setToDelete)
         return newSet
 
 
-    def _add_with_edit_distance(self, setToDelete: set, word: str, word2: str) -> None:
+    def _find_similar_words(self, words: list) -> dict:
         """
-        If 2 words are more than 4 letters long and the edit distance between them (ignoring the umlaut) is smaller than 3,
-        adds the shortest of the 2 words to the set of words to delete.
+        Finds the pairs of words that are more than 4 letters long and whose edit distance (ignoring the umlaut) is smaller than 3.
+        Returns a hash: key: index of a word in the list, value: sorted list of the indexes of the words similar to it.
         """
-        if len(word) > 4 and len(word2) > 4:
-            wordClean = word.replace("ä", "a").replace("á", "a").replace("à", "a").replace("â", "a").replace("ü", "u").replace("ú", "u").replace("ù", "u").replace("û", "u").replace("ö", "o").replace("ó", "o").replace("ò", "o").replace("ô", "o").replace("ë", "e").replace("é", "e").replace("è", "e").replace("ê", "e").replace("É", "E").replace("È", "E").replace("Ë", "E").replace("Ê", "E").replace("Ä", "A").replace("Á", "A").replace("À", "A").replace("Â", "A").replace("Ü", "U").replace("Ú", "U").replace("Ù", "U").replace("Û", "U").replace("Ö", "O").replace("Ó", "O").replace("Ò", "O").replace("Ô", "O").replace("ß", "ss")
-            wordClean2 = word2.replace("ä", "a").replace("á", "a").replace("à", "a").replace("â", "a").replace("ü", "u").replace("ú", "u").replace("ù", "u").replace("û", "u").replace("ö", "o").replace("ó", "o").replace("ò", "o").replace("ô", "o").replace("ë", "e").replace("é", "e").replace("è", "e").replace("ê", "e").replace("É", "E").replace("È", "E").replace("Ë", "E").replace("Ê", "E").replace("Ä", "A").replace("Á", "A").replace("À", "A").replace("Â", "A").replace("Ü", "U").replace("Ú", "U").replace("Ù", "U").replace("Û", "U").replace("Ö", "O").replace("Ó", "O").replace("Ò", "O").replace("Ô", "O").replace("ß", "ss")
-            
-            if editdistance.eval(wordClean, wordClean2) < 3:
-                self._add_the_shortest_word_to_set(setToDelete, word, word2)
+        wordsClean = []
+        for word in words:
+            if len(word) > 4:
+                wordsClean.append(self._remove_accents(word))
+            else:
+                wordsClean.append(None)
+        return find_similar_strings(wordsClean, 2)
+
+
+    def _remove_accents(self, word: str) -> str:
+        """
+        Replaces the letters with umlaut or accent by the same letters without it, and ß by ss.
+        """
+        return word.replace("ä", "a").replace("á", "a").replace("à", "a").replace("â", "a").replace("ü", "u").replace("ú", "u").replace("ù", "u").replace("û", "u").replace("ö", "o").replace("ó", "o").replace("ò", "o").replace("ô", "o").replace("ë", "e").replace("é", "e").replace("è", "e").replace("ê", "e").replace("É", "E").replace("È", "E").replace("Ë", "E").replace("Ê", "E").replace("Ä", "A").replace("Á", "A").replace("À", "A").replace("Â", "A").replace("Ü", "U").replace("Ú", "U").replace("Ù", "U").replace("Û", "U").replace("Ö", "O").replace("Ó", "O").replace("Ò", "O").replace("Ô", "O").replace("ß", "ss")
     
     
     def _add_the_shortest_word_to_set(self, setToDelete: set, word: str, word2: str) -> None:
@@ -1686,21 +1666,15 @@ class KeywordExtractor():
         """
         Deletes keywords that are part of keywords of another set.
         """        
+        containment_index = ContainmentIndex(properNounWithNamesSet)
         keywordsToDeleteAfterProperNouns = set()
         for keyword in keyWordsSet:
             if keyword in self.token_dict:
-                keyWordForms = "("
-                for tok in self.token_dict[keyword]:
-                    keyWordForms += tok + "|"
-                keyWordForms = keyWordForms[:-1] + ")"
+                keyWordForms = self.token_dict[keyword]
             else:
-                keyWordForms = keyword
-            for pn in properNounWithNamesSet:
-                if pn == keyword:
-                    continue
-                
-                if re.search(r"([ \-\.\_\,\:\&\"\'\*\+^$]+"+keyWordForms.lower()+r"|"+keyWordForms.lower()+r"[ \-\.\_\,\:\&\"\'\*\+^$]+)", pn.lower()) != None:
-                    keywordsToDeleteAfterProperNouns.add(keyword)
+                keyWordForms = [keyword]
+            if containment_index.is_part_of_another_keyword(keyword, keyWordForms):
+                keywordsToDeleteAfterProperNouns.add(keyword)
         
         return keyWordsSet.difference(keywordsToDeleteAfterProperNouns)
 
@@ -1734,7 +1708,7 @@ class KeywordExtractor():
                         if len(couple) > max_len:
                             max_len = len(couple)
                             couple_to_take = couple
-                        if re.search(couple,self.file_text, re.IGNORECASE | re.MULTILINE): #Choose the one that actually can be found in the text
+                        if self._get_phrase_index().occurs(couple, ignore_case=True, whole_tokens=False): #Choose the one that actually can be found in the text
                             newArray[n] = couple
                             found_exact_match = True
                     if found_exact_match == False:  #If none can be found in the text, choose the longest one
@@ -1765,26 +1739,22 @@ class KeywordExtractor():
         if len(word_list) == 0:
             return ""
         new_word = ' '.join(word_list[:-1])
-        if re.search(new_word, self.file_text, re.IGNORECASE | re.MULTILINE) == False:
-            new_word = self._shorten_keyword( word_list[:-1])
-        else:
-            return new_word
+        if len(new_word) > 0 and not self._get_phrase_index().occurs(new_word, ignore_case=True, whole_tokens=False):
+            new_word = self._shorten_keyword_from_end(word_list[:-1])
         
         return new_word
     
     def _shorten_keyword_from_beginning(self, word_list) -> str:
         """
         Shortens a key word that contains the same word at least twice.
-        Shortens it from the end and tries to find the resulting word in the text.
+        Shortens it from the beginning and tries to find the resulting word in the text.
         If finds the resulting word in the text, returns it.
         """
         if len(word_list) == 0:
             return ""
         new_word = ' '.join(word_list[1:])
-        if re.search(new_word, self.file_text, re.IGNORECASE | re.MULTILINE) == False:
-            new_word = self._shorten_keyword( word_list[1:])
-        else:
-            return new_word
+        if len(new_word) > 0 and not self._get_phrase_index().occurs(new_word, ignore_case=True, whole_tokens=False):
+            new_word = self._shorten_keyword_from_beginning(word_list[1:])
         
         return new_word
     
@@ -1793,25 +1763,12 @@ class KeywordExtractor():
         """
         Finds out if a proper noun is frequently preceded by a title.
         """
-        pattern2 = re.compile(r"(?:[a-zA-Z'\-äöüÄÖÜßúùûóòôéèêÉÈÊÁÀÂÚÙÛÓÒÔ]+[^a-zA-Z'\-äöüÄÖÜßúùûóòôéèêÉÈÊÁÀÂÚÙÛÓÒÔ\,\.\:\;\?\!\'\"\@\<\>\|\=\}\{\]\[}\n]+){0,1}"+properNoun+r"[^a-zA-Z'\-äöüÄÖÜßúùûóòôéèêÉÈÊÁÀÂÚÙÛÓÒÔ]", re.IGNORECASE)
-        allGroups = []
-        iterator = pattern2.finditer(self.file_text)
-
-        for match in iterator:
-            allGroups.append(match.group())
-
-        if len(allGroups) < 1:
-            return properNoun
-
-        elif len(allGroups) > 0:
-            for group in allGroups:
-                maybeName = group[:-(len(properNoun)+1)].rstrip()
-                if maybeName is not None:
-                    if maybeName.lower() in self.titlesSet and not maybeName[0].islower():
-                        maybeName = self._find_first_form_herr_frau(maybeName)
-                        self.proper_nouns_hash[maybeName+" "+properNoun] = self.proper_nouns_hash[properNoun]
-                        self.persons_set.add(maybeName+" "+properNoun)
-                        return maybeName+" "+properNoun
+        for occurrence in self._find_occurrences_in_preceding_word_index(properNoun):
+            if occurrence[3]: #If the preceding word is a title
+                maybeName = self._find_first_form_herr_frau(occurrence[1])
+                self.proper_nouns_hash[maybeName+" "+properNoun] = self.proper_nouns_hash[properNoun]
+                self.persons_set.add(maybeName+" "+properNoun)
+                return maybeName+" "+properNoun
 
         return properNoun
     
@@ -1830,30 +1787,129 @@ class KeywordExtractor():
     def _if_proper_noun_preceded_by_name(self, properNoun: str) -> str:
         """
         Finds out if a proper noun is frequently preceded by a name.
-        """        
-        pattern2 = re.compile(re.escape(r"(?:[a-zA-Z'\-äöüÄÖÜßúùûóòôéèêÉÈÊÁÀÂÚÙÛÓÒÔ]+[^a-zA-Z'\-äöüÄÖÜßúùûóòôéèêÉÈÊÁÀÂÚÙÛÓÒÔ\,\.\:\;\?\!\'\"\@\<\>\|\=\}\{\]\[}\n]+){0,1}"+properNoun+r"[^a-zA-Z'\-äöüÄÖÜßúùûóòôéèêÉÈÊÁÀÂÚÙÛÓÒÔ]"), re.IGNORECASE)
-        allGroups = []
-        
-        iterator = pattern2.finditer(re.escape(self.file_text))
+        Does nothing unless join_preceding_first_names is True (see its comment).
+        """
+        if not self.join_preceding_first_names:
+            return properNoun
+        for occurrence in self._find_occurrences_in_preceding_word_index(properNoun):
+            if occurrence[2]: #If the preceding word is a first name
+                maybeName = occurrence[1]
+                self.proper_nouns_hash[maybeName+" "+properNoun] = self.proper_nouns_hash[properNoun]
+                self.persons_set.add(maybeName+" "+properNoun)
+                return maybeName+" "+properNoun
+
+        return properNoun
+    
+    
+    def _build_preceding_word_index(self) -> dict:
+        """
+        Loops once through the words of the text and registers, for each word, the word that precedes it.
+        The preceding word is only registered if the 2 words are separated by spaces (and not by a line break or punctuation).
+        Words of the stop lists are never taken as first names (the list of names contains such words as "la" or "per").
+        Returns a hash: key: word in lowercase; value: list of tuples (position of the word in the text, preceding word or None, True if the preceding word is a first name, True if the preceding word is a title).
+        Reads the text itself, not the Document, since the gap between the 2 words is not kept in the tokens.
+        """
+        preceding_word_index = {}
+        previous_word = None
+        previous_word_end = 0
+        for match in WORD_PATTERN.finditer(self.file_text):
+            word = match.group()
+            gap = self.file_text[previous_word_end:match.start()]
+            preceding_word = None
+            is_name = False
+            is_title = False
+            if previous_word is not None and gap.isspace() and "\n" not in gap:
+                preceding_word = previous_word
+                if not preceding_word[0].islower():
+                    preceding_word_lower = preceding_word.lower()
+                    categories = self.gazetteer.categories_of(preceding_word_lower)
+                    is_name = bool(categories & FIRST_NAME) and preceding_word_lower not in self.stop_words_set_de and preceding_word_lower not in self.stop_words_set_it
+                    is_title = bool(categories & TITLE)
+
+            word_lower = word.lower()
+            if word_lower in preceding_word_index:
+                preceding_word_index[word_lower].append((match.start(), preceding_word, is_name, is_title))
+            else:
+                preceding_word_index[word_lower] = [(match.start(), preceding_word, is_name, is_title)]
 
-        for match in iterator:
-            allGroups.append(match.group())
+            previous_word = word
+            previous_word_end = match.end()
 
-        if len(allGroups) < 1:
-            return properNoun
+        return preceding_word_index
+    
+    
+    def _find_occurrences_in_preceding_word_index(self, properNoun: str) -> list:
+        """
+        Finds the occurrences of a (possibly multi-word) proper noun in the text with help of the preceding word index.
+        The comparison ignores case and the proper noun has to be followed by a character that is not a letter.
+        Returns the list of the corresponding entries of the index, in the order in which they occur in the text.
+        """
+        if self._preceding_word_index is None:
+            self._preceding_word_index = self._build_preceding_word_index()
 
-        elif len(allGroups) > 0:
-            for group in allGroups:
-                maybeName = group[:-(len(properNoun)+1)].rstrip()
-                if maybeName is not None:
-                    if maybeName.lower() in self.namesHashSet and not maybeName[0].islower():
-                        self.proper_nouns_hash[maybeName+" "+properNoun] = self.proper_nouns_hash[properNoun]
-                        self.persons_set.add(maybeName+" "+properNoun)
-                        return maybeName+" "+properNoun
+        first_word = WORD_PATTERN.match(properNoun)
+        if first_word is None:
+            return []
 
-        return properNoun
+        properNounLower = properNoun.lower()
+        occurrences = []
+        for occurrence in self._preceding_word_index.get(first_word.group().lower(), []):
+            end = occurrence[0]+len(properNoun)
+            if end >= len(self.file_text) or WORD_PATTERN.match(self.file_text[end]):
+                continue
+            if self.file_text[occurrence[0]:end].lower() == properNounLower:
+                occurrences.append(occurrence)
+
+        return occurrences
     
     
+    def _join_proper_nouns_with_capitalised_runs(self, properNounSet: set) -> tuple:
+        """
+        Finds in a single pass through the tokens of the main language the runs of capitalised words (ex: Nico Rosberg, Süddeutsche Zeitung).
+        A proper noun that in most cases occurs in the same run is replaced by this run, which is added to the proper nouns hash with its frequency.
+        Returns the set of the proper nouns, joint when possible, and the set of the proper nouns that do not occur in any run.
+        """
+        document = self._get_document()
+        vocabulary = self.vocabulary
+        runs = find_capitalised_runs(document, language=self.lang)
+        spanFrequencies = count_capitalised_spans(document, runs)
+
+        #Number of occurrences of each word (token or lemma in lowercase)
+        wordOccurrences = {}
+        for position in range(len(document)):
+            if document.language_of(position) != self.lang:
+                continue
+            for word_id in {vocabulary.lowercase(document.token_ids[position]), vocabulary.lowercase(document.lemma_ids[position])}:
+                wordOccurrences[word_id] = wordOccurrences.get(word_id, 0)+1
+
+        #Key: id of a word in lowercase, value: hash: key: run containing the word, value: number of times the word occurs in it
+        runsOfWords = {}
+        for first, last in runs:
+            span = document.text[document.starts[first]:document.ends[last-1]]
+            for position in range(first, last):
+                for word_id in {vocabulary.lowercase(document.token_ids[position]), vocabulary.lowercase(document.lemma_ids[position])}:
+                    spans = runsOfWords.setdefault(word_id, {})
+                    spans[span] = spans.get(span, 0)+1
+
+        jointProperNouns = set()
+        properNounsNotInRuns = set()
+        for pn in properNounSet:
+            pn_id = vocabulary.ids.get(pn.lower())
+            if pn_id not in runsOfWords:
+                properNounsNotInRuns.add(pn)
+                continue
+            spans = runsOfWords[pn_id]
+            bestSpan = max(spans, key=spans.get)
+            if 2*spans[bestSpan] > wordOccurrences[pn_id]:
+                jointProperNouns.add(bestSpan)
+                if bestSpan not in self.proper_nouns_hash:
+                    self.proper_nouns_hash[bestSpan] = spanFrequencies[bestSpan]
+            else:
+                jointProperNouns.add(pn)
+
+        return jointProperNouns, properNounsNotInRuns
+
+
     def _find_proper_nouns_that_always_go_together(self, properNounWithNamesSet: list, winningProperNounsWithFrequencies: dict) -> set:
         """
         Among the winning proper nouns find those that in most cases are preceded or/and followed by other words. Replace them by these collocations.
@@ -2276,19 +2332,16 @@ class KeywordExtractor():
         """
         Performs SMOR analyses of the lemmas obtained with TreeTagger. Fills dictionaries passed as argument.
         """        
+        lemmas_for_SMOR = self._select_lemmas_for_SMOR()
+        self.number_of_lemmas_not_sent_to_SMOR = len(self.noun_lemma_dict)-len(lemmas_for_SMOR)
+        logging.debug("{} lemmas of {} not sent to SMOR".format(self.number_of_lemmas_not_sent_to_SMOR, len(self.noun_lemma_dict)))
+
         #Analyse with SMOR
-        lemmas_file_name = os.path.join(self.output_directory,"lemmas.txt")
-        smor_out_file = lemmas_file_name+".smor.txt"
-        lemma_list_for_smor = io.open(lemmas_file_name, mode="w", encoding="utf-8")
-        for lemma in self.noun_lemma_dict:
-            lemma_list_for_smor.write(lemma+"\n")
-        lemma_list_for_smor.close()
-        
         try:
-            subprocess.check_output([SMOR_EXECUTABLE, lemmas_file_name, smor_out_file], cwd=SMOR_FOLDER)
-            #Read smor output line by line
             compoundLemma = ""
-            smorAnalysisHash = self._read_SMOR_result(smor_out_file)
+            smorAnalysisHash = self._add_name_analyses(self._analyse_lemmas(lemmas_for_SMOR) if len(lemmas_for_SMOR) > 0 else {})
+            if len(smorAnalysisHash) == 0:
+                return {}
             
             for compoundLemma in smorAnalysisHash:
                 smorLine = smorAnalysisHash[compoundLemma][0]
@@ -2299,7 +2352,7 @@ class KeywordExtractor():
 
                 if re.search("no result", smorLine):
                     if compoundLemma.lower() not in self.stop_words_set_de and compoundLemma[0].isupper():
-                        if compoundLemma in self.tree_taggers_proper_nouns or compoundLemma.lower() in self.surnames_set or compoundLemma.lower() in self.namesHashSet:
+                        if compoundLemma in self.tree_taggers_proper_nouns or self.gazetteer.categories_of(compoundLemma.lower()) & (SURNAME | FIRST_NAME):
                             if compoundLemma in self.title_noun_lemmas_dict:
                                 self._add_item_to_hash_augment_count(compoundLemma, self.proper_nouns_hash, self.noun_lemma_dict[compoundLemma]+1)
                             else:
@@ -2323,7 +2376,7 @@ class KeywordExtractor():
                         wordPart = wordPart.replace("{", "").replace("}", "").replace("-", "")
                         
                     if len(wordPart) > 0 and wordPart.lower() not in self.stop_words_set_de:
-                        if wordPart.lower() in self._good_keywords_set:
+                        if self.gazetteer.categories_of(wordPart.lower()) & LIST_KEYWORD:
                             if compoundLemma in self.title_noun_lemmas_dict:
                                 self._add_item_to_hash_augment_count(compoundLemma, self.proper_nouns_hash, self.noun_lemma_dict[compoundLemma]+1)
                             else:
@@ -2340,7 +2393,7 @@ class KeywordExtractor():
                             
                             if onlyProp == False:
                                 #If SMOR suggests both variants, but TreeTagger suggests a proper noun, we take it as a proper noun
-                                if compoundLemma in self.tree_taggers_proper_nouns or compoundLemma.lower() in self.surnames_set:
+                                if compoundLemma in self.tree_taggers_proper_nouns or self.gazetteer.categories_of(compoundLemma.lower()) & SURNAME:
                                     onlyProp = True
                             
                             if onlyProp == True:
@@ -2370,6 +2423,93 @@ class KeywordExtractor():
             return {}
        
         
+    def _analyse_lemmas(self, lemmas: list) -> dict:
+        """
+        Analyses the lemmas with the engine chosen in self.compound_engine and returns a hash containing lemmas as keys and a list of their analyses as values (see _read_SMOR_result()).
+        In incremental mode, the analyses by SMOR of the lemmas of the previous version of the article are reused: only the new lemmas are analysed.
+        """
+        reuse_analyses = self.article_state is not None and self.compound_engine == "smor" #The analyses of the compound splitter depend on the lemmas of the article
+        lemmas_to_analyse = self.article_state.missing_analyses(lemmas) if reuse_analyses else lemmas
+        smor_analysis_hash = {}
+        if len(lemmas_to_analyse) > 0:
+            lemmas_file_name = os.path.join(self.output_directory,"lemmas.txt")
+            smor_out_file = lemmas_file_name+".smor.txt"
+            lemma_list_for_smor = io.open(lemmas_file_name, mode="w", encoding="utf-8")
+            for lemma in lemmas_to_analyse:
+                lemma_list_for_smor.write(lemma+"\n")
+            lemma_list_for_smor.close()
+            self._run_compound_analyser(lemmas_file_name, smor_out_file)
+            smor_analysis_hash = self._read_SMOR_result(smor_out_file)
+        if reuse_analyses:
+            self.article_state.add_analyses(lemmas_to_analyse, smor_analysis_hash)
+            smor_analysis_hash = self.article_state.analyses_of(lemmas)
+        return smor_analysis_hash
+
+
+    def _run_compound_analyser(self, input_file_name: str, output_file_name: str) -> None:
+        """
+        Analyses the words of the input file (one word per line) with the engine chosen in self.compound_engine
+        and writes the analyses into the output file in the format of SMOR.
+        """
+        if self.compound_engine == "splitter":
+            self._get_compound_splitter().analyse_file(input_file_name, output_file_name)
+        else:
+            subprocess.check_output([SMOR_EXECUTABLE, input_file_name, output_file_name], cwd=SMOR_FOLDER)
+
+
+    def _get_compound_splitter(self) -> CompoundSplitter:
+        """
+        Returns the compound splitter. Builds it the first time it is needed, on top of the lexicon file (read once, see _load_resources()),
+        out of the lemmas of the article that are not proper nouns, with their number of occurrences. A lemma of the article is analysed as a single part only if it cannot be split into other words.
+        """
+        if self._compound_splitter is None:
+            self._compound_splitter = CompoundSplitter(base=self._compound_lexicon)
+            for lemma in self.noun_lemma_dict:
+                if lemma not in self.tree_taggers_proper_nouns:
+                    self._compound_splitter.add(lemma, self.lemma_dict_true_number.get(lemma, 1))
+        return self._compound_splitter
+
+
+    def _is_name_or_list_keyword(self, lemma: str) -> bool:
+        """
+        Finds out if the lemma is a name (tagged as a proper noun, or found in the lists of first names and surnames) or a keyword from the list.
+        """
+        return lemma in self.tree_taggers_proper_nouns or lemma in self.from_good_words_proper_nouns or bool(self.gazetteer.categories_of(lemma.lower()) & (FIRST_NAME | SURNAME | LIST_KEYWORD))
+
+
+    def _select_lemmas_for_SMOR(self) -> list:
+        """
+        Returns the lemmas of noun_lemma_dict to send to SMOR: all of them but the names and keywords from the list already analysed by SMOR for a previous article.
+        Names recur from one article to the next (ex: Kompatscher, SVP), and their analyses are taken from KeywordExtractor._name_analyses (see _add_name_analyses()).
+        They cannot be left out unanalysed: SMOR may find a common noun (ex: Fischer, Bauer) or a genitive in them.
+        The analyses of the compound splitter depend on the lemmas of the article, so with it all the lemmas are sent.
+        """
+        if self.compound_engine != "smor":
+            return list(self.noun_lemma_dict)
+        return [lemma for lemma in self.noun_lemma_dict if lemma not in KeywordExtractor._name_analyses or not self._is_name_or_list_keyword(lemma)]
+
+
+    def _add_name_analyses(self, smor_analysis_hash: dict) -> dict:
+        """
+        Keeps the analyses by SMOR of the names and keywords from the list of the hash for the next articles,
+        and returns the hash of the analyses of the lemmas of noun_lemma_dict, completed with the analyses kept for the names not sent to SMOR, in the order of noun_lemma_dict.
+        """
+        if self.compound_engine != "smor":
+            return smor_analysis_hash
+        name_analyses = KeywordExtractor._name_analyses
+        complete_hash = {}
+        for lemma in self.noun_lemma_dict:
+            if lemma in smor_analysis_hash:
+                complete_hash[lemma] = smor_analysis_hash[lemma]
+                if lemma not in name_analyses and self._is_name_or_list_keyword(lemma):
+                    if len(name_analyses) >= MAX_NAME_ANALYSES:
+                        del name_analyses[next(iter(name_analyses))] #The oldest name
+                    name_analyses[lemma] = list(smor_analysis_hash[lemma])
+            elif lemma in name_analyses:
+                complete_hash[lemma] = list(name_analyses[lemma])
+        return complete_hash
+
+
     def _fill_compound_lemma_to_parts(self, compoundLemma: str, wordPart: str) -> None:
         if compoundLemma in self.compound_lemma_to_parts:
             if wordPart not in self.compound_lemma_to_parts[compoundLemma]:
@@ -2420,19 +2560,19 @@ class KeywordExtractor():
                 increment_by = 2
                 if len(sentence) < 1:
                     continue
-                self._fill_dictionaries_with_treetagger(sentence, increment_by, self.main_lang_stop_words_set)
+                self._fill_dictionaries_with_treetagger(sentence, increment_by, self.main_lang_stop_words_set, where_is_the_sentence)
             elif where_is_the_sentence == "TEASER:":
                 increment_by = 1.5
                 if len(sentence) < 1:
                     continue
-                self._fill_dictionaries_with_treetagger(sentence, increment_by, self.main_lang_stop_words_set)
+                self._fill_dictionaries_with_treetagger(sentence, increment_by, self.main_lang_stop_words_set, where_is_the_sentence)
             elif where_is_the_sentence == "BODY:":
                 increment_by = 1
                 if len(sentence) < 1:
                     continue
-                self._fill_dictionaries_with_treetagger(sentence, increment_by, self.main_lang_stop_words_set)
+                self._fill_dictionaries_with_treetagger(sentence, increment_by, self.main_lang_stop_words_set, where_is_the_sentence)
             else:
-                self._fill_dictionaries_with_treetagger(sentence, increment_by, self.main_lang_stop_words_set)
+                self._fill_dictionaries_with_treetagger(sentence, increment_by, self.main_lang_stop_words_set, where_is_the_sentence)
       
         
     def _clean_sentence_before_tagging(self, sentence: str) -> str:
@@ -2444,24 +2584,17 @@ class KeywordExtractor():
         
     def _find_second_language_proper_nouns_with_treetagger(self, sentence: str, stopWordsSet: set) -> None:
         sentence = self._clean_sentence_before_tagging(sentence)
-        tags = self.second_tagger.tag_text(sentence)  ##### !!!!!!!!!!
+        tags = self._tag(self.second_tagger, sentence)  ##### !!!!!!!!!!
         is_first_word_of_sentence = True
+        document = self._get_document()
+        first, last = document.add_tagged_sentence(sentence, tags, None, self.second_lang)
+        self.gazetteer.annotate(document, first, last)
+        strings = self.vocabulary.strings
         
-        for tag in tags:
-            tableForToken = tag.split("\t")
-            if len(tableForToken) != 3:
-                continue
-
-            token = tableForToken[0]
-            pos = tableForToken[1]
-            lemma = tableForToken[2]
-
-            if lemma == "<UNKNOWN>":
-                lemma = token
-
-            #If TreeTagger suggests more than 1 possible lemma, we take the first one
-            if "|" in lemma:
-                lemma = max(lemma.split("|"), key=len)
+        for position in range(first, last):
+            token = strings[document.token_ids[position]]
+            pos = strings[document.pos_ids[position]]
+            lemma = strings[document.lemma_ids[position]]
 
             if token[0].isupper():
                 lemma = lemma[0].upper()+lemma[1:]
@@ -2471,7 +2604,7 @@ class KeywordExtractor():
                 continue
             
             #If the word is part of the priority keywords list, we add it to the proper nouns hash
-            if (token.lower() in self._good_keywords_set or lemma.lower() in self._good_keywords_set):
+            if document.gazetteer_flags[position] & LIST_KEYWORD:
                 if token[0].isupper():
                     lemma = lemma[0].upper()+lemma[1:]                    
                 self.tree_taggers_proper_nouns.add(lemma)
@@ -2490,78 +2623,72 @@ class KeywordExtractor():
             is_first_word_of_sentence = False
         
                 
-    def _fill_dictionaries_with_treetagger(self, sentence: str, increment_by: float, stopWordsSet: set) -> None:
+    def _fill_dictionaries_with_treetagger(self, sentence: str, increment_by: float, stopWordsSet: set, section: str = None) -> None:
         """
         Analyses a sentence with TreeTagger, fills the dictionaries passed as argument based on TreeTagger input.
+        The tagged sentence is added to the document, in the given section (TITLE:, TEASER: or BODY:).
         """        
         sentence = self._clean_sentence_before_tagging(sentence)
-        tags = self.main_tagger.tag_text(sentence)       
+        tags = self._tag(self.main_tagger, sentence)       
         is_first_word_of_sentence = True
+        vocabulary = self.vocabulary
+        document = self._get_document()
+        first, last = document.add_tagged_sentence(sentence, tags, section, self.lang)
+        self.gazetteer.annotate(document, first, last)
         
-        for tag in tags:
+        for position in range(first, last):
             already_taken_in_noun_lemma_dict = False
             already_taken_into_proper_nouns = False
-            tableForToken = tag.split("\t")
-            if len(tableForToken) != 3:
-                continue
 
-            token = tableForToken[0]
-            pos = tableForToken[1]
-            lemma = tableForToken[2]
-            if lemma == "<UNKNOWN>":
-                lemma = token
-
-            #If TreeTagger suggests more than 1 possible lemma, we take the first one
-            if "|" in lemma:
-                lemma = max(lemma.split("|"), key=len)
+            token_id = document.token_ids[position]
+            lemma_id = document.lemma_ids[position]
+            token = vocabulary.strings[token_id]
+            lowercase_lemma_id = vocabulary.lowercase(lemma_id)
 
             #Register the pair lemma-token
-            if lemma.lower() in self.token_dict:
-                self.token_dict[lemma.lower()].add(token)
-            else:
-                self.token_dict[lemma.lower()] = {token} #a set of tokens corresponding to this lemma
+            self.token_dict.add(lowercase_lemma_id, token_id) #a set of tokens corresponding to this lemma
 
             #Register the pair token-lemma
-            if token not in self.token_to_lemma_dict_original_case:
-                self.token_to_lemma_dict_original_case[token] = lemma
+            if not self.token_to_lemma_dict_original_case.contains_id(token_id):
+                self.token_to_lemma_dict_original_case.set_by_id(token_id, lemma_id)
             
             if token not in self.token_to_lemma_dict:
-                self.token_to_lemma_dict_original_case[token] = lemma.lower()
+                self.token_to_lemma_dict_original_case.set_by_id(token_id, lowercase_lemma_id)
 
-            self._add_item_to_hash_augment_count(lemma, self.lemma_dict, increment_by)
-            self._add_item_to_hash_augment_count(lemma, self.lemma_dict_true_number, 1)
+            self.lemma_dict.augment(lemma_id, increment_by)
+            self.lemma_dict_true_number.augment(lemma_id, 1)
 
             if token[0].isupper():
-                lemma = lemma[0].upper()+lemma[1:]
-
-            if lemma in self.lemma_token_to_POS:
-                self.lemma_token_to_POS[lemma].add(pos)
-            else:
-                self.lemma_token_to_POS[lemma] = {pos}
+                lemma_id = vocabulary.capitalise(lemma_id)
 
-            if token in self.lemma_token_to_POS:
-                self.lemma_token_to_POS[token].add(pos)
-            else:
-                self.lemma_token_to_POS[token] = {pos}
+            pos_id = document.pos_ids[position]
+            pos = vocabulary.strings[pos_id]
+            self.lemma_token_to_POS.add(lemma_id, pos_id)
+            self.lemma_token_to_POS.add(token_id, pos_id)
                 
             #If the word is part of the stop list, we pass it; Filter out digits and punctuation
-            if token.lower() in stopWordsSet or lemma.lower() in stopWordsSet or self.pattern_digit_punct.match(lemma):
+            lowercase_token = vocabulary.strings[vocabulary.lowercase(token_id)]
+            lowercase_lemma = vocabulary.strings[vocabulary.lowercase(lemma_id)]
+            lemma = vocabulary.strings[lemma_id]
+            if lowercase_token in stopWordsSet or lowercase_lemma in stopWordsSet or self.pattern_digit_punct.match(lemma):
                  continue
              
             if increment_by > 1:
                 if token[0].isupper():
-                    lemma = lemma[0].upper()+lemma[1:]
-                self._add_item_to_hash_augment_count(lemma, self.title_noun_lemmas_dict, 1)
+                    lemma_id = vocabulary.capitalise(lemma_id)
+                    lemma = vocabulary.strings[lemma_id]
+                    lowercase_lemma = vocabulary.strings[vocabulary.lowercase(lemma_id)]
+                self.title_noun_lemmas_dict.augment(lemma_id, 1)
                     
             #If the word is part of the priority keywords list, we add it to the proper nouns hash
-            if (token.lower() in self._good_keywords_set or lemma.lower() in self._good_keywords_set):
+            if document.gazetteer_flags[position] & LIST_KEYWORD:
                 if increment_by > 1:
                     self.tree_taggers_proper_nouns.add(lemma)
                     self.from_good_words_proper_nouns.add(lemma)
-                    self._add_item_to_hash_augment_count(lemma, self.noun_lemma_dict, increment_by)
+                    self.noun_lemma_dict.augment(lemma_id, increment_by)
                     
                 if self.lang == "it":
-                    self._add_item_to_hash_augment_count(lemma, self.proper_nouns_hash, increment_by)
+                    self.proper_nouns_hash.augment(lemma_id, increment_by)
                     
                 continue
             
@@ -2570,24 +2697,24 @@ class KeywordExtractor():
                 already_taken_into_proper_nouns = True
                 
                 if already_taken_in_noun_lemma_dict == False:
-                    self._add_item_to_hash_augment_count(lemma[0].upper()+lemma[1:], self.noun_lemma_dict, increment_by)
+                    self.noun_lemma_dict.augment(vocabulary.capitalise(lemma_id), increment_by)
                 if self.lang == "it":
-                    self._add_item_to_hash_augment_count(lemma, self.proper_nouns_hash, increment_by)
+                    self.proper_nouns_hash.augment(lemma_id, increment_by)
                 
             #Filter out digits, punctuation
             if (self.noun_or_verb_pattern.match(pos[0:2]) or self.adj_pattern.match(pos[0:3])):
                 #Put into a nouns hash for later compound decomposition by SMOR
-                self._add_item_to_hash_augment_count(lemma, self.noun_lemma_dict, increment_by)
+                self.noun_lemma_dict.augment(lemma_id, increment_by)
                 already_taken_in_noun_lemma_dict = True
 
             if self.adj_pattern.match(pos[0:3]) and token[0].isupper() and is_first_word_of_sentence == False and self.lang == "de" : #If an adjective starts with a capital letter in German, it's very probably a proper noun
                 if already_taken_in_noun_lemma_dict == False:
-                    self._add_item_to_hash_augment_count(lemma[0].upper()+lemma[1:], self.noun_lemma_dict, increment_by)
+                    self.noun_lemma_dict.augment(vocabulary.capitalise(lemma_id), increment_by)
                     already_taken_in_noun_lemma_dict = True
                     
             elif (is_first_word_of_sentence == False and token[0].isupper() and self.lang == "it" and already_taken_into_proper_nouns == False): #If an Italian word starts with a capital letter and is not the first word of the sentence, it is probably a proper noun
                     self.tree_taggers_proper_nouns.add(lemma)
-                    self._add_item_to_hash_augment_count(lemma, self.proper_nouns_hash, increment_by)
+                    self.proper_nouns_hash.augment(lemma_id, increment_by)
 
             is_first_word_of_sentence = False
             
@@ -2694,123 +2821,28 @@ class KeywordExtractor():
         return relatedGroupsHash
      
     
-    def _add_sentences_from_article_element(self, sentences, where_is_the_sentence: str, sentences_per_lang_hash: dict, number_sentences_per_lang_hash: dict) -> None:
-        for sent in sentences:                
-            for s in sent.split("\n"):
-                s = s.strip()
-                if len(s) > 0:
-                    try:
-                        lang = detect(s)
-                        if lang in sentences_per_lang_hash:
-                            sentences_per_lang_hash[lang].append([s,where_is_the_sentence])
-                            number_sentences_per_lang_hash[lang] += 1
-                        else:
-                            sentences_per_lang_hash[lang] = [[s,where_is_the_sentence]]
-                            number_sentences_per_lang_hash[lang] = 1
-                    except:
-                        print(str(sys.exc_info()[0])+" when trying to detect the language of "+s)
-                        pass
-                    
-    def _clean_file_text(self, text):
-        text = text.replace("(",",")
-        text = text.replace(")",",")
-        text = text.replace("*","###")
-        text = text.replace("|","===")
-        text = text.replace("+","#=#")
-        return text
-    
-    def _distribute_sentences_per_language_json(self, json) -> None:
+    def _distribute_sentences_per_language(self, article: Article) -> None:
         """
         Creates 2 lists:
             one containing sentences in the main language of the text (declared in the class constructor with the lang parameter)
             the other containing sentences in the second language of the text
+        Unless strict_language_detection is set, the language of the whole article is decided at once when no line shows signs of another language
+        (the lines without evidence for it are still detected separately).
         """
         sentences_per_lang_hash = {}
         number_sentences_per_lang_hash = {}
         
-        title = self._clean_file_text(json["Title"])
-        teaser = self._clean_file_text(json["Teaser"])
-        body = self._clean_file_text(json["Body"])
-        
-        self.file_text = title +"\n" + teaser + "\n" + body
-        
-        #Split sentences
-        sentencesTitle = split_multi(title)
-        where_is_the_sentence = "TITLE:"        
-        self._add_sentences_from_article_element(sentencesTitle, where_is_the_sentence, sentences_per_lang_hash, number_sentences_per_lang_hash)
-        
-        sentencesTeaser = split_multi(teaser)
-        where_is_the_sentence = "TEASER:"
-        self._add_sentences_from_article_element(sentencesTeaser, where_is_the_sentence, sentences_per_lang_hash, number_sentences_per_lang_hash)
-        
-        sentencesBody = split_multi(body)
-        where_is_the_sentence = "BODY:"
-        self._add_sentences_from_article_element(sentencesBody, where_is_the_sentence, sentences_per_lang_hash, number_sentences_per_lang_hash)
-                        
-        #Sort by number of sentences, find the main language
-        sorted_number_sentences_per_lang_hash = sorted(number_sentences_per_lang_hash.items(), key=itemgetter(1), reverse=True)        
-        main_language = sorted_number_sentences_per_lang_hash[0][0]
-        
-        self.lang = main_language        
-        if self.lang == "de":
-            self.second_lang = "it"
-        elif self.lang == "it":
-            self.second_lang = "de"
-        elif self.lang == "en":
-            raise ValueError('The article is in English. Cannot analyse English text.')
-            #return
-        else:
-            raise ValueError('The detected language of the texts is neither German, nor Italian, and not even English. Cannot proceed.')
-        
-        self._main_lang_sentences = sentences_per_lang_hash[self.lang]
-        
-        #We add the sentences detected as English to the main language sentences
-        if 'en' in sentences_per_lang_hash:
-            self._main_lang_sentences.extend(sentences_per_lang_hash['en'])
-        
-        if self.second_lang in sentences_per_lang_hash:
-            self._second_lang_sentences = sentences_per_lang_hash[self.second_lang]
-    
-    def _distribute_sentences_per_language(self) -> None:
-        """
-        Creates 2 lists:
-            one containing sentences in the main language of the text (declared in the class constructor with the lang parameter)
-            the other containing sentences in the second language of the text
-        """
-        #Split sentences
-        sentences = split_multi(self.file_text)
-        
-        sentences_per_lang_hash = {}
-        number_sentences_per_lang_hash = {}
-        
-        #where_is_the_sentence = None
-        where_is_the_sentence = "BODY:"
-        
-        for sent in sentences:
-            if sent[0:6] == "TITLE:":
-                sent = sent[6:]
-                where_is_the_sentence = "TITLE:"
-            elif sent[0:7] == "TEASER:":
-                sent = sent[7:]
-                where_is_the_sentence = "TEASER:"
-            elif sent[0:5] == "BODY:":
-                sent = sent[5:]
-                where_is_the_sentence = "BODY:"
-                
-            for s in sent.split("\n"):
-                s = s.strip()
-                if len(s) > 0:
-                    try:
-                        lang = detect(s)
-                        if lang in sentences_per_lang_hash:
-                            sentences_per_lang_hash[lang].append([s,where_is_the_sentence])
-                            number_sentences_per_lang_hash[lang] += 1
-                        else:
-                            sentences_per_lang_hash[lang] = [[s,where_is_the_sentence]]
-                            number_sentences_per_lang_hash[lang] = 1
-                    except:
-                        print(str(sys.exc_info()[0])+" when trying to detect the language of "+s)
-                        pass
+        languages = article.detect_languages(self.language_detector, self.strict_language_detection)
+        for line, lang in zip(article.lines, languages):
+            if lang is None:
+                logging.warning("Could not detect the language of "+line[0])
+                continue
+            if lang in sentences_per_lang_hash:
+                sentences_per_lang_hash[lang].append(line)
+                number_sentences_per_lang_hash[lang] += 1
+            else:
+                sentences_per_lang_hash[lang] = [line]
+                number_sentences_per_lang_hash[lang] = 1
                         
         #Sort by number of sentences, find the main language
         sorted_number_sentences_per_lang_hash = sorted(number_sentences_per_lang_hash.items(), key=itemgetter(1), reverse=True)        
@@ -2848,7 +2880,6 @@ class KeywordExtractor():
             file_object = io.open(file_name, mode="r", encoding="utf-8")
             file_text = file_object.read()
             file_object.close()
-            file_text = self._strip_email_url(file_text)
             return file_text
         except Exception as e:
             logging.error(e)
@@ -2899,9 +2930,7 @@ class KeywordExtractor():
         >>> KeywordExtractor("de", "test", "21717.txt")._strip_email_url("ecco la mia email io-ho_33Anni@poste.paese e il mio sito:http://www.sito.kria")
         'ecco la mia email  e il mio sito:'
         """
-        file_text = re.sub(r"[\da-zA-Z\.\-\_]+@[\da-zA-Z\.\-\_]+", "", file_text) #Filter email address
-        file_text = re.sub(r"(https?:\/\/)?www\.[^ ]+", "", file_text) #Filter URL
-        return file_text
+        return strip_email_url(file_text)
 
     def _make_output_directory(self, folder: str) -> None:
         """
@@ -2921,6 +2950,7 @@ class KeywordExtractor():
         Finds all quoted text of the maximum length of 30 characters.
         If there are too many quoted strings (more than 3), in case of German takes nothing and in case of Italian chooses the strings that contain at least 1 capital letter.
         Returns a set of found strings.
+        Reads the text itself, not the Document, since the quotation marks are not always separate tokens.
         """
         between_quotes = re.findall("[\"“\«]([^ \,\-\.\?\!\:\;\"”\»][^\,\-\.\?\!\:\;\"”\»][^\"”\»]{,30}[^ \,\-\.\?\!\:\;\"”\»][^\,\-\.\?\!\:\;\"”\»]?)[\"”\»]",self.file_text, re.MULTILINE)
 
@@ -2964,15 +2994,144 @@ def make_output_directory(folder: str) -> None:
         logging.warning(e)          
 
           
+def rank_by_counts(counts: dict) -> list:
+    """
+    Ranks the keywords of the hash (key: keyword, value: its number of occurrences) from the most frequent to the least frequent; keywords of the same frequency in alphabetical order.
+    """
+    return sorted(counts, key=lambda keyword: (-counts[keyword], keyword))
+
+
+def open_result_cache(cache_file_name: str, max_entries: int = MAX_ENTRIES) -> ResultCache:
+    """
+    Opens the result cache (keyword_extractor_cache.py) of the given file, whose version is made of the versions of the lexicon files and of the extractor.
+    """
+    version = " ".join([EXTRACTOR_VERSION]+[file_version(file_name) for file_name in LEXICON_FILES])
+    return ResultCache(cache_file_name, version, max_entries)
+
+
+def _extract_with_cache(article_id: str, article: Article, create_key_word_extractor, compound_engine: str) -> dict:
+    """
+    Returns a hash with the main language of an article and the numbers of occurrences of its keywords (see KeywordExtractor.count_keywords()).
+    If the result cache is set and contains the result of the same text with the same settings, returns it without creating the extractor:
+    neither TreeTagger nor SMOR is run. Otherwise extracts the keywords with the extractor created by the given function out of the article (which is read only once),
+    and stores the result in the cache.
+    In incremental mode, the extraction reuses the tags and analyses of the previous version of the article of the given id (if any), and stores those of this version.
+    The result cache is then used only if the state of the article in the incremental store comes from the same text: otherwise the keywords are extracted,
+    so that the next version of the article finds the tags of this one.
+    """
+    cache = KeywordExtractor.result_cache
+    store = KeywordExtractor.incremental_store
+    article_state = store.get(article_id) if store is not None and article_id is not None else None
+    key = None
+    if cache is not None:
+        key = cache.key(article.text, compound_engine, str(KeywordExtractor.strict_language_detection))
+        if article_state is None or article_state.version == key:
+            result = cache.get(key)
+            if result is not None:
+                return result
+    key_word_extractor = create_key_word_extractor(article)
+    key_word_extractor.compound_engine = compound_engine
+    if article_state is not None:
+        key_word_extractor.article_state = article_state
+        article_state.start_version()
+    key_words_set = key_word_extractor.extract_keywords()
+    if article_state is not None:
+        article_state.end_version()
+        article_state.version = key
+        store.put(article_id, article_state)
+        logging.info("{}: {}".format(article_id, article_state))
+    result = {"language": key_word_extractor.lang, "counts": key_word_extractor.count_keywords(key_words_set)}
+    if cache is not None:
+        cache.put(key, result)
+    return result
+
+
+def extract_keywords_from_json(json: dict, output_folder_name: str, compound_engine: str = "smor") -> dict:
+    """
+    Extracts the keywords of an article given as a json (with the fields "Title", "Teaser" and "Body"), or takes them from the result cache.
+    Returns a hash with the main language of the article and its sorted keywords.
+    """
+    article_id = str(json["id"]) if "id" in json else None
+    article = Article.from_fields(json["Title"], json["Teaser"], json["Body"])
+    result = _extract_with_cache(article_id, article, lambda article: KeywordExtractor("json", json, output_folder_name, article=article), compound_engine)
+    return {"language": result["language"], "keywords": sorted(result["counts"])}
+
+
+def extract_keywords_from_file(input_file_path: str, output_folder_name: str, sink: KeywordFileSink, compound_engine: str = "smor", input_root_folder: str = None) -> None:
+    """
+    Extracts the keywords of the article of a file (or takes them from the result cache) and writes them to the output (by default its '.KEY' file in the output folder),
+    the id of the article being the path of the file relative to the given input folder (by default the folder of the file: the id is the name of the file).
+    """
+    input_file_folder = input_root_folder if input_root_folder is not None else os.path.dirname(input_file_path)
+    input_file_name = article_id(input_file_path, input_file_folder)
+    with io.open(input_file_path, mode="r", encoding="utf-8") as input_file:
+        article = Article.from_text(input_file.read())
+    result = _extract_with_cache(input_file_name, article, lambda article: KeywordExtractor(input_file_folder, input_file_name, output_folder_name, article=article), compound_engine)
+    sink.write(input_file_name, result["language"], rank_by_counts(result["counts"]), result["counts"])
+
+
+def batch_main(inputs: list, output_folder_name: str, compound_engine: str, manifest_file_name: str, sink: KeywordFileSink) -> None:
+    """
+    Batch mode: extracts the keywords of all the files of the inputs (files, directories and glob patterns, see keyword_extractor_batch.py).
+    The TreeTagger analysers and the lexicons are loaded once, for all the files. The files done in a previous run with the same manifest are skipped if they have not changed.
+    Prints the throughput statistics at the end.
+    """
+    paths = [path for path in expand_inputs(inputs) if not path.startswith(output_folder_name+os.sep)] #Not the outputs of a previous run
+    root_folder = input_root(inputs) #The ids of the articles are the paths of their files relative to it, so that files of the same name in different folders do not overwrite each other's keywords
+    statistics = run_batch(paths, manifest_file_name, lambda path: extract_keywords_from_file(path, output_folder_name, sink, compound_engine, root_folder), sink)
+    print(statistics)
+    if KeywordExtractor.result_cache is not None:
+        print(KeywordExtractor.result_cache)
+
+
+def stream_main(output_folder_name: str, compound_engine: str) -> None:
+    """
+    Streaming mode: extracts the keywords of the articles read as JSON lines from the standard input and writes the results to the standard output (see keyword_extractor_stream.py).
+    The TreeTagger analysers and the lexicons are loaded once, for the whole stream. The log is written to the standard error, and ends with the number of articles processed and of errors.
+    The temporary files are written in the given folder, or in a temporary folder if none is given.
+    """
+    logging.basicConfig(level=logging.WARNING)
+    with tempfile.TemporaryDirectory() as temporary_folder_name:
+        if output_folder_name is None:
+            output_folder_name = temporary_folder_name
+        else:
+            output_folder_name = os.path.abspath(output_folder_name)
+            make_output_directory(output_folder_name)
+        input_stream = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8")
+        output_stream = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
+        number_of_articles, number_of_errors = stream_jsonl(input_stream, output_stream, lambda json: extract_keywords_from_json(json, output_folder_name, compound_engine))
+        logging.warning("{} articles processed, {} errors".format(number_of_articles, number_of_errors)) #At the level of the log, so that the summary is shown
+
+
 def main():
     parser = argparse.ArgumentParser(description='''This script extracts keywords from a file containing text.''')
-    parser.add_argument('-i', metavar='file_to_find_keywords_in', help='name of the file containing the text to extract keywords from', required=True)
-    parser.add_argument('-o', metavar='output_directory', help='name of the folder that will contain the file with keywords', required=True)
+    parser.add_argument('-i', metavar='file_to_find_keywords_in', nargs='+', help='name of the file containing the text to extract keywords from, or directories and glob patterns of files (batch mode)')
+    parser.add_argument('-o', metavar='output_directory', help='name of the folder that will contain the file with keywords')
+    parser.add_argument('-c', metavar='compound_engine', choices=['smor', 'splitter'], default='smor', help='the engine that splits German compounds: smor (default) or splitter')
+    parser.add_argument('-s', action='store_true', help='detect the language of each sentence separately, even in articles written in a single language')
+    parser.add_argument('-j', action='store_true', help='streaming mode: read articles as JSON lines from the standard input and write one JSON line of keywords per article to the standard output')
+    parser.add_argument('-f', metavar='output_format', choices=SINK_FORMATS, default='key', help='the output of the keywords: key (default, a .KEY file per article), or a single file keywords.jsonl, keywords.tsv or keywords.sqlite')
+    parser.add_argument('-t', metavar='batch_size', type=int, default=BATCH_SIZE, help='the number of articles written at once to a jsonl, tsv or sqlite output (a transaction for sqlite)')
+    parser.add_argument('-m', metavar='manifest', help='batch mode: the manifest of the processed files, used to resume an interrupted run (manifest.jsonl in the output folder by default)')
+    parser.add_argument('-r', metavar='result_cache', help='batch and streaming modes: a SQLite file keeping the keywords of the articles processed, which are not processed again if they are sent again unchanged')
+    parser.add_argument('-u', metavar='incremental_store', help='batch and streaming modes: a SQLite file keeping the tags of the sentences of each article, so that only the new sentences of its next versions are tagged')
+    parser.add_argument('-x', metavar='inverted_index', help='batch mode: also add the keywords of each article to an inverted index (a SQLite file), which gives the articles of a keyword')
     
     args = vars(parser.parse_args())
+    KeywordExtractor.strict_language_detection = args['s']
+    if args['r'] is not None:
+        KeywordExtractor.result_cache = open_result_cache(args['r'])
+    if args['u'] is not None:
+        KeywordExtractor.incremental_store = IncrementalStore(args['u'])
+    
+    if args['j']:
+        stream_main(args['o'], args['c'])
+        return
+    if args['i'] is None or args['o'] is None:
+        parser.error('the arguments -i and -o are required, except in streaming mode (-j)')
     
     script_folder, script_name = os.path.split(os.path.abspath(__file__))
-    input_file_folder, input_file_name = os.path.split(os.path.abspath(args['i']))
+    input_file_folder, input_file_name = os.path.split(os.path.abspath(args['i'][0]))
     output_folder_name = os.path.abspath(args['o'])
     
     #Make the output directory
@@ -2981,6 +3140,15 @@ def main():
     logFile = os.path.join(output_folder_name, script_name+".log")
     logging.basicConfig(filename=logFile, level=logging.WARNING)
     
+    if is_batch_input(args['i']):
+        manifest_file_name = args['m'] if args['m'] is not None else os.path.join(output_folder_name, "manifest.jsonl")
+        sink = open_sink(args['f'], output_folder_name, args['t'])
+        if args['x'] is not None:
+            sink = SinkGroup([sink, InvertedIndex(args['x'], args['t'])])
+        with sink:
+            batch_main(args['i'], output_folder_name, args['c'], manifest_file_name, sink)
+        return
+    
     # A json for test 
     json={'Title': 'DFB Trainingslager: Um Aufklärung bemüht',
 
@@ -2993,18 +3161,14 @@ def main():
         #Initialise the module
         #key_word_extractor = KeywordExtractor( input_file_folder, input_file_name, output_folder_name) # initialises the module to read an article from a file
         key_word_extractor = KeywordExtractor( "json", json, output_folder_name) # initialises the module to read an article from a json
+        key_word_extractor.compound_engine = args['c']
         
         #Extract the keywords
         key_words_set = key_word_extractor.extract_keywords() # key_words_set contains the set of keywords extracted from the article
         
         #Print the keywords to a file
-        keywordsFileName = os.path.join(output_folder_name, input_file_name+".KEY")
-        keywordsFile = io.open(keywordsFileName, mode="w", encoding="utf-8")
-        
-        for keyword in key_words_set:
-            keywordsFile.write(keyword+"\n")
-            
-        keywordsFile.close()
+        with open_sink(args['f'], output_folder_name, args['t']) as sink:
+            sink.write(input_file_name, key_word_extractor.lang, key_word_extractor.rank_keywords(key_words_set))
     
     except ValueError as err:
         logging.error(err)
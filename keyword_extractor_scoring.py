@@ -0,0 +1,143 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Selection of the keyword candidates of the KeywordExtractor (keyword_extractor_salto.py) by their scores.
+The scores of the candidates are held in a NumPy array aligned with the table of the candidates,
+so that means and thresholds are computed on the whole array at once.
+"""
+
+import numpy
+
+
+class CandidateScores():
+    """
+    Table of keyword candidates and the array of their scores: the score of self.candidates[i] is self.scores[i].
+    """
+
+    def __init__(self, candidates: list, scores) -> None:
+        self.candidates = candidates
+        self.scores = numpy.asarray(scores, dtype=numpy.float64)
+
+
+    @classmethod
+    def from_hash(cls, scores_hash: dict) -> "CandidateScores":
+        """
+        Builds the table from a hash: key: candidate, value: its score.
+        """
+        return cls(list(scores_hash), numpy.fromiter(scores_hash.values(), dtype=numpy.float64, count=len(scores_hash)))
+
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+
+    def sorted_order(self) -> numpy.ndarray:
+        """
+        Returns the ids of the candidates from the highest score to the lowest.
+        Candidates with the same score come in the reverse order of the table, as when a list of candidates is sorted by score and then reversed.
+        """
+        return numpy.argsort(self.scores, kind="stable")[::-1]
+
+
+    def mean(self) -> float:
+        """
+        Returns the mean of the scores.
+        """
+        return float(self.scores.sum())/len(self.scores)
+
+
+    def select(self, mask: numpy.ndarray) -> "CandidateScores":
+        """
+        Returns a new table with the candidates selected by the boolean mask, from the highest score to the lowest.
+        """
+        order = self.sorted_order()
+        order = order[mask[order]]
+        return CandidateScores([self.candidates[i] for i in order], self.scores[order])
+
+
+    def to_hash(self) -> dict:
+        """
+        Returns a hash: key: candidate, value: its score.
+        """
+        return dict(zip(self.candidates, self.scores.tolist()))
+
+
+def select_above_mean(scores_hash: dict, skip_digits: bool = False) -> dict:
+    """
+    Returns the candidates whose score is greater than the mean of the scores, from the highest score to the lowest.
+    If skip_digits is True, candidates made of digits are not taken.
+    """
+    if len(scores_hash) == 0:
+        return {}
+    candidate_scores = CandidateScores.from_hash(scores_hash)
+    mask = candidate_scores.scores > candidate_scores.mean()
+    if skip_digits:
+        mask &= numpy.fromiter((not candidate.isdigit() for candidate in candidate_scores.candidates), dtype=bool, count=len(candidate_scores))
+    return {candidate: scores_hash[candidate] for candidate in candidate_scores.select(mask).candidates}
+
+
+def reduce_to_above_mean(scores_hash: dict, max_number: int) -> None:
+    """
+    While the hash contains more than max_number candidates, only keeps those whose score is greater than the mean of the scores.
+    The candidates left are ordered from the highest score to the lowest, candidates with the same score in the order
+    they get after sorting and reversing the hash once per round.
+    The candidates kept after each round are always the best ones, so the rounds are done in a single pass:
+    only the candidates above the first mean are sorted, and the mean of each round is read from the prefix sums of their scores.
+    """
+    if len(scores_hash) <= max_number:
+        return
+    candidate_scores = CandidateScores.from_hash(scores_hash)
+    scores = candidate_scores.scores
+
+    survivors = numpy.flatnonzero(scores > candidate_scores.mean())
+    rounds = 1
+    order = survivors[numpy.argsort(-scores[survivors], kind="stable")]
+    negative_sorted_scores = -scores[order]
+    prefix_sums = numpy.cumsum(scores[order])
+    number = len(order)
+    while number > max_number:
+        mean = float(prefix_sums[number-1])/number
+        number = int(numpy.searchsorted(negative_sorted_scores[:number], -mean, side="left")) #The number of scores greater than the mean
+        rounds += 1
+
+    kept = numpy.sort(order[:number])
+    if rounds % 2 == 1:
+        kept = kept[numpy.argsort(scores[kept], kind="stable")[::-1]]
+    else:
+        kept = kept[numpy.argsort(-scores[kept], kind="stable")]
+    scores_to_keep = {candidate_scores.candidates[i]: scores_hash[candidate_scores.candidates[i]] for i in kept}
+    scores_hash.clear()
+    scores_hash.update(scores_to_keep)
+
+
+def find_mean(sorted_values) -> float:
+    """
+    Finds the score above which keywords should be taken and below which they should be left out.
+    The values are sorted from the highest to the lowest. Takes the values not smaller than their mean
+    (greater than the mean if they are all equal), and while more than 5 values are taken, does the same with the values taken.
+    """
+    values = numpy.asarray(sorted_values, dtype=numpy.float64)
+    while True:
+        mean = float(values.sum())/len(values)
+        if mean > values[-1]:
+            values = values[values >= mean]
+        else:
+            values = values[values > mean]
+        if len(values) <= 5:
+            return mean
+
+
+def select_by_mean(scores_hash: dict) -> list:
+    """
+    Returns the candidates whose score is not smaller than the value found by find_mean
+    (greater than it, if it is the smallest score), from the highest score to the lowest.
+    """
+    if len(scores_hash) == 0:
+        return []
+    candidate_scores = CandidateScores.from_hash(scores_hash)
+    mean = find_mean(numpy.sort(candidate_scores.scores)[::-1])
+    if mean > candidate_scores.scores.min():
+        mask = candidate_scores.scores >= mean
+    else:
+        mask = candidate_scores.scores > mean
+    return candidate_scores.select(mask).candidates
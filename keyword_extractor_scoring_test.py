@@ -0,0 +1,83 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Unit tests for testing keyword_extractor_scoring.py
+"""
+
+import os
+import re
+import unittest
+from keyword_extractor_scoring import CandidateScores, find_mean, reduce_to_above_mean, select_above_mean, select_by_mean
+
+
+def reduce_iteratively(scores_hash: dict, max_number: int) -> None:
+    """
+    The way the candidates used to be reduced: sort, compute the mean and keep the candidates above it, until max_number are left.
+    """
+    while len(scores_hash) > max_number:
+        sorted_scores = sorted(scores_hash.items(), key=lambda item: item[1])
+        sorted_scores.reverse()
+        mean = sum(score for _, score in sorted_scores)/len(sorted_scores)
+        scores_hash.clear()
+        scores_hash.update((candidate, score) for candidate, score in sorted_scores if score > mean)
+
+
+def count_words(file_path: str) -> dict:
+    """
+    Counts the words of an article, with the weights of the title (2), the teaser (1.5) and the body (1).
+    """
+    scores_hash = {}
+    weight = 1
+    with open(file_path, encoding="utf-8") as article:
+        for line in article:
+            for part, part_weight in (("TITLE:", 2), ("TEASER:", 1.5), ("BODY:", 1)):
+                if line.startswith(part):
+                    weight = part_weight
+            for word in re.findall(r"\w{3,}", line):
+                scores_hash[word] = scores_hash.get(word, 0)+weight
+    return scores_hash
+
+
+class KeywordExtractorScoringTest(unittest.TestCase):
+
+    def test_sorted_order(self):
+        candidate_scores = CandidateScores.from_hash({'Haus': 1.0, 'Bozen': 3.0, 'Land': 1.0, 'Rat': 2.0})
+        self.assertEqual([candidate_scores.candidates[i] for i in candidate_scores.sorted_order()], ['Bozen', 'Rat', 'Land', 'Haus'])
+
+    def test_select_above_mean(self):
+        selected = select_above_mean({'Haus': 1.0, 'Bozen': 3.0, '2014': 4.0, 'Rat': 2.0, 'Land': 1.0}, skip_digits=True)
+        self.assertEqual(list(selected.items()), [('Bozen', 3.0)])
+        self.assertEqual(select_above_mean({'Haus': 1.0, 'Bozen': 1.0}), {})
+
+    def test_reduce_to_above_mean(self):
+        scores_hash = {'w'+str(i): float(i) for i in range(20)}
+        reduce_to_above_mean(scores_hash, 10)
+        self.assertEqual(list(scores_hash), ['w19', 'w18', 'w17', 'w16', 'w15', 'w14', 'w13', 'w12', 'w11', 'w10'])
+        scores_hash = {'w'+str(i): 1.0 for i in range(20)}
+        reduce_to_above_mean(scores_hash, 10)
+        self.assertEqual(scores_hash, {})
+
+    def test_reduce_to_above_mean_on_test_files(self):
+        """
+        The single pass reduction must keep the same candidates in the same order as the iterative one, on the words of every test article.
+        """
+        test_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test")
+        for file_name in sorted(os.listdir(test_folder)):
+            scores_hash = count_words(os.path.join(test_folder, file_name))
+            expected = dict(scores_hash)
+            reduce_iteratively(expected, 10)
+            reduce_to_above_mean(scores_hash, 10)
+            self.assertEqual(list(scores_hash.items()), list(expected.items()), file_name)
+
+    def test_find_mean(self):
+        self.assertEqual(find_mean([6.0, 4.0, 2.0]), 4.0)
+        self.assertEqual(find_mean([10.0, 9.0, 8.0, 7.0, 6.0, 5.0, 1.0, 1.0]), 5.875)
+        self.assertEqual(find_mean([10.0, 10.0, 10.0, 10.0, 10.0, 10.0, 1.0, 1.0]), 10.0)
+
+    def test_select_by_mean(self):
+        self.assertEqual(select_by_mean({'Kompatscher': 6.0, 'Bozen': 4.0, 'SVP': 2.0}), ['Kompatscher', 'Bozen'])
+        self.assertEqual(select_by_mean({'Kompatscher': 2.0, 'Bozen': 2.0}), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,183 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Outputs of the keywords extracted by the KeywordExtractor (keyword_extractor_salto.py) in the command line and batch modes.
+By default the keywords of each article are written to a '.KEY' file of their own. For bulk runs, the keywords of all the articles
+can be appended to a single file instead: JSON lines, TSV, or a SQLite table (article id, keyword, rank, language).
+These outputs keep the articles in memory and write them by batches (a transaction per batch for SQLite).
+"""
+
+import io, json, os, sqlite3
+
+
+SINK_FORMATS = ("key", "jsonl", "tsv", "sqlite")
+BATCH_SIZE = 1000 #The default number of articles written at once
+
+
+class KeywordFileSink():
+    """
+    Writes the keywords of each article to a text file named after the article, with the extension '.KEY' added at the end, 1 keyword per line.
+    """
+
+    number_of_pending_articles = 0 #The articles are written at once
+
+    def __init__(self, output_folder_name: str) -> None:
+        self.output_folder_name = output_folder_name
+
+
+    def write(self, article_id: str, language: str, keywords: list, counts: dict = None) -> None:
+        """
+        Writes the keywords of an article, ranked from the most important.
+        The numbers of occurrences of the keywords in the article (a hash), if given, are used only by the inverted index (keyword_extractor_inverted_index.py).
+        An article id with folders in it (in batch mode, the path of the file relative to the inputs) gives the same folders in the output folder.
+        """
+        keywords_file_name = os.path.join(self.output_folder_name, article_id+".KEY")
+        os.makedirs(os.path.dirname(keywords_file_name), exist_ok=True)
+        keywordsFile = io.open(keywords_file_name, mode="w", encoding="utf-8")
+        for keyword in keywords:
+            keywordsFile.write(keyword+"\n")
+        keywordsFile.close()
+
+
+    def flush(self) -> None:
+        """
+        Writes the articles kept in memory.
+        """
+        pass
+
+
+    def close(self) -> None:
+        """
+        Writes the articles kept in memory and closes the output.
+        """
+        pass
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class _BufferedSink(KeywordFileSink):
+    """
+    Keeps the articles in memory and writes them by batches of the given size.
+    """
+
+    def __init__(self, file_name: str, batch_size: int = BATCH_SIZE) -> None:
+        self.file_name = file_name
+        self.batch_size = batch_size
+        self._pending = [] #Tuples (article id, language, keywords) not written yet
+
+
+    @property
+    def number_of_pending_articles(self) -> int:
+        return len(self._pending)
+
+
+    def write(self, article_id: str, language: str, keywords: list, counts: dict = None) -> None:
+        self._pending.append((article_id, language, keywords))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+
+    def flush(self) -> None:
+        if self._pending:
+            self._write_batch(self._pending)
+            self._pending = []
+
+
+    def _write_batch(self, articles: list) -> None:
+        raise NotImplementedError
+
+
+    def close(self) -> None:
+        self.flush()
+
+
+class JsonlSink(_BufferedSink):
+    """
+    Appends a JSON line per article to a file: {"id": ..., "language": ..., "keywords": [...]}
+    """
+
+    def _write_batch(self, articles: list) -> None:
+        with io.open(self.file_name, mode="a", encoding="utf-8") as output_file:
+            output_file.write("".join(json.dumps({"id": article_id, "language": language, "keywords": keywords}, ensure_ascii=False)+"\n" for article_id, language, keywords in articles))
+
+
+class TsvSink(_BufferedSink):
+    """
+    Appends a line per keyword to a file: article id \t keyword \t rank \t language
+    """
+
+    def _write_batch(self, articles: list) -> None:
+        with io.open(self.file_name, mode="a", encoding="utf-8") as output_file:
+            output_file.write("".join("{}\t{}\t{}\t{}\n".format(article_id, keyword, rank, language) for article_id, language, keywords in articles for rank, keyword in enumerate(keywords, 1)))
+
+
+class SqliteSink(_BufferedSink):
+    """
+    Writes a row per keyword to the table keywords (article_id, keyword, rank, language) of a SQLite database, in a transaction per batch.
+    The rows of an article written again (ex: a changed file in a new batch run) replace its previous rows.
+    """
+
+    def __init__(self, file_name: str, batch_size: int = BATCH_SIZE) -> None:
+        super().__init__(file_name, batch_size)
+        self.connection = sqlite3.connect(file_name)
+        with self.connection:
+            self.connection.execute("CREATE TABLE IF NOT EXISTS keywords (article_id TEXT, keyword TEXT, rank INTEGER, language TEXT)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS keywords_article_id ON keywords (article_id)")
+
+
+    def _write_batch(self, articles: list) -> None:
+        with self.connection:
+            self.connection.executemany("DELETE FROM keywords WHERE article_id = ?", [(article_id,) for article_id, _, _ in articles])
+            self.connection.executemany("INSERT INTO keywords VALUES (?, ?, ?, ?)", [(article_id, keyword, rank, language) for article_id, language, keywords in articles for rank, keyword in enumerate(keywords, 1)])
+
+
+    def close(self) -> None:
+        self.flush()
+        self.connection.close()
+
+
+class SinkGroup(KeywordFileSink):
+    """
+    Writes the keywords of each article to several outputs (ex: the keywords file and the inverted index).
+    """
+
+    def __init__(self, sinks: list) -> None:
+        self.sinks = sinks
+
+
+    @property
+    def number_of_pending_articles(self) -> int:
+        return max(sink.number_of_pending_articles for sink in self.sinks)
+
+
+    def write(self, article_id: str, language: str, keywords: list, counts: dict = None) -> None:
+        for sink in self.sinks:
+            sink.write(article_id, language, keywords, counts)
+
+
+    def flush(self) -> None:
+        for sink in self.sinks:
+            sink.flush()
+
+
+    def close(self) -> None:
+        for sink in self.sinks:
+            sink.close()
+
+
+def open_sink(sink_format: str, output_folder_name: str, batch_size: int = BATCH_SIZE) -> KeywordFileSink:
+    """
+    Opens the output of the given format in the output folder: '.KEY' files, or the file keywords.jsonl, keywords.tsv or keywords.sqlite.
+    """
+    if sink_format == "key":
+        return KeywordFileSink(output_folder_name)
+    sinks = {"jsonl": JsonlSink, "tsv": TsvSink, "sqlite": SqliteSink}
+    if sink_format not in sinks:
+        raise ValueError("Unknown output format {}: it should be one of {}".format(sink_format, ", ".join(SINK_FORMATS)))
+    return sinks[sink_format](os.path.join(output_folder_name, "keywords."+sink_format), batch_size)
@@ -0,0 +1,77 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Unit tests for testing keyword_extractor_sinks.py
+"""
+
+import io
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+from keyword_extractor_batch import read_manifest, run_batch
+from keyword_extractor_sinks import open_sink
+
+
+ARTICLES = [('21717.txt', 'de', ['Landtag', 'SVP']), ('1008-it.txt', 'it', ['Casa Basaglia', 'Toresini', 'Sinigo'])]
+
+
+class KeywordExtractorSinksTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def write_articles(self, sink_format, batch_size=1000):
+        with open_sink(sink_format, self.folder.name, batch_size) as sink:
+            for article in ARTICLES:
+                sink.write(*article)
+
+    def test_key_files(self):
+        self.write_articles('key')
+        with io.open(os.path.join(self.folder.name, '21717.txt.KEY'), encoding='utf-8') as key_file:
+            self.assertEqual(key_file.read(), 'Landtag\nSVP\n')
+        with open_sink('key', self.folder.name) as sink: #An article of a subfolder of the inputs
+            sink.write(os.path.join('2019', '21717.txt'), 'de', ['Bozen'])
+        with io.open(os.path.join(self.folder.name, '2019', '21717.txt.KEY'), encoding='utf-8') as key_file:
+            self.assertEqual(key_file.read(), 'Bozen\n')
+
+    def test_jsonl_and_tsv(self):
+        self.write_articles('jsonl', 1)
+        self.write_articles('jsonl') #Appended
+        with io.open(os.path.join(self.folder.name, 'keywords.jsonl'), encoding='utf-8') as output_file:
+            results = [json.loads(line) for line in output_file]
+        self.assertEqual(len(results), 4)
+        self.assertEqual(results[1], {'id': '1008-it.txt', 'language': 'it', 'keywords': ['Casa Basaglia', 'Toresini', 'Sinigo']})
+        self.write_articles('tsv')
+        with io.open(os.path.join(self.folder.name, 'keywords.tsv'), encoding='utf-8') as output_file:
+            self.assertEqual(output_file.read().splitlines()[:3], ['21717.txt\tLandtag\t1\tde', '21717.txt\tSVP\t2\tde', '1008-it.txt\tCasa Basaglia\t1\tit'])
+
+    def test_sqlite(self):
+        self.write_articles('sqlite', 1)
+        self.write_articles('sqlite') #The rows of the articles are replaced
+        connection = sqlite3.connect(os.path.join(self.folder.name, 'keywords.sqlite'))
+        rows = connection.execute('SELECT article_id, keyword, rank, language FROM keywords ORDER BY article_id, rank').fetchall()
+        connection.close()
+        self.assertEqual(rows, [('1008-it.txt', 'Casa Basaglia', 1, 'it'), ('1008-it.txt', 'Toresini', 2, 'it'), ('1008-it.txt', 'Sinigo', 3, 'it'),
+                                ('21717.txt', 'Landtag', 1, 'de'), ('21717.txt', 'SVP', 2, 'de')])
+
+    def test_batch_manifest_waits_for_the_sink(self):
+        paths = []
+        for file_name in ('a.txt', 'b.txt', 'c.txt'):
+            paths.append(os.path.join(self.folder.name, file_name))
+            io.open(paths[-1], mode='w').close()
+        manifest_file_name = os.path.join(self.folder.name, 'manifest.jsonl')
+        with open_sink('jsonl', self.folder.name, 2) as sink:
+            def extract(path):
+                sink.write(os.path.basename(path), 'de', [])
+                self.assertEqual(len(read_manifest(manifest_file_name)), {'b.txt': 0, 'c.txt': 2}.get(os.path.basename(path), 0))
+            run_batch(paths, manifest_file_name, extract, sink)
+        self.assertEqual(len(read_manifest(manifest_file_name)), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
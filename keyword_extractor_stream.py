@@ -0,0 +1,74 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Streaming mode of the KeywordExtractor (keyword_extractor_salto.py): reads articles as JSON lines (with the fields "Title", "Teaser", "Body" and optionally "id")
+and writes one JSON line per article with its keywords, or with the error that prevented their extraction.
+The articles are processed one at a time, in the order of the input: a line is read only when the result of the previous one has been written and flushed,
+so that a slow reader of the output slows down the reading of the input (backpressure), and the memory used does not depend on the length of the stream.
+Lines longer than the maximum length are not loaded: they are skipped and reported as errors.
+"""
+
+import json
+
+
+MAX_LINE_LENGTH = 1 << 22 #4 MB: the maximum length of an input line (an article)
+
+
+def read_lines(input_stream, max_line_length: int = MAX_LINE_LENGTH):
+    """
+    Yields the lines of the input stream without their line break, and None instead of the lines that are longer than the maximum length.
+    """
+    while True:
+        line = input_stream.readline(max_line_length+1)
+        if len(line) == 0:
+            return
+        if len(line) > max_line_length and not line.endswith("\n"):
+            #Skips the rest of the line, without keeping it
+            while len(line) > 0 and not line.endswith("\n"):
+                line = input_stream.readline(max_line_length)
+            yield None
+            continue
+        yield line.rstrip("\r\n")
+
+
+def process_line(line: str, extract) -> dict:
+    """
+    Extracts the keywords of the article of a JSON line with the given function, that takes the article (a hash) and returns the fields of the result.
+    Returns the result: the id of the article (if any), and the fields of the result or an error.
+    """
+    result = {}
+    try:
+        article = json.loads(line)
+        if not isinstance(article, dict):
+            raise ValueError("The line is not a JSON object")
+        if "id" in article:
+            result["id"] = article["id"]
+        for field in ("Title", "Teaser", "Body"):
+            if not isinstance(article.get(field), str):
+                raise ValueError("The field {} is missing".format(field))
+        result.update(extract(article))
+    except Exception as error:
+        result["error"] = "{}: {}".format(type(error).__name__, error)
+    return result
+
+
+def stream_jsonl(input_stream, output_stream, extract, max_line_length: int = MAX_LINE_LENGTH) -> tuple:
+    """
+    Extracts the keywords of the articles of the input stream, one JSON line per article, and writes the results to the output stream, one JSON line per article.
+    Empty lines are skipped. Returns the number of articles processed and the number of errors.
+    """
+    number_of_articles = 0
+    number_of_errors = 0
+    for line in read_lines(input_stream, max_line_length):
+        if line is None:
+            result = {"error": "The line is longer than {} characters".format(max_line_length)}
+        elif len(line.strip()) == 0:
+            continue
+        else:
+            result = process_line(line, extract)
+        number_of_articles += 1
+        if "error" in result:
+            number_of_errors += 1
+        output_stream.write(json.dumps(result, ensure_ascii=False)+"\n")
+        output_stream.flush()
+    return number_of_articles, number_of_errors
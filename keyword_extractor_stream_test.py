@@ -0,0 +1,43 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Unit tests for testing keyword_extractor_stream.py
+"""
+
+import io
+import json
+import unittest
+from keyword_extractor_stream import read_lines, stream_jsonl
+
+
+def extract(article):
+    if article['Title'] == 'English':
+        raise ValueError('The article is in English. Cannot analyse English text.')
+    return {'language': 'de', 'keywords': sorted(set(article['Title'].split()))}
+
+
+class KeywordExtractorStreamTest(unittest.TestCase):
+
+    def test_stream_jsonl(self):
+        lines = [json.dumps({'id': 1, 'Title': 'Landtag Bozen', 'Teaser': '', 'Body': ''}),
+                 '',
+                 json.dumps({'id': 'b', 'Title': 'English', 'Teaser': '', 'Body': ''}),
+                 json.dumps({'id': 3, 'Title': 'Landtag'}),
+                 '{"id": 4, "Title": ',
+                 json.dumps({'Title': 'Süddeutsche Zeitung', 'Teaser': '', 'Body': ''}, ensure_ascii=False)]
+        output_stream = io.StringIO()
+        self.assertEqual(stream_jsonl(io.StringIO('\n'.join(lines) + '\n'), output_stream, extract), (5, 3))
+        results = [json.loads(line) for line in output_stream.getvalue().splitlines()]
+        self.assertEqual(results[0], {'id': 1, 'language': 'de', 'keywords': ['Bozen', 'Landtag']})
+        self.assertEqual(results[1], {'id': 'b', 'error': 'ValueError: The article is in English. Cannot analyse English text.'})
+        self.assertEqual(results[2], {'id': 3, 'error': 'ValueError: The field Teaser is missing'})
+        self.assertEqual(results[3]['error'].split(':')[0], 'JSONDecodeError')
+        self.assertEqual(results[4], {'language': 'de', 'keywords': ['Süddeutsche', 'Zeitung']})
+
+    def test_read_lines_skips_long_lines(self):
+        input_stream = io.StringIO('short\n' + 'x' * 25 + '\nlast')
+        self.assertEqual(list(read_lines(input_stream, 10)), ['short', None, 'last'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,7 +9,45 @@ Unit tests for testing keyword_extractor_salto.py
 import os
 import shutil
 import unittest
-from keyword_extractor_salto import KeywordExtractor
+from keyword_extractor_incremental import IncrementalStore
+from keyword_extractor_ingestion import Article
+from keyword_extractor_salto import KeywordExtractor, _extract_with_cache, open_result_cache
+
+
+class FakeTagger():
+    """
+    Tags each word as a noun, and records the texts it tags.
+    """
+
+    def __init__(self):
+        self.lang = 'de'
+        self.tagged_texts = []
+
+    def tag_text(self, text):
+        self.tagged_texts.append(text)
+        return ['{}\tNN\t{}'.format(word, word) for word in text.split()]
+
+
+class FakeKeywordExtractor():
+    """
+    Tags the lines of the article with the tagger (through the state of the article in incremental mode) and takes all their words as keywords.
+    """
+
+    def __init__(self, article, tagger):
+        self.article = article
+        self.tagger = tagger
+        self.article_state = None
+        self.lang = 'de'
+
+    def extract_keywords(self):
+        key_words_set = set()
+        for line, section in self.article.lines:
+            tags = self.article_state.tag(self.tagger, line) if self.article_state is not None else self.tagger.tag_text(line)
+            key_words_set.update(tag.split('\t')[0] for tag in tags)
+        return key_words_set
+
+    def count_keywords(self, key_words_set):
+        return {keyword: 1 for keyword in key_words_set}
 
 
 class KeywordExtractorTest(unittest.TestCase):
@@ -33,6 +71,35 @@ class KeywordExtractorTest(unittest.TestCase):
             raise Exception('Could not create folder {} due to the following exception: '.format(folder) + repr(e))
         
     
+    def test_result_cache_and_incremental_store(self):
+        """
+        With both the result cache and the incremental store, the state of an article found in the cache is stored too,
+        so that its next version only tags its new lines.
+        """
+        tagger = FakeTagger()
+        create_key_word_extractor = lambda article: FakeKeywordExtractor(article, tagger)
+        first_version = Article.from_fields('Landtag tagt', 'Die SVP stimmt zu.', 'Kompatscher antwortet.')
+        second_version = Article.from_fields('Landtag tagt', 'Die SVP stimmt zu.', 'Kompatscher antwortet nicht.')
+        KeywordExtractor.result_cache = open_result_cache(os.path.join(self.output_folder, 'cache.sqlite'))
+        try:
+            _extract_with_cache('21717.txt', first_version, create_key_word_extractor, 'smor') #Only in the result cache
+            KeywordExtractor.incremental_store = IncrementalStore(os.path.join(self.output_folder, 'incremental.sqlite'))
+            tagger.tagged_texts = []
+            result = _extract_with_cache('21717.txt', first_version, create_key_word_extractor, 'smor')
+            self.assertEqual(len(tagger.tagged_texts), 3) #The cache has the result, but the store has no state of the article yet
+            self.assertEqual(_extract_with_cache('21717.txt', first_version, create_key_word_extractor, 'smor'), result)
+            self.assertEqual(len(tagger.tagged_texts), 3) #Found in the cache
+            self.assertEqual(KeywordExtractor.result_cache.number_of_hits, 1)
+            tagger.tagged_texts = []
+            _extract_with_cache('21717.txt', second_version, create_key_word_extractor, 'smor')
+            self.assertEqual(tagger.tagged_texts, ['Kompatscher antwortet nicht.']) #Only the new line
+        finally:
+            KeywordExtractor.result_cache.close()
+            KeywordExtractor.result_cache = None
+            if KeywordExtractor.incremental_store is not None:
+                KeywordExtractor.incremental_store.close()
+                KeywordExtractor.incremental_store = None
+
     def test_strip_email_url(self):
         """
         Tests the class method of the KeywordExtractor _strip_email_url.
@@ -114,7 +181,75 @@ class KeywordExtractorTest(unittest.TestCase):
         kw_extractor = KeywordExtractor(os.path.join(self.script_folder,"test"), "small-mixed.txt", self.output_folder)
         self.assertEqual(kw_extractor._detect_german_in_italian('Bernardo Magnagi dice spesso: Gesundheit und Danke.'), "de")
         self.assertEqual(kw_extractor._detect_german_in_italian('Heinrich Hund dice spesso: mio dio!'), "it")
-   
+
+    def test_if_proper_noun_preceded_by_name(self):
+        kw_extractor = KeywordExtractor(os.path.join(self.script_folder,"test"), "small-mixed.txt", self.output_folder)
+        kw_extractor.proper_nouns_hash = {'Rosberg': 2.0, 'Passeiertal': 1.0}
+        self.assertEqual(kw_extractor._if_proper_noun_preceded_by_name('Rosberg'), 'Rosberg') #Off by default
+        self.assertEqual(kw_extractor.persons_set, set())
+        kw_extractor.join_preceding_first_names = True
+        self.assertEqual(kw_extractor._if_proper_noun_preceded_by_name('Rosberg'), 'Nico Rosberg')
+        self.assertEqual(kw_extractor._if_proper_noun_preceded_by_name('Passeiertal'), 'Passeiertal')
+        self.assertEqual(kw_extractor.proper_nouns_hash['Nico Rosberg'], 2.0)
+        self.assertEqual(kw_extractor.persons_set, {'Nico Rosberg'})
+
+    def test_count_keywords(self):
+        kw_extractor = KeywordExtractor(os.path.join(self.script_folder,"test"), "small-mixed.txt", self.output_folder)
+        kw_extractor.file_text = 'Die SVP und die SVPler in Rom. Promotion der svp, F.C. Südtirol.'
+        self.assertEqual(kw_extractor.count_keywords({'SVP', 'Rom', 'F.C. Südtirol'}), {'SVP': 2, 'Rom': 1, 'F.C. Südtirol': 1})
+        self.assertEqual(kw_extractor.rank_keywords({'SVP', 'Rom', 'F.C. Südtirol'}), ['SVP', 'F.C. Südtirol', 'Rom'])
+
+    def test_if_proper_noun_preceded_by_title(self):
+        kw_extractor = KeywordExtractor(os.path.join(self.script_folder,"test"), "22008.txt", self.output_folder)
+        kw_extractor.proper_nouns_hash = {'Arno Kompatscher': 3.0}
+        self.assertEqual(kw_extractor._if_proper_noun_preceded_by_title('Arno Kompatscher'), 'Landeshauptmann Arno Kompatscher')
+        self.assertEqual(kw_extractor.persons_set, {'Landeshauptmann Arno Kompatscher'})
+
+    def test_join_case_differences(self):
+        kw_extractor = KeywordExtractor(os.path.join(self.script_folder,"test"), "21717-de.txt", self.output_folder)
+        lemmas_hash = {'Haus': 2.0, 'haus': 1.0, 'Rat': 1.0, 'RAT': 1.5, 'Bozen': 1.0}
+        kw_extractor._join_case_differences(lemmas_hash)
+        self.assertEqual(lemmas_hash, {'Haus': 3.0, 'RAT': 2.5, 'Bozen': 1.0})
+        self.assertEqual(kw_extractor._join_case_differences_set({'Haus', 'Bozen'}), {'Haus', 'Bozen'})
+        self.assertEqual(len(kw_extractor._join_case_differences_set({'Haus', 'haus', 'Bozen'})), 2)
+        self.assertEqual(len(kw_extractor._clean_proper_nouns_that_only_differ_in_capitalisation({'SVP', 'Svp', 'Bozen'})), 2)
+
+    def test_join_case_differences_large_vocabulary(self):
+        """
+        In a large vocabulary (long transcripts), only the lemmas that differ in case are joined (the time is measured by the case_variants benchmark).
+        """
+        kw_extractor = KeywordExtractor(os.path.join(self.script_folder,"test"), "21717-de.txt", self.output_folder)
+        lemmas_hash = {}
+        for i in range(50000):
+            lemmas_hash['Lemma'+str(i)] = 1.0
+            if i % 10 == 0:
+                lemmas_hash['lemma'+str(i)] = 0.5
+        kw_extractor._join_case_differences(lemmas_hash)
+        self.assertEqual(len(lemmas_hash), 50000)
+        self.assertNotIn('lemma0', lemmas_hash)
+        self.assertEqual((lemmas_hash['Lemma0'], lemmas_hash['Lemma1']), (1.5, 1.0))
+        self.assertEqual(sum(lemmas_hash.values()), 50000*1.0+5000*0.5)
+
+    def test_de_select_lemmas_for_SMOR(self):
+        """
+        Tests the class methods of the KeywordExtractor _select_lemmas_for_SMOR and _add_name_analyses.
+        The names and keywords from the list analysed by SMOR for a previous article are not sent to SMOR again, the other lemmas are.
+        """
+        kw_extractor = KeywordExtractor(os.path.join(self.script_folder,"test"), "small-mixed.txt", self.output_folder)
+        kw_extractor.noun_lemma_dict = {'Landtag': 2, 'Pascal': 1, 'SVP': 2, 'Wetter': 1}
+        kw_extractor.tree_taggers_proper_nouns = {'Pascal'}
+        kw_extractor.from_good_words_proper_nouns = {'SVP'}
+        KeywordExtractor._name_analyses = {'Pascal': ['Pascal<+NPROP><Nom><Sg>'], 'Wetter': ['Wetter<+NN><Neut><Nom><Sg>']}
+        try:
+            self.assertEqual(kw_extractor._select_lemmas_for_SMOR(), ['Landtag', 'SVP', 'Wetter']) #Wetter is not a name: it is analysed again
+            smor_analysis_hash = {'Landtag': ['Land<NN>Tag<+NN><Masc><Nom><Sg>'], 'SVP': ['no result for SVP'], 'Wetter': ['Wetter<+NN><Neut><Nom><Sg>']}
+            self.assertEqual(list(kw_extractor._add_name_analyses(smor_analysis_hash)), ['Landtag', 'Pascal', 'SVP', 'Wetter'])
+            self.assertEqual(KeywordExtractor._name_analyses['SVP'], ['no result for SVP']) #Kept for the next articles
+            kw_extractor.compound_engine = "splitter"
+            self.assertEqual(kw_extractor._select_lemmas_for_SMOR(), ['Landtag', 'Pascal', 'SVP', 'Wetter'])
+        finally:
+            KeywordExtractor._name_analyses = {}
+
     def test_it_delete_POSes_from_beginning_with_TreeTagger(self):
         kw_extractor = KeywordExtractor(os.path.join(self.script_folder,"test"), "small-mixed2.txt", self.output_folder)        
         kw_extractor._fill_main_lang_dictionaries_with_tree_tagger()
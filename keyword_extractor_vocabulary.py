@@ -0,0 +1,341 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Per-article statistics of the KeywordExtractor (keyword_extractor_salto.py) kept in compact structures.
+Each token, lemma and POS tag of an article gets an integer id once, in the Vocabulary of the article.
+Counts are kept in arrays of doubles indexed by these ids, sets of forms or tags in lists of ids.
+The structures are views with the interface of the dictionaries they replace (key: string),
+so the code that reads them does not have to know about the ids.
+"""
+
+from array import array
+from collections.abc import MutableMapping, MutableSet
+
+
+class Vocabulary():
+    """
+    Interns strings: gives each string an integer id, the ids following each other from 0.
+    Remembers the lowercase and the capitalised (first letter in upper case) form of each string, computed only once.
+    """
+
+    def __init__(self) -> None:
+        self.ids = {} #Key: string, value: its id
+        self.strings = [] #The string of each id
+        self._lowercase_ids = array('i') #The id of the lowercase form of each id (-1 if not computed yet)
+        self._capitalised_ids = array('i') #The id of the capitalised form of each id (-1 if not computed yet)
+
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+
+    def intern(self, string: str) -> int:
+        """
+        Returns the id of the string. Gives it a new id if it has none.
+        """
+        string_id = self.ids.get(string)
+        if string_id is None:
+            string_id = len(self.strings)
+            self.ids[string] = string_id
+            self.strings.append(string)
+            self._lowercase_ids.append(-1)
+            self._capitalised_ids.append(-1)
+        return string_id
+
+
+    def lowercase(self, string_id: int) -> int:
+        """
+        Returns the id of the lowercase form of the string of the id.
+        """
+        lowercase_id = self._lowercase_ids[string_id]
+        if lowercase_id == -1:
+            lowercase_id = self.intern(self.strings[string_id].lower())
+            self._lowercase_ids[string_id] = lowercase_id
+        return lowercase_id
+
+
+    def capitalise(self, string_id: int) -> int:
+        """
+        Returns the id of the string of the id with its first letter in upper case.
+        """
+        capitalised_id = self._capitalised_ids[string_id]
+        if capitalised_id == -1:
+            string = self.strings[string_id]
+            capitalised_id = self.intern(string[0].upper()+string[1:])
+            self._capitalised_ids[string_id] = capitalised_id
+        return capitalised_id
+
+
+class CounterView(MutableMapping):
+    """
+    Hash: key: string, value: number, whose values are kept in an array of doubles indexed by the ids of the vocabulary.
+    The keys are iterated in the order they have been added, as in a dict.
+    A deleted key is not removed from the list of the keys in order: its place is marked with -1 and skipped while iterating,
+    the list being rebuilt once more than half of it are such marks.
+    """
+
+    def __init__(self, vocabulary: Vocabulary) -> None:
+        self.vocabulary = vocabulary
+        self._values = array('d')
+        self._present = bytearray()
+        self._positions = array('i') #The position of each id in self._order
+        self._order = [] #The ids of the keys, in the order they have been added (-1 for a deleted key)
+        self._deleted = 0 #Number of the deleted keys marked in self._order
+
+
+    def _grow(self) -> None:
+        """
+        Makes room in the arrays for all the ids of the vocabulary.
+        """
+        missing = len(self.vocabulary)-len(self._present)
+        if missing > 0:
+            self._values.frombytes(bytes(self._values.itemsize*missing))
+            self._positions.frombytes(bytes(self._positions.itemsize*missing))
+            self._present.extend(bytes(missing))
+
+
+    def augment(self, key_id: int, value_to_add: float) -> None:
+        """
+        Adds value_to_add to the value of the key with the given id, or gives this value to the key if it is not in the hash.
+        """
+        if key_id >= len(self._present):
+            self._grow()
+        if self._present[key_id]:
+            self._values[key_id] += value_to_add
+        else:
+            self._present[key_id] = 1
+            self._values[key_id] = value_to_add
+            self._positions[key_id] = len(self._order)
+            self._order.append(key_id)
+
+
+    def get_by_id(self, key_id: int, default=None):
+        """
+        Returns the value of the key with the given id, or the default value if it is not in the hash.
+        """
+        if key_id < len(self._present) and self._present[key_id]:
+            return self._values[key_id]
+        return default
+
+
+    def contains_id(self, key_id: int) -> bool:
+        return key_id < len(self._present) and self._present[key_id] == 1
+
+
+    def __getitem__(self, key: str) -> float:
+        key_id = self.vocabulary.ids.get(key)
+        if key_id is None or not self.contains_id(key_id):
+            raise KeyError(key)
+        return self._values[key_id]
+
+
+    def __setitem__(self, key: str, value: float) -> None:
+        key_id = self.vocabulary.intern(key)
+        if self.contains_id(key_id):
+            self._values[key_id] = value
+        else:
+            self.augment(key_id, value)
+
+
+    def __delitem__(self, key: str) -> None:
+        key_id = self.vocabulary.ids.get(key)
+        if key_id is None or not self.contains_id(key_id):
+            raise KeyError(key)
+        self._present[key_id] = 0
+        self._order[self._positions[key_id]] = -1
+        self._deleted += 1
+        if self._deleted*2 > len(self._order):
+            self._compact()
+
+
+    def _compact(self) -> None:
+        """
+        Removes the marks of the deleted keys from the list of the keys in order.
+        """
+        self._order = [key_id for key_id in self._order if key_id != -1]
+        for position, key_id in enumerate(self._order):
+            self._positions[key_id] = position
+        self._deleted = 0
+
+
+    def __contains__(self, key) -> bool:
+        key_id = self.vocabulary.ids.get(key)
+        return key_id is not None and self.contains_id(key_id)
+
+
+    def __iter__(self):
+        strings = self.vocabulary.strings
+        return iter([strings[key_id] for key_id in self._order if key_id != -1])
+
+
+    def __len__(self) -> int:
+        return len(self._order)-self._deleted
+
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+
+class IdSet(MutableSet):
+    """
+    Set of strings of an IdSetView: the set of one of its keys, read from and written to the list of ids kept by the view.
+    The elements are iterated in the order they have been added.
+    """
+
+    def __init__(self, view, key_id: int) -> None:
+        self._view = view
+        self._key_id = key_id
+
+
+    @classmethod
+    def _from_iterable(cls, iterable) -> set:
+        return set(iterable) #The result of an operation on sets (ex: a | b) is a new set, not kept by the view
+
+
+    def _member_ids(self) -> array:
+        return self._view._members.get(self._key_id, array('i'))
+
+
+    def __contains__(self, member) -> bool:
+        member_id = self._view.vocabulary.ids.get(member)
+        return member_id is not None and member_id in self._member_ids()
+
+
+    def __iter__(self):
+        strings = self._view.vocabulary.strings
+        return iter([strings[member_id] for member_id in self._member_ids()])
+
+
+    def __len__(self) -> int:
+        return len(self._member_ids())
+
+
+    def add(self, member: str) -> None:
+        self._view.add(self._key_id, self._view.vocabulary.intern(member))
+
+
+    def discard(self, member: str) -> None:
+        member_id = self._view.vocabulary.ids.get(member)
+        members = self._member_ids()
+        if member_id is not None and member_id in members:
+            members.remove(member_id)
+
+
+    def __repr__(self) -> str:
+        return repr(set(self))
+
+
+class IdSetView(MutableMapping):
+    """
+    Hash: key: string, value: set of strings, whose sets are kept as lists of the ids of the vocabulary.
+    The values are returned as IdSet objects, so they can be read like the sets they replace and changes to them (ex: add()) are kept by the view.
+    """
+
+    def __init__(self, vocabulary: Vocabulary) -> None:
+        self.vocabulary = vocabulary
+        self._members = {} #Key: id of a key, value: array of the ids of the elements of its set
+
+
+    def add(self, key_id: int, member_id: int) -> None:
+        """
+        Adds the element with the id member_id to the set of the key with the id key_id.
+        """
+        members = self._members.get(key_id)
+        if members is None:
+            self._members[key_id] = array('i', [member_id])
+        elif member_id not in members:
+            members.append(member_id)
+
+
+    def contains_id(self, key_id: int) -> bool:
+        return key_id in self._members
+
+
+    def __getitem__(self, key: str) -> IdSet:
+        key_id = self.vocabulary.ids.get(key)
+        if key_id is None or key_id not in self._members:
+            raise KeyError(key)
+        return IdSet(self, key_id)
+
+
+    def __setitem__(self, key: str, value: set) -> None:
+        self._members[self.vocabulary.intern(key)] = array('i', [self.vocabulary.intern(member) for member in value])
+
+
+    def __delitem__(self, key: str) -> None:
+        key_id = self.vocabulary.ids.get(key)
+        if key_id is None or key_id not in self._members:
+            raise KeyError(key)
+        del self._members[key_id]
+
+
+    def __contains__(self, key) -> bool:
+        key_id = self.vocabulary.ids.get(key)
+        return key_id is not None and key_id in self._members
+
+
+    def __iter__(self):
+        strings = self.vocabulary.strings
+        return iter([strings[key_id] for key_id in self._members])
+
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+
+class IdMapView(MutableMapping):
+    """
+    Hash: key: string, value: string, kept as a hash of ids.
+    """
+
+    def __init__(self, vocabulary: Vocabulary) -> None:
+        self.vocabulary = vocabulary
+        self._values = {} #Key: id of a key, value: id of its value
+
+
+    def set_by_id(self, key_id: int, value_id: int) -> None:
+        self._values[key_id] = value_id
+
+
+    def contains_id(self, key_id: int) -> bool:
+        return key_id in self._values
+
+
+    def __getitem__(self, key: str) -> str:
+        key_id = self.vocabulary.ids.get(key)
+        if key_id is None or key_id not in self._values:
+            raise KeyError(key)
+        return self.vocabulary.strings[self._values[key_id]]
+
+
+    def __setitem__(self, key: str, value: str) -> None:
+        self._values[self.vocabulary.intern(key)] = self.vocabulary.intern(value)
+
+
+    def __delitem__(self, key: str) -> None:
+        key_id = self.vocabulary.ids.get(key)
+        if key_id is None or key_id not in self._values:
+            raise KeyError(key)
+        del self._values[key_id]
+
+
+    def __contains__(self, key) -> bool:
+        key_id = self.vocabulary.ids.get(key)
+        return key_id is not None and key_id in self._values
+
+
+    def __iter__(self):
+        strings = self.vocabulary.strings
+        return iter([strings[key_id] for key_id in self._values])
+
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
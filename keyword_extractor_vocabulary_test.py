@@ -0,0 +1,78 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Unit tests for testing keyword_extractor_vocabulary.py
+"""
+
+import unittest
+from keyword_extractor_vocabulary import Vocabulary, CounterView, IdSetView, IdMapView
+
+
+class KeywordExtractorVocabularyTest(unittest.TestCase):
+
+    def test_vocabulary(self):
+        vocabulary = Vocabulary()
+        self.assertEqual(vocabulary.intern('Landtag'), 0)
+        self.assertEqual(vocabulary.intern('Bozen'), 1)
+        self.assertEqual(vocabulary.intern('Landtag'), 0)
+        self.assertEqual(vocabulary.strings[vocabulary.lowercase(0)], 'landtag')
+        self.assertEqual(vocabulary.strings[vocabulary.capitalise(vocabulary.lowercase(0))], 'Landtag')
+        self.assertEqual(len(vocabulary), 3)
+
+    def test_counter_view(self):
+        vocabulary = Vocabulary()
+        counter = CounterView(vocabulary)
+        counter.augment(vocabulary.intern('Landtag'), 2)
+        counter.augment(vocabulary.intern('Bozen'), 1)
+        counter.augment(vocabulary.intern('Landtag'), 1.5)
+        counter['Rat'] = 1
+        self.assertEqual(counter, {'Landtag': 3.5, 'Bozen': 1.0, 'Rat': 1.0})
+        self.assertEqual(list(counter), ['Landtag', 'Bozen', 'Rat'])
+        del counter['Bozen']
+        counter['Bozen'] = 2
+        self.assertEqual(list(counter.items()), [('Landtag', 3.5), ('Rat', 1.0), ('Bozen', 2.0)])
+        self.assertNotIn('Meran', counter)
+        self.assertRaises(KeyError, counter.__getitem__, 'Meran')
+
+    def test_counter_view_deletions(self):
+        vocabulary = Vocabulary()
+        counter = CounterView(vocabulary)
+        for position, word in enumerate(['Landtag', 'Bozen', 'Rat', 'Meran', 'Brixen']):
+            counter[word] = position
+        del counter['Bozen']
+        del counter['Meran']
+        self.assertEqual(len(counter), 3)
+        self.assertEqual(list(counter), ['Landtag', 'Rat', 'Brixen'])
+        self.assertRaises(KeyError, counter.__delitem__, 'Bozen')
+        del counter['Landtag'] #More than half of the keys in order are deleted
+        counter['Bozen'] = 5
+        self.assertEqual(list(counter.items()), [('Rat', 2.0), ('Brixen', 4.0), ('Bozen', 5.0)])
+        del counter['Rat']
+        self.assertEqual(list(counter), ['Brixen', 'Bozen'])
+        self.assertEqual(len(counter), 2)
+
+    def test_id_set_view(self):
+        vocabulary = Vocabulary()
+        forms = IdSetView(vocabulary)
+        forms.add(vocabulary.intern('frage'), vocabulary.intern('Fragen'))
+        forms.add(vocabulary.intern('frage'), vocabulary.intern('Frage'))
+        forms.add(vocabulary.intern('frage'), vocabulary.intern('Fragen'))
+        self.assertEqual(forms, {'frage': {'Fragen', 'Frage'}})
+        self.assertEqual(len(forms['frage']), 2)
+        self.assertEqual(list(forms['frage']), ['Fragen', 'Frage'])
+        forms['frage'].add('FRAGE')
+        forms['frage'].discard('Fragen')
+        self.assertEqual(forms['frage'], {'Frage', 'FRAGE'})
+        self.assertEqual(forms['frage'] | {'Fragen'}, {'Frage', 'FRAGE', 'Fragen'})
+        self.assertNotIn('Fragen', forms['frage'])
+
+    def test_id_map_view(self):
+        vocabulary = Vocabulary()
+        lemmas = IdMapView(vocabulary)
+        lemmas.set_by_id(vocabulary.intern('gab'), vocabulary.intern('geben'))
+        lemmas['Fragen'] = 'frage'
+        self.assertEqual(lemmas, {'gab': 'geben', 'Fragen': 'frage'})
+
+
+if __name__ == "__main__":
+    unittest.main()